@@ -0,0 +1,917 @@
+import sys
+import argparse
+import heapq
+import logging
+import multiprocessing
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from database import db
+from database.pool import ConnectionPool
+
+
+def _timed(label, func, iterations):
+    """Run func the given number of times and print the mean latency per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed / iterations * 1e6:10.1f} µs/call")
+    return elapsed / iterations
+
+
+def _seed_expenses(path, users=10, rows_per_user=200):
+    """Create a scratch database with an Expense table and some rows."""
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE Expense (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            amount REAL NOT NULL,
+            currency TEXT NOT NULL,
+            category TEXT,
+            date TEXT NOT NULL
+        )
+    ''')
+    conn.executemany(
+        "INSERT INTO Expense (user_id, title, amount, currency, category, date) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (user_id, f"Expense {i}", 10.5, "NLe", "Food", f"2025-{i % 12 + 1:02d}-01")
+            for user_id in range(1, users + 1)
+            for i in range(rows_per_user)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def bench_pool(iterations):
+    """Compare per-call connect/close against a pooled connection."""
+    query = "SELECT id, title, amount FROM Expense WHERE user_id = ?"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        _seed_expenses(path)
+
+        def per_call():
+            conn = sqlite3.connect(path)
+            conn.row_factory = sqlite3.Row
+            try:
+                conn.execute(query, (3,)).fetchall()
+            finally:
+                conn.close()
+
+        pool = ConnectionPool(path)
+
+        def pooled():
+            with pool.connection() as conn:
+                conn.execute(query, (3,)).fetchall()
+
+        before = _timed("connect per call (before)", per_call, iterations)
+        after = _timed("pooled connection (after)", pooled, iterations)
+        pool.close()
+        print(f"speed-up: {before / after:.1f}x")
+
+
+def _category_ids(*names):
+    """Return the category IDs of names, creating the categories that do not exist yet."""
+    from services.category_service import category_ids
+
+    ids = category_ids(names, create=True)
+    return [ids[name] for name in names]
+
+
+def _seed_ledger(conn, users, rows_per_user, start_year=2015):
+    """Insert rows_per_user expenses and incomes for each user, spread over ten years."""
+    days = 3650
+    categories = _category_ids("Food", "Transport", "Entertainment")
+    for user_id in range(1, users + 1):
+        conn.executemany(
+            "INSERT INTO Expense (user_id, title, amount_minor, currency, category_id, date) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (user_id, f"Expense {i}", i % 5000 + 1, "NLe", categories[i % 3],
+                 f"{start_year + (i * days // rows_per_user) // 365:04d}-{(i % 12) + 1:02d}-{(i % 28) + 1:02d}")
+                for i in range(rows_per_user)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO Income (user_id, source, amount_minor, date) VALUES (?, ?, ?, ?)",
+            (
+                (user_id, "Salary", 100000,
+                 f"{start_year + (i * days // rows_per_user) // 365:04d}-{(i % 12) + 1:02d}-01")
+                for i in range(rows_per_user // 10)
+            ),
+        )
+
+
+def bench_reports(iterations):
+    """
+    Check that no report query falls back to a full table scan and that
+    monthly report latency stays flat as the ledger grows.
+    """
+    from services.report_service import get_range_report, find_full_scans
+
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+
+    scans = find_full_scans()
+    for name, detail in scans:
+        print(f"FULL SCAN in {name}: {detail}")
+
+    # Same per-user history, growing table: the report for one user should not slow down
+    for users in (5, 50, 250):
+        with db.db_connection() as conn:
+            conn.execute("DELETE FROM Expense")
+            conn.execute("DELETE FROM Income")
+            _seed_ledger(conn, users=users, rows_per_user=2_000)
+        _timed(
+            f"monthly report, {users * 2_200:>7} ledger rows",
+            lambda: get_range_report.uncached(3, "2020-06-01", "2020-07-01"), iterations,
+        )
+
+    db.close_pool()
+    if scans:
+        sys.exit(1)
+
+
+def bench_money(iterations):
+    """
+    Compare summing a user's expenses as floats in Python (the old dashboard path)
+    with SUM() over integer minor units inside SQLite.
+    """
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+    rows = 50_000
+    with db.db_connection() as conn:
+        _seed_ledger(conn, users=2, rows_per_user=rows)
+        # Float copy of the same amounts, as they were stored before migration 4
+        conn.execute("CREATE TEMP TABLE FloatExpense AS SELECT user_id, amount_minor / 100.0 AS amount FROM Expense")
+
+    def python_float_sum():
+        with db.db_connection() as conn:
+            return sum(row["amount"] for row in conn.execute("SELECT amount FROM FloatExpense WHERE user_id = ?", (1,)))
+
+    def sql_integer_sum():
+        with db.db_connection() as conn:
+            return conn.execute("SELECT COALESCE(SUM(amount_minor), 0) FROM Expense WHERE user_id = ?", (1,)).fetchone()[0]
+
+    before = _timed("float rows summed in Python (before)", python_float_sum, iterations)
+    after = _timed("integer SUM() in SQLite (after)", sql_integer_sum, iterations)
+    print(f"throughput: {rows / before:,.0f} -> {rows / after:,.0f} rows/s")
+    print(f"float total {python_float_sum()!r} vs exact total {sql_integer_sum() / 100!r}")
+    db.close_pool()
+
+
+def bench_bulk(iterations):
+    """
+    Compare inserting expenses one add_expense() call (and commit) at a time with
+    add_expenses_bulk(), on a database file so every commit pays for its fsync.
+    Exits with status 1 if the bulk path stays under 50,000 rows per second.
+    """
+    from services.expense_service import add_expense, add_expenses_bulk
+
+    target = 50_000
+    rows = [
+        {"user_id": 1, "title": f"Expense {i}", "amount": f"{i % 500}.{i % 100:02d}",
+         "currency": "NLe", "category": "Food", "date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}"}
+        for i in range(100_000)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.configure_database(Path(tmp) / "bench.db")
+        db.initialize_db()
+
+        single = rows[:min(iterations, len(rows))]
+        start = time.perf_counter()
+        for row in single:
+            add_expense(**row)
+        before = len(single) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        results = add_expenses_bulk(rows)
+        after = len(rows) / (time.perf_counter() - start)
+        db.close_pool()
+
+    failed = sum(not result["ok"] for result in results)
+    print(f"{'add_expense() per row (before)':<40} {before:12,.0f} rows/s")
+    print(f"{'add_expenses_bulk() (after)':<40} {after:12,.0f} rows/s")
+    print(f"speed-up: {after / before:.1f}x, {failed} failed rows")
+    if failed or after < target:
+        print(f"below target of {target:,} rows/s")
+        sys.exit(1)
+
+
+def bench_totals(iterations):
+    """
+    Compare the dashboard totals computed with SUM() over a user's rows against
+    the trigger-maintained UserTotals lookup, as the user's history grows.
+    """
+    from services.totals_service import get_user_totals, check_user_totals
+
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+
+    def summed():
+        with db.db_connection(readonly=True) as conn:
+            conn.execute('''
+                SELECT (SELECT COALESCE(SUM(amount_minor), 0) FROM Expense WHERE user_id = ?),
+                       (SELECT COALESCE(SUM(amount_minor), 0) FROM Income WHERE user_id = ?)
+            ''', (1, 1)).fetchone()
+
+    for rows_per_user in (1_000, 10_000, 100_000):
+        with db.db_connection() as conn:
+            conn.execute("DELETE FROM Expense")
+            conn.execute("DELETE FROM Income")
+            _seed_ledger(conn, users=2, rows_per_user=rows_per_user)
+        _timed(f"SUM() totals, {rows_per_user:>7} rows (before)", summed, iterations)
+        _timed(f"UserTotals,   {rows_per_user:>7} rows (after)", lambda: get_user_totals.uncached(1), iterations)
+
+    mismatched = check_user_totals()
+    db.close_pool()
+    if mismatched:
+        print(f"UserTotals out of date for users {mismatched}")
+        sys.exit(1)
+
+
+def bench_rollup(iterations):
+    """
+    Compare the "Expenses by Category" and monthly breakdown computed by grouping a
+    user's raw ledger rows with reading them from the MonthlyRollup table.
+    """
+    from services.rollup_service import get_category_totals, get_monthly_totals, check_rollup
+
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+
+    def from_ledger():
+        with db.db_connection(readonly=True) as conn:
+            conn.execute(
+                "SELECT category_id, SUM(amount_minor), COUNT(*) FROM Expense WHERE user_id = ? GROUP BY category_id",
+                (1,),
+            ).fetchall()
+            conn.execute('''
+                SELECT substr(date, 1, 7), SUM(amount_minor), COUNT(*) FROM Expense
+                WHERE user_id = ? GROUP BY substr(date, 1, 7)
+            ''', (1,)).fetchall()
+
+    def from_rollup():
+        get_category_totals.uncached(1)
+        get_monthly_totals.uncached(1)
+
+    for rows_per_user in (1_000, 10_000, 100_000):
+        with db.db_connection() as conn:
+            conn.execute("DELETE FROM Expense")
+            conn.execute("DELETE FROM Income")
+            _seed_ledger(conn, users=2, rows_per_user=rows_per_user)
+        _timed(f"ledger GROUP BY, {rows_per_user:>7} rows (before)", from_ledger, iterations)
+        _timed(f"MonthlyRollup,   {rows_per_user:>7} rows (after)", from_rollup, iterations)
+
+    mismatched = check_rollup()
+    db.close_pool()
+    if mismatched:
+        print(f"MonthlyRollup out of date for {len(mismatched)} keys")
+        sys.exit(1)
+
+
+def bench_search(iterations, rows=1_000_000, users=100):
+    """
+    Time dashboard searches on a ledger of a million expenses: a LIKE scan over the
+    user's rows against the FTS5 index. Exits with status 1 if a search takes 100 ms or more.
+
+    The owner token shares one index with every user's words, so bm25 weighs each word
+    over all users' rows; a query whose words start most of the user's rows (every row of
+    user 7 here starts with "pharmacy") costs about 50 ms.
+    """
+    from services.search_service import search_transactions
+
+    words = ["groceries", "market", "rent", "fuel", "taxi", "cinema", "pharmacy", "school", "phone", "electricity",
+             "restaurant", "water", "clothes", "repairs", "gift", "insurance", "internet", "books", "bakery", "gym"]
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+    food, = _category_ids("Food")
+    columns = ("user_id", "title", "amount_minor", "currency", "category_id", "date", "description")
+    ledger = [
+        (i % users + 1, f"{words[i % 20]} {words[i * 7 % 19]}", i % 5000 + 1, "NLe", food,
+         f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}", f"note {words[i * 3 % 17]} {i}")
+        for i in range(rows)
+    ]
+    db.run_in_transaction(lambda conn: db.insert_chunked(conn, "Expense", columns, ledger, 50_000))
+
+    def like_scan(text):
+        with db.db_connection(readonly=True) as conn:
+            conn.execute(
+                "SELECT id FROM Expense WHERE user_id = ? AND (title LIKE ? OR description LIKE ?) LIMIT 50",
+                (7, f"%{text}%", f"%{text}%"),
+            ).fetchall()
+
+    slowest = 0.0
+    for text in ("gro", "taxi fare", "pharmacy school", "zzz"):
+        _timed(f"LIKE '%{text}%' (before)", lambda: like_scan(text), max(1, iterations // 20))
+        slowest = max(slowest, _timed(f"FTS5 '{text}' (after)", lambda: search_transactions(7, text), iterations))
+    db.close_pool()
+    if slowest >= 0.1:
+        print("search slower than 100 ms")
+        sys.exit(1)
+
+def bench_pages(iterations, rows=1_000_000, users=10):
+    """
+    Time listing pages of 50 expenses deep into a user's history of 100k rows: LIMIT/OFFSET
+    against a (date, id) keyset cursor. Exits with status 1 if a deep keyset page costs
+    more than twice the first page.
+    """
+    from services.expense_service import get_expenses_page
+
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+    # Spread every user's rows over ten years of distinct days
+    days = [(date(2015, 1, 1) + timedelta(days=n)).isoformat() for n in range(3650)]
+    categories = _category_ids("Food", "Rent", "Transport")
+    columns = ("user_id", "title", "amount_minor", "currency", "category_id", "date")
+    ledger = [
+        (i % users + 1, f"Expense {i}", i % 5000 + 1, "NLe", categories[i % 3],
+         days[i * 7919 % len(days)])
+        for i in range(rows)
+    ]
+    db.run_in_transaction(lambda conn: db.insert_chunked(conn, "Expense", columns, ledger, 50_000))
+    depth = rows // users - 100
+    with db.db_connection(readonly=True) as conn:
+        deep_cursor = tuple(conn.execute(
+            "SELECT date, id FROM Expense WHERE user_id = 7 ORDER BY date DESC, id DESC LIMIT 1 OFFSET ?", (depth,)
+        ).fetchone())
+
+    def offset_page(offset):
+        with db.db_connection(readonly=True) as conn:
+            conn.execute('''
+                SELECT id, user_id, title, amount_minor, currency, currency_exponent, category_id, date
+                FROM Expense WHERE user_id = ? ORDER BY date DESC, id DESC LIMIT 50 OFFSET ?
+            ''', (7, offset)).fetchall()
+
+    _timed("OFFSET page 1 (before)", lambda: offset_page(0), iterations)
+    _timed(f"OFFSET row {depth:,} (before)", lambda: offset_page(depth), max(1, iterations // 100))
+    first = _timed("keyset page 1 (after)", lambda: get_expenses_page(7), iterations)
+    deep = _timed(f"keyset row {depth:,} (after)", lambda: get_expenses_page(7, deep_cursor), iterations)
+    _timed("keyset page 1, category (after)", lambda: get_expenses_page(7, category="Rent"), iterations)
+    _timed(f"keyset row {depth:,}, category (after)",
+           lambda: get_expenses_page(7, deep_cursor, category="Rent"), iterations)
+    db.close_pool()
+    if deep > first * 2:
+        print("deep keyset pages cost more than the first page")
+        sys.exit(1)
+
+def bench_list(iterations, sizes=(100, 1_000_000)):
+    """
+    Time opening the virtualized expense list (gui.virtual_list) on a short and a very long
+    history: the rows its first screen reads from a PagedSource, then each further screen
+    while scrolling, and applying one written row to 100k loaded rows. The widget pool is the same size either way, so this is the part that
+    could grow with the history. Both open with the same two pages; the long history's rows
+    are scattered over more database pages, so it may cost somewhat more, but exits with
+    status 1 if it costs over four times the short one.
+    """
+    from services.expense_service import get_expenses_page
+    from utils.paging import PagedSource
+
+    # About what the list reads for its first screen: the viewport, the overscan and one prefetch
+    first_screen, screen = 80, 25
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+    categories = _category_ids("Food", "Rent", "Transport")
+    columns = ("user_id", "title", "amount_minor", "currency", "category_id", "date")
+    days = [(date(2015, 1, 1) + timedelta(days=n)).isoformat() for n in range(3650)]
+    for user_id, rows in enumerate(sizes, start=1):
+        ledger = [
+            (user_id, f"Expense {i}", i % 5000 + 1, "NLe", categories[i % 3], days[i * 7919 % len(days)])
+            for i in range(rows)
+        ]
+        db.run_in_transaction(lambda conn: db.insert_chunked(conn, "Expense", columns, ledger, 50_000))
+
+    opened = []
+    for user_id, rows in enumerate(sizes, start=1):
+        def open_list():
+            PagedSource(lambda cursor: get_expenses_page(user_id, cursor)).ensure(first_screen)
+
+        opened.append(_timed(f"open list, {rows:,} rows", open_list, iterations))
+
+    source = PagedSource(lambda cursor: get_expenses_page(len(sizes), cursor))
+    source.ensure(first_screen)
+    _timed(f"scroll one screen, {sizes[-1]:,} rows", lambda: source.ensure(len(source) + screen),
+           max(1, iterations))
+
+    # A write is applied to the loaded rows (VirtualList.apply) rather than reloading the list
+    source.ensure(100_000)
+    record = source[len(source) // 2]
+
+    def apply_write():
+        source.remove(record)
+        source.insert(record)
+
+    _timed(f"apply one write, {len(source):,} rows loaded", apply_write, iterations)
+    db.close_pool()
+    if opened[-1] > opened[0] * 4:
+        print("opening a long history costs more than four times a short one")
+        sys.exit(1)
+
+def bench_stream(iterations, sizes=(100_000, 400_000)):
+    """
+    Compare peak Python memory (tracemalloc) of exporting one user's expenses to CSV
+    from get_expenses() (a list) and from iter_expenses() (a stream) as the history grows.
+    Exits with status 1 if the streaming peak grows with the number of rows.
+    """
+    import tracemalloc
+    from services.expense_service import get_expenses, iter_expenses
+    from utils.exporters import export_to_csv
+
+    columns = ("user_id", "title", "amount_minor", "currency", "category_id", "date")
+    peaks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            db.configure_database(db.MEMORY_DB)
+            db.initialize_db()
+            food, = _category_ids("Food")
+            ledger = [
+                (1, f"Expense {i}", i % 5000 + 1, "NLe", food, f"{2015 + i % 10}-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+                for i in range(size)
+            ]
+            db.run_in_transaction(lambda conn: db.insert_chunked(conn, "Expense", columns, ledger, 50_000))
+
+            results = []
+            for label, rows in (("get_expenses() (before)", lambda: get_expenses(1)),
+                                ("iter_expenses() (after)", lambda: iter_expenses(1))):
+                tracemalloc.start()
+                start = time.perf_counter()
+                export_to_csv(rows(), Path(tmp) / "expenses.csv")
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                results.append(peak)
+                print(f"{label + f', {size:,} rows':<40} peak {peak / 2**20:8.1f} MiB in {elapsed:6.2f} s")
+            peaks.append(results[1])
+            db.close_pool()
+    if peaks[-1] > peaks[0] * 1.5:
+        print("streaming export memory grows with the number of rows")
+        sys.exit(1)
+
+def bench_records(iterations, rows=1_000_000):
+    """
+    Compare the memory (tracemalloc peak) and time of materializing a million expenses
+    as per-row dictionaries with __slots__ Expense records. Exits with status 1 unless
+    the records take less than half the memory of the dictionaries.
+    """
+    import tracemalloc
+    from services.expense_service import get_expenses
+    from utils.money import from_minor
+
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+    food, = _category_ids("Food")
+    columns = ("user_id", "title", "amount_minor", "currency", "category_id", "date")
+    ledger = [
+        (1, f"Expense {i}", i % 5000 + 1, "NLe", food, f"{2015 + i % 10}-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+        for i in range(rows)
+    ]
+    db.run_in_transaction(lambda conn: db.insert_chunked(conn, "Expense", columns, ledger, 50_000))
+    ledger.clear()
+
+    def as_dicts():
+        sql = '''
+            SELECT id, user_id, title, amount_minor, currency, currency_exponent, category_id, date
+            FROM Expense WHERE user_id = ? ORDER BY date, id
+        '''
+        return [
+            {
+                "id": row["id"],
+                "user_id": row["user_id"],
+                "title": row["title"],
+                "amount": from_minor(row["amount_minor"], row["currency_exponent"]),
+                "amount_minor": row["amount_minor"],
+                "currency": row["currency"],
+                "category_id": row["category_id"],
+                "date": row["date"],
+            }
+            for row in db.iter_query(sql, (1,))
+        ]
+
+    peaks = []
+    for label, load in (("dict per row (before)", as_dicts), ("Expense records (after)", lambda: get_expenses(1))):
+        tracemalloc.start()
+        start = time.perf_counter()
+        loaded = load()
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        peaks.append(peak)
+        print(f"{label:<40} {len(loaded):,} rows: peak {peak / 2**20:7.1f} MiB "
+              f"({peak / len(loaded):5.0f} B/row) in {elapsed:5.2f} s")
+        del loaded
+    db.close_pool()
+    if peaks[1] * 2 > peaks[0]:
+        print("records do not halve the memory of dictionaries")
+        sys.exit(1)
+
+def bench_analytics(iterations, rows=1_000_000):
+    """
+    Compare totals, per-category and per-month breakdowns of a million expenses computed
+    by looping over get_expenses() records with NumPy reductions over fetch_columns().
+    Exits with status 1 if the two disagree or the columnar path is not faster.
+    """
+    from services.analytics_service import fetch_columns, category_breakdown, period_breakdown
+    from services.expense_service import get_expenses
+
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+    categories = _category_ids("Food", "Rent", "Transport", "Entertainment", "Other")
+    columns = ("user_id", "title", "amount_minor", "currency", "category_id", "date")
+    ledger = [
+        (1, f"Expense {i}", i % 5000 + 1, "NLe", categories[i % 5], f"{2015 + i % 10}-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+        for i in range(rows)
+    ]
+    db.run_in_transaction(lambda conn: db.insert_chunked(conn, "Expense", columns, ledger, 50_000))
+    ledger.clear()
+
+    def per_record():
+        total, by_category, by_month = 0, {}, {}
+        for expense in get_expenses(1):
+            total += expense["amount_minor"]
+            by_category[expense["category"]] = by_category.get(expense["category"], 0) + expense["amount_minor"]
+            month = expense["date"][:7]
+            by_month[month] = by_month.get(month, 0) + expense["amount_minor"]
+        return total, by_category, by_month
+
+    def columnar():
+        data = fetch_columns(1)
+        by_category = category_breakdown(data)
+        by_month = period_breakdown(data, "M")
+        return (
+            int(data["amount_minor"].sum()),
+            dict(zip(by_category["category"], by_category["total_minor"].tolist())),
+            dict(zip(by_month["period"].astype(str).tolist(), by_month["total_minor"].tolist())),
+        )
+
+    runs = max(1, iterations // 1000)
+    before = _timed("per-record loops (before)", per_record, runs)
+    after = _timed("NumPy columns (after)", columnar, runs)
+    print(f"speed-up: {before / after:.1f}x")
+    same = per_record() == columnar()
+    db.close_pool()
+    if not same or after >= before:
+        print("columnar analytics disagree with the records or are not faster")
+        sys.exit(1)
+
+
+def bench_cache(iterations, rows_per_user=100_000):
+    """
+    Time a round of dashboard and report reads computed from the database against the
+    same round served from the result cache, then check that a write invalidates it.
+    Exits with status 1 if a cached result outlives a write.
+    """
+    from utils.cache import result_cache, bump_data_version
+    from services.expense_service import add_expense, get_total_expenses
+    from services.income_service import get_total_income
+    from services.totals_service import get_user_totals
+    from services.rollup_service import get_category_totals, get_monthly_totals, build_text_report
+    from services.report_service import get_range_report
+
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+    with db.db_connection() as conn:
+        _seed_ledger(conn, users=2, rows_per_user=rows_per_user)
+    reads = (
+        (get_user_totals, (1,)),
+        (get_total_expenses, (1,)),
+        (get_total_income, (1,)),
+        (get_category_totals, (1,)),
+        (get_monthly_totals, (1, 2020)),
+        (build_text_report, (1,)),
+        (get_range_report, (1, "2020-06-01", "2020-07-01")),
+    )
+
+    def navigate(cached):
+        for read, args in reads:
+            (read if cached else read.uncached)(*args)
+
+    bump_data_version()  # The ledger was seeded behind the services' back
+    _timed(f"dashboard reads, {rows_per_user:>7} rows (before)", lambda: navigate(False), iterations)
+    _timed(f"dashboard reads, {rows_per_user:>7} rows (after)", lambda: navigate(True), iterations)
+
+    add_expense(1, "Cache check", 12.5, "NLe", "Food", "2020-06-15")
+    stale = any(read(*args) != read.uncached(*args) for read, args in reads)
+    print(result_cache.stats())
+    db.close_pool()
+    if stale:
+        print("a cached result survived a write")
+        sys.exit(1)
+
+
+class _HeadlessLoop:
+    """
+    Stand-in for the Tk main loop, with the after() and after_cancel() a TaskRunner uses:
+    runs the scheduled callbacks in time order and records how long each one takes.
+    """
+
+    def __init__(self):
+        self._scheduled = []  # Heap of (due time, sequence number, func, args)
+        self._cancelled = set()
+        self._sequence = 0
+        self.durations = []
+
+    def after(self, ms, func, *args):
+        self._sequence += 1
+        heapq.heappush(self._scheduled, (time.perf_counter() + ms / 1000, self._sequence, func, args))
+        return self._sequence
+
+    def after_cancel(self, after_id):
+        self._cancelled.add(after_id)
+
+    def run(self, until, timeout=60.0):
+        """Run callbacks until until() is true, nothing is scheduled, or timeout seconds pass."""
+        give_up = time.perf_counter() + timeout
+        while self._scheduled and not until() and time.perf_counter() < give_up:
+            due, after_id, func, args = heapq.heappop(self._scheduled)
+            if after_id in self._cancelled:
+                continue
+            time.sleep(max(0.0, due - time.perf_counter()))
+            start = time.perf_counter()
+            func(*args)
+            self.durations.append(time.perf_counter() - start)
+
+
+def bench_tasks(iterations, rows=200_000, budget_ms=16.0):
+    """
+    Headless check of gui.task_runner: run the slow calls behind the GUI's buttons (a CSV
+    export, an all-users listing streamed in batches, and a burst of searches on one channel)
+    through a TaskRunner on a stand-in main loop, and compare the longest main-loop callback
+    with running the same calls inline in a button callback. Exits with status 1 if any
+    callback exceeds budget_ms, if a superseded search delivers its results, or if the
+    loading state does not end.
+    """
+    from gui.task_runner import TaskRunner
+    from services.expense_service import iter_expenses, iter_all_expenses
+    from services.search_service import search_transactions
+    from utils.exporters import export_to_csv
+
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+    with db.db_connection() as conn:
+        _seed_ledger(conn, users=2, rows_per_user=rows // 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export_path = str(Path(tmp) / "expenses.csv")
+        searches = [f"expense {n}" for n in range(max(2, iterations // 100))]
+
+        start = time.perf_counter()
+        export_to_csv(iter_expenses(1), export_path)
+        inline = time.perf_counter() - start
+        start = time.perf_counter()
+        listing = list(iter_all_expenses())
+        inline = max(inline, time.perf_counter() - start)
+        print(f"{'longest call run inline (before)':<40} {inline * 1e3:10.1f} ms")
+
+        loop = _HeadlessLoop()
+        busy_states, delivered, listed, listing_done = [], [], [], []
+        runner = TaskRunner(loop, on_busy=busy_states.append)
+        runner.submit(export_to_csv, iter_expenses(1), export_path)
+        runner.stream(iter_all_expenses, on_batch=listed.extend, on_done=lambda: listing_done.append(1))
+        for text in searches:  # Each search supersedes the one before
+            runner.submit(search_transactions, 1, text, channel="search",
+                          on_done=lambda results, text=text: delivered.append(text))
+        loop.run(lambda: not runner.busy and listing_done)
+        runner.shutdown()
+
+    longest = max(loop.durations, default=0.0)
+    print(f"{'longest main-loop callback (after)':<40} {longest * 1e3:10.1f} ms")
+    print(f"{'main-loop callbacks':<40} {len(loop.durations):10d}")
+    db.close_pool()
+    failures = []
+    if longest * 1e3 > budget_ms:
+        failures.append(f"a main-loop callback took over {budget_ms} ms")
+    if delivered != searches[-1:]:
+        failures.append(f"searches delivered: {delivered}, expected only {searches[-1]!r}")
+    if busy_states != [True, False] or len(listed) != len(listing):
+        failures.append(f"loading states {busy_states}, {len(listed)} of {len(listing)} rows listed")
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+
+
+def _startup_child(path, mode, fade_ms, results):
+    """
+    Child process: time a cold start until the dashboard is usable. "before" runs the
+    startup work inline around the old blocking fade (22 frames of time.sleep(0.05));
+    "after" runs it through the splash screen's task chain while after() callbacks fade
+    the window in and out; the steps that import tkinter modules run from main-loop
+    callbacks, as the splash screen runs them, and are timed apart from the others.
+    """
+    from gui.task_runner import TaskRunner
+    from services import startup_service
+
+    db.configure_database(path)
+    startup_service.LEGACY_DB_PATH = str(Path(path).with_name("no_legacy.db"))
+    steps = range(len(startup_service.STARTUP_STEPS))
+    start = time.perf_counter()
+    if mode == "before":
+        longest = 0.0
+        for index in steps:
+            longest = max(longest, startup_service.run_startup_step(index))
+        time.sleep(22 * 0.05)
+        longest = max(longest, 11 * 0.05)
+        results.put((mode, time.perf_counter() - start, longest, len(steps), longest))
+        db.close_pool()
+        return
+
+    loop = _HeadlessLoop()
+    runner = TaskRunner(loop, max_workers=1)
+    progress, finished = [], []
+    main_thread_steps = set()  # Positions in loop.durations of the main-thread import steps
+
+    def fade(frame, then=None):
+        if frame < 10:
+            loop.after(fade_ms, fade, frame + 1, then)
+        elif then is not None:
+            then()
+
+    def step_done(index):
+        progress.append(index + 1)
+        if index + 1 < len(steps):
+            run_step(index + 1)
+        else:
+            fade(0, then=lambda: finished.append(time.perf_counter()))
+
+    def run_main_thread_step(index):
+        main_thread_steps.add(len(loop.durations))
+        startup_service.run_startup_step(index)
+        step_done(index)
+
+    def run_step(index):
+        if startup_service.STARTUP_STEPS[index][2]:
+            runner.submit(startup_service.run_startup_step, index, on_done=lambda _: step_done(index))
+        else:
+            loop.after(1, run_main_thread_step, index)
+
+    fade(0)
+    run_step(0)
+    loop.run(lambda: finished)
+    runner.shutdown()
+    other = [duration for position, duration in enumerate(loop.durations) if position not in main_thread_steps]
+    imports = [loop.durations[position] for position in main_thread_steps]
+    results.put((mode, finished[0] - start, max(other), len(progress), max(imports, default=0.0)))
+    db.close_pool()
+
+
+def bench_startup(iterations, budget_ms=16.0, fade_ms=30, import_step_budget_ms=250.0):
+    """
+    Time from launch to a usable dashboard with the old splash screen, which slept through
+    its fades and left migrations to main.py and the heavy imports and reference data to
+    first use, against the splash screen that runs that work on a worker thread while it
+    animates. Each run is a fresh process, so imports are cold. Exits with status 1 if the
+    new splash is not faster, a main-loop callback exceeds budget_ms (import_step_budget_ms
+    for the steps that import tkinter modules on the main thread), or the progress bar does
+    not advance once per step. Runs once, so iterations is unused.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("before", "after"):
+            process = context.Process(
+                target=_startup_child, args=(str(Path(tmp) / f"startup_{mode}.db"), mode, fade_ms, results)
+            )
+            process.start()
+            timings[mode] = results.get()
+            process.join()
+
+    before, after = timings["before"][1], timings["after"][1]
+    print(f"{'time to usable dashboard (before)':<40} {before * 1e3:10.1f} ms")
+    print(f"{'time to usable dashboard (after)':<40} {after * 1e3:10.1f} ms")
+    print(f"{'longest blocked main loop (before)':<40} {timings['before'][2] * 1e3:10.1f} ms")
+    print(f"{'longest main-loop callback (after)':<40} {timings['after'][2] * 1e3:10.1f} ms")
+    print(f"{'longest main-thread import step (after)':<40} {timings['after'][4] * 1e3:10.1f} ms")
+    failures = []
+    if after >= before:
+        failures.append("the splash warm-up did not shorten start-up")
+    if timings["after"][2] * 1e3 > budget_ms:
+        failures.append(f"a main-loop callback took over {budget_ms} ms")
+    if timings["after"][4] * 1e3 > import_step_budget_ms:
+        failures.append(f"a main-thread import step took over {import_step_budget_ms} ms")
+    if timings["after"][3] != timings["before"][3]:
+        failures.append(f"progress advanced {timings['after'][3]} times for {timings['before'][3]} steps")
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+
+
+def _stress_writer(path, journal_mode, duration, results):
+    """Child process: commit large batches of expenses back to back for duration seconds."""
+    db.JOURNAL_MODE = journal_mode
+    db.configure_database(path)
+    # Each transaction writes more than the page cache holds, so in rollback-journal
+    # mode it has to take the exclusive lock before it commits
+    rows = [
+        (1, f"Expense {i}", 999, "NLe", f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}", "receipt " * 25)
+        for i in range(100_000)
+    ]
+    columns = ("user_id", "title", "amount_minor", "currency", "date", "description")
+    timings = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        db.run_in_transaction(lambda conn: db.insert_chunked(conn, "Expense", columns, rows, 5_000))
+        timings.append(time.perf_counter() - start)
+    db.close_pool()
+    results.put(("writer", timings, 0))
+
+
+def _stress_reader(path, journal_mode, duration, results):
+    """Child process: run the dashboard total query in a loop and record each latency."""
+    db.JOURNAL_MODE = journal_mode
+    db.configure_database(path)
+    timings, errors = [], 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            with db.db_connection(readonly=True) as conn:
+                conn.execute("SELECT COALESCE(SUM(amount_minor), 0) FROM Expense WHERE user_id = ?", (2,)).fetchone()
+        except sqlite3.OperationalError:
+            errors += 1
+        timings.append(time.perf_counter() - start)
+    db.close_pool()
+    results.put(("reader", timings, errors))
+
+
+def bench_concurrency(iterations, readers=4, duration=3.0):
+    """
+    Multi-process stress test: one process commits large expense batches while
+    several reader processes query totals, first in rollback-journal mode and then
+    in WAL mode. Exits with status 1 if a WAL reader ever failed or waited as long
+    as a write transaction takes. Runs for a fixed duration, so iterations is unused.
+    """
+    context = multiprocessing.get_context("spawn")
+    wal_ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for journal_mode in ("DELETE", "WAL"):
+            path = Path(tmp) / f"stress_{journal_mode.lower()}.db"
+            db.JOURNAL_MODE = journal_mode
+            db.configure_database(path)
+            db.initialize_db()
+            with db.db_connection() as conn:
+                _seed_ledger(conn, users=5, rows_per_user=2_000)
+            db.close_pool()
+
+            results = context.Queue()
+            processes = [context.Process(target=_stress_writer, args=(path, journal_mode, duration, results))]
+            processes += [
+                context.Process(target=_stress_reader, args=(path, journal_mode, duration, results))
+                for _ in range(readers)
+            ]
+            for process in processes:
+                process.start()
+            collected = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+
+            writes = [t for kind, timings, _ in collected if kind == "writer" for t in timings]
+            reads = sorted(t for kind, timings, _ in collected if kind == "reader" for t in timings)
+            errors = sum(e for kind, _, e in collected if kind == "reader")
+            slowest_read = reads[-1] if reads else 0.0
+            mean_write = sum(writes) / len(writes) if writes else 0.0
+            print(f"{journal_mode:<7} {len(writes):4} write txns (mean {mean_write * 1e3:7.1f} ms), "
+                  f"{len(reads):7} reads: p99 {reads[int(len(reads) * 0.99)] * 1e3:7.2f} ms, "
+                  f"max {slowest_read * 1e3:7.2f} ms, {errors} errors")
+            if journal_mode == "WAL":
+                wal_ok = errors == 0 and slowest_read < mean_write
+    db.JOURNAL_MODE = "WAL"
+    if not wal_ok:
+        print("WAL readers were blocked by the writer")
+        sys.exit(1)
+
+
+BENCHMARKS = {
+    "pool": bench_pool,
+    "reports": bench_reports,
+    "money": bench_money,
+    "bulk": bench_bulk,
+    "totals": bench_totals,
+    "rollup": bench_rollup,
+    "search": bench_search,
+    "pages": bench_pages,
+    "list": bench_list,
+    "stream": bench_stream,
+    "records": bench_records,
+    "analytics": bench_analytics,
+    "cache": bench_cache,
+    "tasks": bench_tasks,
+    "startup": bench_startup,
+    "concurrency": bench_concurrency,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Storage layer micro-benchmarks.")
+    parser.add_argument("name", choices=sorted(BENCHMARKS), help="Benchmark to run.")
+    parser.add_argument("-n", "--iterations", type=int, default=2000, help="Number of calls to time.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    BENCHMARKS[args.name](args.iterations)
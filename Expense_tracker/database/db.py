@@ -1,112 +1,421 @@
+import os
+import time
+import random
 import sqlite3
+import itertools
+import threading
 from pathlib import Path
 import logging
+from contextlib import contextmanager
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+from database.pool import ConnectionPool
+from database.migrations import migrate
+from utils.money import to_minor, currency_exponent
+from utils.helpers import to_iso_date
+from utils.cache import bump_data_version, set_change_signal
 
-# Define the database path
-DB_PATH = Path("expense_tracker.db")
+# Special path that selects a private in-memory database (tests and benchmarks)
+MEMORY_DB = ":memory:"
+
+# Define the database path; override with the EXPENSE_TRACKER_DB environment variable
+DB_PATH = Path(os.environ.get("EXPENSE_TRACKER_DB", "expense_tracker.db"))
+
+# Shared-cache URI used in place of DB_PATH while in-memory mode is active
+_memory_uri = None
+_memory_ids = itertools.count(1)
+
+# WAL lets readers keep reading while a writer holds the lock; NORMAL is durable enough in WAL
+JOURNAL_MODE = "WAL"
+SYNCHRONOUS = "NORMAL"
+
+# Write transactions that still get SQLITE_BUSY after busy_timeout are retried with backoff
+BUSY_RETRIES = 5
+BUSY_BACKOFF = 0.05  # seconds, doubled after every attempt
+
+# Rows fetched per fetchmany call by iter_query
+ITER_BATCH_SIZE = 1000
+
+# Shared connection pools (read-write and query-only), created on first use
+_pool = None
+_read_pool = None
+_pool_lock = threading.Lock()
+
+# Set once migrations have been applied in this process
+_schema_ready = False
+
+# Connection kept open only to read PRAGMA data_version (see database_version)
+_watch_conn = None
+_watch_lock = threading.Lock()
+
+
+def configure_database(path):
+    """
+    Point the storage layer at a different database and reset the connection pool.
+
+    Args:
+        path (str | Path): Path of the SQLite database file, or MEMORY_DB (":memory:")
+            for a fresh in-memory database shared by every pooled connection.
+    """
+    global DB_PATH, _memory_uri, _schema_ready
+    close_pool()
+    if str(path) == MEMORY_DB:
+        # A named shared-cache database lives as long as one pooled connection stays open
+        _memory_uri = f"file:expense_tracker_{next(_memory_ids)}?mode=memory&cache=shared"
+    else:
+        _memory_uri = None
+        DB_PATH = Path(path)
+    _schema_ready = False
+    bump_data_version()  # Cached results belong to the previous database
 
 
 def get_db_connection():
     """
-    Create and return a database connection.
+    Create and return a new, unpooled database connection.
     Ensures the database file exists before connecting.
+    The caller is responsible for closing it; services should use db_connection() instead.
     """
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)  # Ensure the directory exists
-    conn = sqlite3.connect(DB_PATH)
+    if _memory_uri:
+        conn = sqlite3.connect(_memory_uri, uri=True)
+    else:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)  # Ensure the directory exists
+        conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row  # Access columns by name
     return conn
 
 
+def get_pool():
+    """
+    Return the shared connection pool, creating it on first use.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if _memory_uri:
+                _pool = ConnectionPool(_memory_uri, uri=True)
+            else:
+                DB_PATH.parent.mkdir(parents=True, exist_ok=True)  # Ensure the directory exists
+                _pool = ConnectionPool(DB_PATH, journal_mode=JOURNAL_MODE, synchronous=SYNCHRONOUS)
+        return _pool
+
+
+def get_read_pool():
+    """
+    Return the pool of query-only connections used for dashboard and report reads.
+    In-memory databases have no WAL, so there reads share the read-write pool.
+    """
+    global _read_pool
+    if _memory_uri:
+        return get_pool()
+    with _pool_lock:
+        if _read_pool is None:
+            DB_PATH.parent.mkdir(parents=True, exist_ok=True)  # Ensure the directory exists
+            _read_pool = ConnectionPool(DB_PATH, synchronous=SYNCHRONOUS, readonly=True)
+        return _read_pool
+
+
+def database_version():
+    """
+    Return a number that changes whenever a write to the database file commits, whoever
+    made it: this process's pooled connections, another session of the application or
+    any other SQLite client. Cached service results are keyed on it (utils.cache).
+
+    It is PRAGMA data_version of a connection that never writes itself, so every commit
+    counts. In-memory databases are only written by this process, whose services version
+    their writes already, so for them it is always 0.
+
+    Returns:
+        int: The current value, or None if it cannot be read (results are then not cached).
+    """
+    global _watch_conn
+    if _memory_uri:
+        return 0
+    with _watch_lock:
+        try:
+            if _watch_conn is None:
+                _watch_conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+            return _watch_conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            logging.warning(f"Could not read the database data version: {e}")
+            return None
+
+
+set_change_signal(database_version)
+
+
+def close_pool():
+    """
+    Close the shared connection pools (e.g. on application exit).
+    """
+    global _pool, _read_pool, _watch_conn
+    with _watch_lock:
+        if _watch_conn is not None:
+            _watch_conn.close()
+            _watch_conn = None
+    with _pool_lock:
+        if _read_pool is not None:
+            _read_pool.close()
+            _read_pool = None
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+@contextmanager
+def db_connection(readonly=False):
+    """
+    Borrow a pooled database connection for the duration of a with block.
+    Commits on success, rolls back on error, and returns the connection to the pool.
+
+    Args:
+        readonly (bool): Borrow a query-only connection. Read-only queries should
+            pass True so that, in WAL mode, they never wait on a writer.
+
+    Example:
+        with db_connection(readonly=True) as conn:
+            conn.execute("SELECT ...")
+    """
+    pool = get_read_pool() if readonly else get_pool()
+    with pool.connection() as conn:
+        yield conn
+
+def iter_query(sql, params=(), batch_size=None):
+    """
+    Stream the rows of a read-only query, fetching batch_size rows at a time.
+    The pooled connection is held only while the caller iterates and goes back to
+    the pool as soon as the generator is exhausted or closed, so callers that stop
+    early should close it (or iterate inside a with contextlib.closing(...) block).
+
+    Args:
+        sql (str): The SELECT statement.
+        params (tuple): Its parameters.
+        batch_size (int, optional): Rows per fetchmany call; defaults to ITER_BATCH_SIZE.
+
+    Yields:
+        sqlite3.Row: One row at a time.
+    """
+    batch_size = batch_size or ITER_BATCH_SIZE
+    with db_connection(readonly=True) as conn:
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+
+def is_busy_error(error):
+    """Return True if a sqlite3 error means the database was locked by another connection."""
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    message = str(error)
+    return "database is locked" in message or "database table is locked" in message
+
+
+def run_in_transaction(work, retries=None):
+    """
+    Run work(conn) on a pooled read-write connection and commit, retrying the whole
+    transaction with exponential backoff if it fails with SQLITE_BUSY.
+
+    busy_timeout already waits for locks, but SQLite returns SQLITE_BUSY immediately
+    when waiting could deadlock (e.g. a WAL read transaction upgrading to a write),
+    so the transaction has to be restarted from the beginning. work must therefore
+    be safe to call more than once.
+
+    Args:
+        work (callable): Function taking the connection; its return value is returned.
+        retries (int, optional): Attempts after the first one (defaults to BUSY_RETRIES).
+    Returns:
+        The value returned by work.
+    Raises:
+        sqlite3.Error: The last error if every attempt failed, or any non-busy error.
+    """
+    retries = BUSY_RETRIES if retries is None else retries
+    for attempt in range(retries + 1):
+        try:
+            with db_connection() as conn:
+                return work(conn)
+        except sqlite3.OperationalError as e:
+            if attempt == retries or not is_busy_error(e):
+                raise
+            delay = BUSY_BACKOFF * 2 ** attempt
+            logging.warning(f"Database busy, retrying in {delay:.2f}s ({attempt + 1}/{retries}).")
+            time.sleep(delay + random.uniform(0, delay))
+
+
+# Set-based equivalents of the AFTER INSERT triggers on each table, applied once to
+# the id range of a bulk insert while those triggers are bypassed (see migrations 6, 9 and 10).
+# Each statement takes the first and last new id as parameters.
+BULK_INSERT_MAINTENANCE = {
+    "Expense": [
+        '''
+        INSERT INTO UserTotals (user_id, expense_minor, expense_count)
+        SELECT user_id, SUM(amount_minor), COUNT(*) FROM Expense
+        WHERE id BETWEEN ? AND ? GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE SET
+            expense_minor = expense_minor + excluded.expense_minor,
+            expense_count = expense_count + excluded.expense_count
+        ''',
+        '''
+        INSERT INTO MonthlyRollup (user_id, month, kind, category_id, category, total_minor, entry_count)
+        SELECT user_id, substr(date, 1, 7), 'expense', COALESCE(category_id, 0), '', SUM(amount_minor), COUNT(*)
+        FROM Expense WHERE id BETWEEN ? AND ? GROUP BY 1, 2, 4
+        ON CONFLICT (user_id, month, kind, category_id, category) DO UPDATE SET
+            total_minor = total_minor + excluded.total_minor,
+            entry_count = entry_count + excluded.entry_count
+        ''',
+        '''
+        INSERT INTO ExpenseSearch (rowid, owner, terms)
+        SELECT id, 'u' || user_id || 'x', COALESCE(title, '') || ' ' || COALESCE(description, '')
+        FROM Expense WHERE id BETWEEN ? AND ?
+        ''',
+    ],
+    "Income": [
+        '''
+        INSERT INTO UserTotals (user_id, income_minor, income_count)
+        SELECT user_id, SUM(amount_minor), COUNT(*) FROM Income
+        WHERE id BETWEEN ? AND ? GROUP BY user_id
+        ON CONFLICT (user_id) DO UPDATE SET
+            income_minor = income_minor + excluded.income_minor,
+            income_count = income_count + excluded.income_count
+        ''',
+        '''
+        INSERT INTO MonthlyRollup (user_id, month, kind, category_id, category, total_minor, entry_count)
+        SELECT user_id, substr(date, 1, 7), 'income', 0, COALESCE(source, ''), SUM(amount_minor), COUNT(*)
+        FROM Income WHERE id BETWEEN ? AND ? GROUP BY 1, 2, 5
+        ON CONFLICT (user_id, month, kind, category_id, category) DO UPDATE SET
+            total_minor = total_minor + excluded.total_minor,
+            entry_count = entry_count + excluded.entry_count
+        ''',
+        '''
+        INSERT INTO IncomeSearch (rowid, owner, terms)
+        SELECT id, 'u' || user_id || 'x', COALESCE(source, '') || ' ' || COALESCE(description, '')
+        FROM Income WHERE id BETWEEN ? AND ?
+        ''',
+    ],
+}
+
+
+def insert_chunked(conn, table, columns, rows, chunk_size):
+    """
+    Insert rows with executemany, chunk_size rows at a time, inside one write transaction.
+    The write lock is taken up front (BEGIN IMMEDIATE), so the AUTOINCREMENT ids of a
+    chunk are contiguous and can be derived from last_insert_rowid(). A caller that has
+    other writes to make in the same transaction begins it with BEGIN IMMEDIATE itself.
+
+    For tables listed in BULK_INSERT_MAINTENANCE the per-row AFTER INSERT triggers are
+    bypassed, and the summary tables they maintain are updated once, set-based, for the
+    whole id range before the transaction commits.
+
+    Args:
+        conn (sqlite3.Connection): A pooled connection with no active transaction, or in
+            one begun with BEGIN IMMEDIATE.
+        table (str): Name of the table to insert into.
+        columns (tuple): Column names, in the order of each row's values.
+        rows (list): Parameter tuples, one per row.
+        chunk_size (int): Number of rows passed to each executemany call.
+    Returns:
+        list: The ids of the inserted rows, in the order of rows.
+    """
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    maintenance = BULK_INSERT_MAINTENANCE.get(table, [])
+    cursor = conn.cursor()
+    if not conn.in_transaction:
+        cursor.execute("BEGIN IMMEDIATE")
+    if maintenance:
+        cursor.execute("INSERT INTO BulkLoad (table_name) VALUES (?)", (table,))
+
+    ids = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        cursor.executemany(sql, chunk)
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+
+    if maintenance:
+        if ids:
+            for statement in maintenance:
+                cursor.execute(statement, (ids[0], ids[-1]))
+        cursor.execute("DELETE FROM BulkLoad WHERE table_name = ?", (table,))
+    return ids
+
+
 def initialize_db():
     """
-    Initialize the database with required tables and default data.
-    Ensures tables are created only if they don't exist.
+    Bring the database schema up to date by applying any pending migrations.
+    Call once at application startup; later calls return without touching the database.
     """
+    global _schema_ready
+    if _schema_ready:
+        return
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Create User table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS User (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                email TEXT UNIQUE NOT NULL CHECK(email LIKE '%@%.%'),
-                password TEXT NOT NULL,
-                user_type TEXT NOT NULL CHECK(user_type IN ('ADMIN', 'USER')),
-                is_staff INTEGER DEFAULT 0,
-                is_superuser INTEGER DEFAULT 0
-            )
-        ''')
-
-        # Create Category table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Category (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                icon TEXT
-            )
-        ''')
-
-        # Create Expense table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Expense (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                title TEXT NOT NULL,
-                amount REAL NOT NULL,
-                currency TEXT NOT NULL,
-                category TEXT,
-                date TEXT NOT NULL,
-                description TEXT,
-                receipt TEXT,
-                FOREIGN KEY (user_id) REFERENCES User(id)
-            )
-        ''')
-
-        # Create Income table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Income (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                source TEXT NOT NULL,
-                amount REAL NOT NULL,
-                date TEXT NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES User(id)
-            )
-        ''')
-
-        # Add default categories
-        default_categories = [
-            ("Food", "food_icon.png"),
-            ("Transport", "transport_icon.png"),
-            ("Entertainment", "entertainment_icon.png"),
-        ]
-        cursor.executemany('''
-            INSERT OR IGNORE INTO Category (name, icon) VALUES (?, ?)
-        ''', default_categories)
-
-        # Add default admin user (use hashed passwords in production)
-        default_admin = [
-            ("admin", "admin@example.com", "hashed_password", "ADMIN", 1, 1),  # Replace "hashed_password" with actual hash
-        ]
-        cursor.executemany('''
-            INSERT OR IGNORE INTO User (username, email, password, user_type, is_staff, is_superuser)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', default_admin)
-
-        # Commit changes
-        conn.commit()
-        logging.info("Database initialized successfully.")
+        with db_connection() as conn:
+            version = migrate(conn)
+        _schema_ready = True
+        logging.info(f"Database initialized successfully (schema version {version}).")
     except sqlite3.Error as e:
         logging.error(f"Error initializing database: {e}")
-    finally:
-        conn.close()
 
 
-# Ensure the database is initialized when this module is imported
-if not DB_PATH.exists():  # Only initialize if the database file doesn't exist
-    initialize_db()
\ No newline at end of file
+def _iso_date_or_original(date):
+    """SQL helper: normalize a date to ISO form, leaving unparseable values untouched."""
+    try:
+        return to_iso_date(date)
+    except (TypeError, ValueError):
+        return date
+
+
+def merge_legacy_database(legacy_path):
+    """
+    Copy the expenses and incomes of an older, separate database file into the
+    configured database, then rename the old file so the merge runs only once.
+
+    Earlier versions kept expenses in finance_tracker.db while users and
+    categories lived in expense_tracker.db.
+
+    Args:
+        legacy_path (str | Path): Path of the old database file.
+    Returns:
+        bool: True if data was merged, False if there was nothing to merge or it failed.
+    """
+    legacy_path = Path(legacy_path)
+    if not legacy_path.exists() or legacy_path.resolve() == DB_PATH.resolve():
+        return False
+    try:
+        with db_connection() as conn:
+            conn.create_function("to_minor", 2, to_minor, deterministic=True)
+            conn.create_function("currency_exponent", 1, currency_exponent, deterministic=True)
+            conn.create_function("iso_date", 1, _iso_date_or_original, deterministic=True)
+            conn.execute("ATTACH DATABASE ? AS legacy", (str(legacy_path),))
+            try:
+                conn.execute('''
+                    INSERT OR IGNORE INTO main.Category (name)
+                    SELECT DISTINCT trim(category) FROM legacy.Expense WHERE trim(category) != ''
+                ''')
+                conn.execute('''
+                    INSERT INTO Expense (user_id, title, amount_minor, currency, currency_exponent,
+                                         category_id, date, description, receipt)
+                    SELECT user_id, title, to_minor(amount, currency_exponent(currency)), currency,
+                           currency_exponent(currency),
+                           (SELECT id FROM main.Category WHERE name = trim(category)),
+                           iso_date(date), description, receipt
+                    FROM legacy.Expense
+                ''')
+                conn.execute('''
+                    INSERT INTO Income (user_id, source, amount_minor, date)
+                    SELECT user_id, source, to_minor(amount, 2), iso_date(date)
+                    FROM legacy.Income
+                ''')
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            finally:
+                conn.execute("DETACH DATABASE legacy")
+        bump_data_version()
+        legacy_path.rename(legacy_path.with_name(legacy_path.name + ".merged"))
+        logging.info(f"Merged legacy database '{legacy_path}' into '{DB_PATH}'.")
+        return True
+    except (sqlite3.Error, OSError) as e:
+        logging.error(f"Error merging legacy database '{legacy_path}': {e}")
+        return False
@@ -0,0 +1,586 @@
+import sqlite3
+import logging
+
+from utils.helpers import to_iso_date, search_terms
+from utils.money import to_minor, currency_exponent
+
+
+def _column_exists(cursor, table, column):
+    """Check whether a column is already present on a table."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return any(row[1] == column for row in cursor.fetchall())
+
+
+def _add_column(cursor, table, column, definition):
+    """Add a column to a table unless it already exists."""
+    if not _column_exists(cursor, table, column):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def _001_base_schema(cursor):
+    """
+    Create the original User, Category, Expense and Income tables with default data.
+    Uses IF NOT EXISTS so databases created before versioning are adopted as-is.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS User (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL CHECK(email LIKE '%@%.%'),
+            password TEXT NOT NULL,
+            user_type TEXT NOT NULL CHECK(user_type IN ('ADMIN', 'USER')),
+            is_staff INTEGER DEFAULT 0,
+            is_superuser INTEGER DEFAULT 0
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Category (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            icon TEXT
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Expense (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            amount REAL NOT NULL,
+            currency TEXT NOT NULL,
+            category TEXT,
+            date TEXT NOT NULL,
+            description TEXT,
+            receipt TEXT,
+            FOREIGN KEY (user_id) REFERENCES User(id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Income (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            source TEXT NOT NULL,
+            amount REAL NOT NULL,
+            date TEXT NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES User(id)
+        )
+    ''')
+
+    # Add default categories
+    default_categories = [
+        ("Food", "food_icon.png"),
+        ("Transport", "transport_icon.png"),
+        ("Entertainment", "entertainment_icon.png"),
+    ]
+    cursor.executemany('''
+        INSERT OR IGNORE INTO Category (name, icon) VALUES (?, ?)
+    ''', default_categories)
+
+    # Add default admin user (use hashed passwords in production)
+    default_admin = [
+        ("admin", "admin@example.com", "hashed_password", "ADMIN", 1, 1),  # Replace "hashed_password" with actual hash
+    ]
+    cursor.executemany('''
+        INSERT OR IGNORE INTO User (username, email, password, user_type, is_staff, is_superuser)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', default_admin)
+
+
+def _002_profiles_budgets(cursor):
+    """
+    Create the UserProfile and Budget tables and the Expense.category_id and
+    Income.description columns that the services already query.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS UserProfile (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER UNIQUE NOT NULL,
+            default_currency TEXT NOT NULL DEFAULT 'NLe',
+            monthly_income REAL,
+            theme_preference TEXT NOT NULL DEFAULT 'dark' CHECK(theme_preference IN ('light', 'dark')),
+            FOREIGN KEY (user_id) REFERENCES User(id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS Budget (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            amount REAL NOT NULL,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES User(id)
+        )
+    ''')
+
+    _add_column(cursor, "Expense", "category_id", "INTEGER REFERENCES Category(id)")
+    _add_column(cursor, "Income", "description", "TEXT")
+
+    # Give every existing user a profile so update_profile() has a row to update
+    cursor.execute('''
+        INSERT OR IGNORE INTO UserProfile (user_id)
+        SELECT id FROM User
+    ''')
+
+
+def _003_report_indexes(cursor):
+    """
+    Normalize stored dates to zero-padded ISO form and index transactions by (user_id, date).
+
+    Reports filter on half-open date ranges, which only works as a string
+    comparison when every date is 'YYYY-MM-DD'. Including amount makes the
+    index covering for range totals, so they never touch the table itself.
+    """
+    for table in ("Expense", "Income"):
+        cursor.execute(f'''
+            SELECT id, date FROM {table}
+            WHERE date NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+        ''')
+        fixes = []
+        for row_id, date in cursor.fetchall():
+            try:
+                fixes.append((to_iso_date(date), row_id))
+            except (TypeError, ValueError):
+                logging.warning(f"Leaving unrecognised {table} date '{date}' (id {row_id}) unchanged.")
+        cursor.executemany(f"UPDATE {table} SET date = ? WHERE id = ?", fixes)
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_expense_user_date ON Expense (user_id, date, amount)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_income_user_date ON Income (user_id, date, amount)")
+
+
+def _rebuild_table(cursor, table, create_sql, columns, select_sql):
+    """
+    Replace a table with a new definition, copying rows through select_sql.
+    SQLite cannot change a column's type in place, so the table is recreated
+    and its AUTOINCREMENT counter carried over.
+    """
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+    row = cursor.fetchone()
+    seq = row[0] if row else 0
+
+    cursor.execute(create_sql.format(table=f"{table}_new"))
+    cursor.execute(f"INSERT INTO {table}_new ({columns}) {select_sql}")
+    cursor.execute(f"DROP TABLE {table}")
+    cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+    cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (seq, table))
+
+
+def _004_integer_money(cursor):
+    """
+    Store Expense and Income amounts as integer minor units (amount_minor) with a
+    currency exponent, so totals can be summed exactly inside SQLite.
+    """
+    conn = cursor.connection
+    conn.create_function("to_minor", 2, to_minor, deterministic=True)
+    conn.create_function("currency_exponent", 1, currency_exponent, deterministic=True)
+
+    _rebuild_table(cursor, "Expense", '''
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            amount_minor INTEGER NOT NULL,
+            currency TEXT NOT NULL,
+            currency_exponent INTEGER NOT NULL DEFAULT 2,
+            category TEXT,
+            category_id INTEGER REFERENCES Category(id),
+            date TEXT NOT NULL,
+            description TEXT,
+            receipt TEXT,
+            FOREIGN KEY (user_id) REFERENCES User(id)
+        )
+    ''',
+        "id, user_id, title, amount_minor, currency, currency_exponent, category, category_id, date, description, receipt",
+        '''SELECT id, user_id, title, to_minor(amount, currency_exponent(currency)), currency,
+                  currency_exponent(currency), category, category_id, date, description, receipt
+           FROM Expense''',
+    )
+
+    _rebuild_table(cursor, "Income", '''
+        CREATE TABLE {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            source TEXT NOT NULL,
+            amount_minor INTEGER NOT NULL,
+            currency TEXT NOT NULL DEFAULT 'NLe',
+            currency_exponent INTEGER NOT NULL DEFAULT 2,
+            date TEXT NOT NULL,
+            description TEXT,
+            FOREIGN KEY (user_id) REFERENCES User(id)
+        )
+    ''',
+        "id, user_id, source, amount_minor, date, description",
+        "SELECT id, user_id, source, to_minor(amount, 2), date, description FROM Income",
+    )
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_expense_user_date ON Expense (user_id, date, amount_minor)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_income_user_date ON Income (user_id, date, amount_minor)")
+
+
+def _005_user_totals(cursor):
+    """
+    Keep each user's expense and income totals and counts in a UserTotals row,
+    maintained by triggers, so dashboard totals are a primary-key lookup.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS UserTotals (
+            user_id INTEGER PRIMARY KEY,
+            expense_minor INTEGER NOT NULL DEFAULT 0,
+            expense_count INTEGER NOT NULL DEFAULT 0,
+            income_minor INTEGER NOT NULL DEFAULT 0,
+            income_count INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    for table, prefix in (("Expense", "expense"), ("Income", "income")):
+        add = f'''
+            INSERT INTO UserTotals (user_id, {prefix}_minor, {prefix}_count)
+            VALUES (NEW.user_id, NEW.amount_minor, 1)
+            ON CONFLICT (user_id) DO UPDATE SET
+                {prefix}_minor = {prefix}_minor + excluded.{prefix}_minor,
+                {prefix}_count = {prefix}_count + 1;
+        '''
+        subtract = f'''
+            UPDATE UserTotals
+            SET {prefix}_minor = {prefix}_minor - OLD.amount_minor,
+                {prefix}_count = {prefix}_count - 1
+            WHERE user_id = OLD.user_id;
+        '''
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {prefix}_totals_insert AFTER INSERT ON {table} BEGIN {add} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {prefix}_totals_delete AFTER DELETE ON {table} BEGIN {subtract} END")
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {prefix}_totals_update AFTER UPDATE OF user_id, amount_minor ON {table}
+            BEGIN {subtract} {add} END
+        ''')
+
+    cursor.execute("DELETE FROM UserTotals")
+    cursor.execute('''
+        INSERT INTO UserTotals (user_id, expense_minor, expense_count, income_minor, income_count)
+        SELECT user_id, SUM(expense_minor), SUM(expense_count), SUM(income_minor), SUM(income_count)
+        FROM (
+            SELECT user_id, SUM(amount_minor) AS expense_minor, COUNT(*) AS expense_count,
+                   0 AS income_minor, 0 AS income_count
+            FROM Expense GROUP BY user_id
+            UNION ALL
+            SELECT user_id, 0, 0, SUM(amount_minor), COUNT(*)
+            FROM Income GROUP BY user_id
+        )
+        GROUP BY user_id
+    ''')
+
+
+def _006_monthly_rollup(cursor):
+    """
+    Keep per-user, per-month, per-category expense and income sums and counts in a
+    MonthlyRollup table, maintained by triggers, so reports read a few pre-aggregated
+    rows instead of the ledger. Income rows are grouped by source.
+
+    Also adds the BulkLoad marker table. While a bulk insert has a row for a table
+    in BulkLoad (only ever inside its own transaction), the AFTER INSERT triggers on
+    that table are skipped and the writer applies the same changes set-based instead
+    (see database.db.BULK_INSERT_MAINTENANCE).
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS MonthlyRollup (
+            user_id INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            kind TEXT NOT NULL CHECK(kind IN ('expense', 'income')),
+            category TEXT NOT NULL,
+            total_minor INTEGER NOT NULL DEFAULT 0,
+            entry_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, month, kind, category)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE TABLE IF NOT EXISTS BulkLoad (table_name TEXT PRIMARY KEY)")
+
+    for table, kind, category in (("Expense", "expense", "category"), ("Income", "income", "source")):
+        not_bulk = f"NOT EXISTS (SELECT 1 FROM BulkLoad WHERE table_name = '{table}')"
+
+        # Re-create the migration 5 insert trigger so bulk inserts can bypass it
+        cursor.execute(f"DROP TRIGGER IF EXISTS {kind}_totals_insert")
+        cursor.execute(f'''
+            CREATE TRIGGER {kind}_totals_insert AFTER INSERT ON {table} WHEN {not_bulk}
+            BEGIN
+                INSERT INTO UserTotals (user_id, {kind}_minor, {kind}_count)
+                VALUES (NEW.user_id, NEW.amount_minor, 1)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    {kind}_minor = {kind}_minor + excluded.{kind}_minor,
+                    {kind}_count = {kind}_count + 1;
+            END
+        ''')
+
+        add = f'''
+            INSERT INTO MonthlyRollup (user_id, month, kind, category, total_minor, entry_count)
+            VALUES (NEW.user_id, substr(NEW.date, 1, 7), '{kind}', COALESCE(NEW.{category}, ''), NEW.amount_minor, 1)
+            ON CONFLICT (user_id, month, kind, category) DO UPDATE SET
+                total_minor = total_minor + excluded.total_minor,
+                entry_count = entry_count + 1;
+        '''
+        subtract = f'''
+            UPDATE MonthlyRollup
+            SET total_minor = total_minor - OLD.amount_minor, entry_count = entry_count - 1
+            WHERE user_id = OLD.user_id AND month = substr(OLD.date, 1, 7)
+              AND kind = '{kind}' AND category = COALESCE(OLD.{category}, '');
+            DELETE FROM MonthlyRollup
+            WHERE user_id = OLD.user_id AND month = substr(OLD.date, 1, 7)
+              AND kind = '{kind}' AND category = COALESCE(OLD.{category}, '') AND entry_count = 0;
+        '''
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {kind}_rollup_insert AFTER INSERT ON {table} WHEN {not_bulk} BEGIN {add} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {kind}_rollup_delete AFTER DELETE ON {table} BEGIN {subtract} END")
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {kind}_rollup_update
+            AFTER UPDATE OF user_id, amount_minor, date, {category} ON {table}
+            BEGIN {subtract} {add} END
+        ''')
+
+    cursor.execute("DELETE FROM MonthlyRollup")
+    cursor.execute('''
+        INSERT INTO MonthlyRollup (user_id, month, kind, category, total_minor, entry_count)
+        SELECT user_id, substr(date, 1, 7), 'expense', COALESCE(category, ''), SUM(amount_minor), COUNT(*)
+        FROM Expense GROUP BY 1, 2, 4
+        UNION ALL
+        SELECT user_id, substr(date, 1, 7), 'income', COALESCE(source, ''), SUM(amount_minor), COUNT(*)
+        FROM Income GROUP BY 1, 2, 4
+    ''')
+
+
+def _007_search_index(cursor):
+    """
+    Add contentless FTS5 indexes over expense titles and descriptions and income
+    sources and descriptions, kept in sync by triggers.
+
+    The indexed text comes from the search_terms() SQL function (registered on every
+    connection by database.db), which adds owner-scoped copies of each word so that
+    one user's search reads only that user's part of the index.
+    """
+    cursor.connection.create_function("search_terms", -1, search_terms, deterministic=True)
+    cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS ExpenseSearch USING fts5(terms, content='')")
+    cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS IncomeSearch USING fts5(terms, content='')")
+
+    for table, index, text in (("Expense", "ExpenseSearch", "title"), ("Income", "IncomeSearch", "source")):
+        not_bulk = f"NOT EXISTS (SELECT 1 FROM BulkLoad WHERE table_name = '{table}')"
+        add = f'''
+            INSERT INTO {index} (rowid, terms)
+            VALUES (NEW.id, search_terms(NEW.user_id, NEW.{text}, NEW.description));
+        '''
+        # Contentless indexes can only remove a row given the exact text it was indexed with
+        remove = f'''
+            INSERT INTO {index} ({index}, rowid, terms)
+            VALUES ('delete', OLD.id, search_terms(OLD.user_id, OLD.{text}, OLD.description));
+        '''
+        prefix = index.lower()
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {prefix}_insert AFTER INSERT ON {table} WHEN {not_bulk} BEGIN {add} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {prefix}_delete AFTER DELETE ON {table} BEGIN {remove} END")
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {prefix}_update AFTER UPDATE OF user_id, {text}, description ON {table}
+            BEGIN {remove} {add} END
+        ''')
+        cursor.execute(f"INSERT INTO {index} ({index}) VALUES ('delete-all')")
+        cursor.execute(f'''
+            INSERT INTO {index} (rowid, terms)
+            SELECT id, search_terms(user_id, {text}, description) FROM {table}
+        ''')
+
+
+def _008_listing_indexes(cursor):
+    """
+    Index transactions by (user_id, category, date) and (user_id, source, date) for
+    keyset-paginated listings filtered by category or source; the implicit rowid at
+    the end of each index gives the (date, id) order without a sort.
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_expense_user_category_date ON Expense (user_id, category, date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_income_user_source_date ON Income (user_id, source, date)")
+
+
+def _009_category_keys(cursor):
+    """
+    Replace the free-text Expense.category with the category_id foreign key.
+
+    Every category name in use becomes a Category row and each expense points at it;
+    the text column is then dropped. MonthlyRollup is re-keyed on (category_id,
+    category): expense rows group on the integer category_id (0 when uncategorized)
+    and income rows keep their source text in category with category_id 0. The
+    rollup triggers and the category listing index are re-created on the new keys.
+    """
+    cursor.execute('''
+        INSERT OR IGNORE INTO Category (name)
+        SELECT DISTINCT trim(category) FROM Expense WHERE trim(category) != ''
+    ''')
+    cursor.execute('''
+        UPDATE Expense
+        SET category_id = (SELECT id FROM Category WHERE name = trim(Expense.category))
+        WHERE trim(category) != ''
+    ''')
+
+    # DROP COLUMN refuses columns still used by an index or trigger
+    cursor.execute("DROP INDEX IF EXISTS idx_expense_user_category_date")
+    for kind in ("expense", "income"):
+        for event in ("insert", "delete", "update"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {kind}_rollup_{event}")
+    cursor.execute("ALTER TABLE Expense DROP COLUMN category")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_expense_user_category_id_date ON Expense (user_id, category_id, date)"
+    )
+
+    cursor.execute("DROP TABLE MonthlyRollup")
+    cursor.execute('''
+        CREATE TABLE MonthlyRollup (
+            user_id INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            kind TEXT NOT NULL CHECK(kind IN ('expense', 'income')),
+            category_id INTEGER NOT NULL DEFAULT 0,
+            category TEXT NOT NULL DEFAULT '',
+            total_minor INTEGER NOT NULL DEFAULT 0,
+            entry_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, month, kind, category_id, category)
+        ) WITHOUT ROWID
+    ''')
+
+    for table, kind, category_id, category, watched in (
+        ("Expense", "expense", "COALESCE({row}.category_id, 0)", "''", "category_id"),
+        ("Income", "income", "0", "COALESCE({row}.source, '')", "source"),
+    ):
+        not_bulk = f"NOT EXISTS (SELECT 1 FROM BulkLoad WHERE table_name = '{table}')"
+        add = f'''
+            INSERT INTO MonthlyRollup (user_id, month, kind, category_id, category, total_minor, entry_count)
+            VALUES (NEW.user_id, substr(NEW.date, 1, 7), '{kind}', {category_id.format(row="NEW")},
+                    {category.format(row="NEW")}, NEW.amount_minor, 1)
+            ON CONFLICT (user_id, month, kind, category_id, category) DO UPDATE SET
+                total_minor = total_minor + excluded.total_minor,
+                entry_count = entry_count + 1;
+        '''
+        old_key = f'''
+            user_id = OLD.user_id AND month = substr(OLD.date, 1, 7) AND kind = '{kind}'
+            AND category_id = {category_id.format(row="OLD")} AND category = {category.format(row="OLD")}
+        '''
+        subtract = f'''
+            UPDATE MonthlyRollup
+            SET total_minor = total_minor - OLD.amount_minor, entry_count = entry_count - 1
+            WHERE {old_key};
+            DELETE FROM MonthlyRollup WHERE {old_key} AND entry_count = 0;
+        '''
+        cursor.execute(f"CREATE TRIGGER {kind}_rollup_insert AFTER INSERT ON {table} WHEN {not_bulk} BEGIN {add} END")
+        cursor.execute(f"CREATE TRIGGER {kind}_rollup_delete AFTER DELETE ON {table} BEGIN {subtract} END")
+        cursor.execute(f'''
+            CREATE TRIGGER {kind}_rollup_update
+            AFTER UPDATE OF user_id, amount_minor, date, {watched} ON {table}
+            BEGIN {subtract} {add} END
+        ''')
+
+    cursor.execute('''
+        INSERT INTO MonthlyRollup (user_id, month, kind, category_id, category, total_minor, entry_count)
+        SELECT user_id, substr(date, 1, 7), 'expense', COALESCE(category_id, 0), '', SUM(amount_minor), COUNT(*)
+        FROM Expense GROUP BY 1, 2, 4
+        UNION ALL
+        SELECT user_id, substr(date, 1, 7), 'income', 0, COALESCE(source, ''), SUM(amount_minor), COUNT(*)
+        FROM Income GROUP BY 1, 2, 5
+    ''')
+
+
+def _010_plain_sql_search_index(cursor):
+    """
+    Rebuild the full-text search indexes so their triggers use only built-in SQL.
+
+    Migration 7 computed the indexed text with the application's search_terms()
+    function, so any other SQLite client (the sqlite3 shell, DB browsers, backup
+    scripts) failed on every insert into Expense or Income. Each index now has an
+    owner column holding the token 'u' || user_id || 'x' next to the text itself;
+    a user's search matches owner:u7x AND terms:word. Searches use no phrases or
+    NEAR, so the indexes keep no token positions (detail=column), which keeps the
+    extra owner match cheap.
+    """
+    for table, index, text in (("Expense", "ExpenseSearch", "title"), ("Income", "IncomeSearch", "source")):
+        prefix = index.lower()
+        for event in ("insert", "delete", "update"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {prefix}_{event}")
+        cursor.execute(f"DROP TABLE IF EXISTS {index}")
+        cursor.execute(f"CREATE VIRTUAL TABLE {index} USING fts5(owner, terms, content='', detail=column)")
+
+        not_bulk = f"NOT EXISTS (SELECT 1 FROM BulkLoad WHERE table_name = '{table}')"
+        values = "'u' || {row}.user_id || 'x', COALESCE({row}.%s, '') || ' ' || COALESCE({row}.description, '')" % text
+        add = f'''
+            INSERT INTO {index} (rowid, owner, terms)
+            VALUES (NEW.id, {values.format(row="NEW")});
+        '''
+        # Contentless indexes can only remove a row given the exact text it was indexed with
+        remove = f'''
+            INSERT INTO {index} ({index}, rowid, owner, terms)
+            VALUES ('delete', OLD.id, {values.format(row="OLD")});
+        '''
+        cursor.execute(f"CREATE TRIGGER {prefix}_insert AFTER INSERT ON {table} WHEN {not_bulk} BEGIN {add} END")
+        cursor.execute(f"CREATE TRIGGER {prefix}_delete AFTER DELETE ON {table} BEGIN {remove} END")
+        cursor.execute(f'''
+            CREATE TRIGGER {prefix}_update AFTER UPDATE OF user_id, {text}, description ON {table}
+            BEGIN {remove} {add} END
+        ''')
+        cursor.execute(f'''
+            INSERT INTO {index} (rowid, owner, terms)
+            SELECT id, {values.format(row=table)} FROM {table}
+        ''')
+
+
+# Ordered list of (version, description, migration function).
+# Append new migrations to the end; never edit or reorder an applied one.
+MIGRATIONS = [
+    (1, "base schema", _001_base_schema),
+    (2, "user profiles and budgets", _002_profiles_budgets),
+    (3, "ISO dates and report indexes", _003_report_indexes),
+    (4, "integer minor-unit amounts", _004_integer_money),
+    (5, "trigger-maintained user totals", _005_user_totals),
+    (6, "monthly category rollup and bulk-load bypass", _006_monthly_rollup),
+    (7, "full-text search indexes", _007_search_index),
+    (8, "category and source listing indexes", _008_listing_indexes),
+    (9, "category foreign keys", _009_category_keys),
+    (10, "plain SQL search index triggers", _010_plain_sql_search_index),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Return the schema version recorded in the database (PRAGMA user_version)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """
+    Bring the database schema up to date.
+
+    Each pending migration runs in its own write transaction together with the
+    user_version bump, so a failed migration leaves the previous version intact
+    and an up-to-date database costs a single PRAGMA read.
+
+    Args:
+        conn (sqlite3.Connection): An open connection with no active transaction.
+    Returns:
+        int: The schema version after migrating.
+    """
+    version = get_schema_version(conn)
+    if version >= LATEST_VERSION:
+        return version
+
+    # The search triggers of migrations 7 to 9 call search_terms(); migration 10 replaces them
+    conn.create_function("search_terms", -1, search_terms, deterministic=True)
+
+    for target, description, apply in MIGRATIONS:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read inside the write lock in case another process migrated meanwhile
+            if get_schema_version(conn) >= target:
+                conn.rollback()
+                continue
+            apply(cursor)
+            cursor.execute(f"PRAGMA user_version = {target}")
+            conn.commit()
+            logging.info(f"Applied database migration {target}: {description}.")
+        except sqlite3.Error:
+            conn.rollback()
+            logging.error(f"Database migration {target} ({description}) failed.")
+            raise
+
+    return get_schema_version(conn)
@@ -0,0 +1,136 @@
+import sqlite3
+import queue
+import threading
+import logging
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """
+    A small pool of long-lived, pre-configured SQLite connections.
+
+    Connections are checked out for the duration of a ``with pool.connection()``
+    block and returned afterwards, so pragmas and the per-connection statement
+    cache survive between service calls instead of being rebuilt every time.
+    """
+
+    def __init__(self, database, size=5, timeout=5.0, cached_statements=256, uri=False,
+                 journal_mode=None, synchronous=None, readonly=False, on_connect=None):
+        """
+        Args:
+            database (str | Path): Path of the SQLite database file, or a file: URI.
+            size (int): Maximum number of open connections.
+            timeout (float): Seconds to wait for a free connection or a database lock (busy_timeout).
+            cached_statements (int): Size of each connection's prepared statement cache.
+            uri (bool): Interpret database as a URI (needed for shared in-memory databases).
+            journal_mode (str, optional): Journal mode to switch the database to, e.g. "WAL".
+            synchronous (str, optional): Per-connection synchronous level, e.g. "NORMAL".
+            readonly (bool): Open connections with query_only set, so they can never write.
+            on_connect (callable, optional): Called with every new connection, e.g. to register SQL functions.
+        """
+        self.database = str(database)
+        self.size = size
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self.uri = uri
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.readonly = readonly
+        self.on_connect = on_connect
+        # LIFO keeps the most recently used (warmest) connection in rotation
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+    def _connect(self):
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self.database,
+            timeout=self.timeout,
+            check_same_thread=False,  # Connections move between threads via the pool
+            cached_statements=self.cached_statements,
+            uri=self.uri,
+        )
+        conn.row_factory = sqlite3.Row  # Access columns by name
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -8000")  # ~8 MB page cache per connection
+        conn.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+        if self.journal_mode:
+            # Persistent in the database file; a no-op once the mode is already set
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        if self.synchronous:
+            conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        if self.readonly:
+            conn.execute("PRAGMA query_only = ON")
+        if self.on_connect:
+            self.on_connect(conn)
+        return conn
+
+    def acquire(self):
+        """
+        Check a connection out of the pool, opening a new one if the pool is not full.
+        Raises:
+            sqlite3.OperationalError: If the pool is closed or no connection frees up in time.
+        """
+        if self._closed:
+            raise sqlite3.OperationalError("Connection pool is closed.")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except sqlite3.Error:
+                    self._created -= 1
+                    raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a free database connection.")
+
+    def release(self, conn):
+        """Return a connection to the pool, discarding any unfinished transaction."""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of a with block.
+        Commits when the block succeeds and rolls back if it raises.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close every idle connection; checked-out connections are closed on release."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+        logging.info("Database connection pool closed.")
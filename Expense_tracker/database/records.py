@@ -0,0 +1,119 @@
+from collections.abc import Mapping
+
+from utils.money import from_minor
+
+
+class Record(Mapping):
+    """
+    Base class for the compact, read-only records returned by the services.
+
+    Values live in __slots__ instead of a per-row dict, which saves most of the
+    memory and allocation cost of large listings. Records still behave like the
+    dictionaries the services used to return: record["title"], record.get(...),
+    keys(), values(), items(), dict(record) and comparison with a dict all work,
+    and the same values are available as attributes (record.title).
+
+    Subclasses list their slots in database column order, so a record can be
+    built straight from a query row (Expense(*row)), and list in FIELDS the keys
+    of the mapping view, which may include computed properties.
+
+    Records are shared by the result cache, so they cannot be changed once built:
+    assigning or deleting an attribute raises AttributeError. They are built with one
+    value per slot, in slot order, which Record.__init__ stores through the slots'
+    own descriptors.
+    """
+    __slots__ = ()
+    FIELDS = ()
+    _SETTERS = ()  # The slots' descriptor setters, in slot order
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # A subclass of a record adds its slots after those of the record it extends
+        cls._SETTERS = tuple(
+            klass.__dict__[name].__set__
+            for klass in reversed(cls.__mro__) if "__slots__" in klass.__dict__
+            for name in klass.__slots__
+        )
+
+    def __init__(self, *values):
+        if len(values) != len(self._SETTERS):
+            raise TypeError(f"{type(self).__name__} takes {len(self._SETTERS)} values, got {len(values)}")
+        for set_slot, value in zip(self._SETTERS, values):
+            set_slot(self, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} records are read-only")
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class Expense(Record):
+    """
+    One expense; amount is derived from the integer amount_minor. category is the
+    name of category_id, looked up by the service that builds the record.
+    """
+    __slots__ = ("id", "user_id", "title", "amount_minor", "currency", "currency_exponent", "category_id", "date",
+                 "category")
+    FIELDS = ("id", "user_id", "title", "amount", "amount_minor", "currency", "category_id", "category", "date")
+
+    @property
+    def amount(self):
+        return from_minor(self.amount_minor, self.currency_exponent)
+
+
+class Income(Record):
+    """One income; amount is derived from the integer amount_minor."""
+    __slots__ = ("id", "source", "amount_minor", "currency_exponent", "date")
+    FIELDS = ("id", "source", "amount", "amount_minor", "date")
+
+    @property
+    def amount(self):
+        return from_minor(self.amount_minor, self.currency_exponent)
+
+
+class ReportExpense(Expense):
+    """An expense as listed in a report, with its description."""
+    __slots__ = ("description",)
+    FIELDS = Expense.FIELDS + ("description",)
+
+
+class ReportIncome(Income):
+    """An income as listed in a report, with its owner and description."""
+    __slots__ = ("user_id", "description")
+    FIELDS = ("id", "user_id", "source", "amount", "amount_minor", "date", "description")
+
+
+class User(Record):
+    """One user account (without the password hash)."""
+    __slots__ = ("id", "username", "email", "user_type", "is_staff", "is_superuser")
+    FIELDS = __slots__
+
+    def __init__(self, id, username, email, user_type, is_staff, is_superuser):
+        super().__init__(id, username, email, user_type, bool(is_staff), bool(is_superuser))
+
+
+class Category(Record):
+    """One expense category."""
+    __slots__ = ("id", "name", "icon")
+    FIELDS = __slots__
+
+
+class Profile(Record):
+    """One user's profile settings."""
+    __slots__ = ("id", "user_id", "default_currency", "monthly_income", "theme_preference")
+    FIELDS = __slots__
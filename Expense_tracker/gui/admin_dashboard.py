@@ -1,19 +1,31 @@
 import customtkinter as ctk
 from tkinter import messagebox
-from services.income_service import get_all_incomes, get_total_income
-from services.expense_service import get_all_expenses, get_total_expenses
-from services.user_service import get_all_users
+from services.income_service import iter_all_incomes
+from services.expense_service import iter_all_expenses
+from services.user_service import iter_all_users, get_admin_summary
+from services.search_service import search_transactions
+from utils.cache import data_version
+from utils.money import format_money
+from gui.task_runner import TaskRunner
+from gui.view_manager import ViewManager
 
 
 class AdminDashboard:
-    def __init__(self, root):
+    def __init__(self, root, on_logout=None):
         """
         Initializes the admin dashboard with a professional and responsive design.
+
+        Args:
+            root: The frame the dashboard fills (the window itself when run standalone).
+            on_logout (callable, optional): Called after logging out to show the next
+                screen; without one, logging out closes the window.
         """
         self.root = root
-        self.root.title("Income & Expense Tracker - Admin Dashboard")
-        self.root.geometry("1200x800")
-        self.root.resizable(True, True)
+        self.window = root.winfo_toplevel()
+        self.on_logout = on_logout
+        self.window.title("Income & Expense Tracker - Admin Dashboard")
+        self.window.geometry("1200x800")
+        self.window.resizable(True, True)
 
         # Configure appearance mode (Dark by default)
         ctk.set_appearance_mode("Dark")
@@ -46,6 +58,11 @@ class AdminDashboard:
         )
         self.mode_toggle.pack(pady=10, padx=10)
 
+        # Search Box (full-text search over titles, sources and descriptions)
+        self.entry_search = ctk.CTkEntry(self.sidebar, placeholder_text="🔍 Search...", font=("Arial", 14), corner_radius=8)
+        self.entry_search.pack(fill="x", padx=10, pady=5)
+        self.entry_search.bind("<Return>", lambda event: self.show_search_results())
+
         # Sidebar Buttons with Font Awesome Icons
         buttons = [
             ("👥 View All Users", self.show_users),
@@ -64,10 +81,27 @@ class AdminDashboard:
                 hover_color="#333333"
             ).pack(fill="x", padx=10, pady=5)
 
+        # Loading state, shown while background tasks run
+        self.label_status = ctk.CTkLabel(self.sidebar, text="", font=("Arial", 14), text_color="white")
+        self.label_status.pack(side="bottom", pady=10)
+
         # Main Content Area
         self.main_content = ctk.CTkFrame(self.root, corner_radius=8, fg_color="#2B2B2B")
         self.main_content.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
 
+        # Listings and searches are read on worker threads so the window stays responsive
+        self.tasks = TaskRunner(self.root, on_busy=self._set_busy)
+        self.read_at = {}  # View name -> data version its data was read at
+        self.loading = None  # Listing view whose rows are still streaming in
+
+        # Each view is built on first use and then kept while the data it shows is unchanged
+        self.views = ViewManager(self.main_content)
+        self.views.register("dashboard", self.build_dashboard)
+        self.views.register("users", self.build_users)
+        self.views.register("incomes", self.build_incomes)
+        self.views.register("expenses", self.build_expenses)
+        self.views.register("search", self.build_search_results)
+
         # Load default view
         self.show_dashboard()
 
@@ -79,174 +113,270 @@ class AdminDashboard:
 
     def show_dashboard(self):
         """Display the admin dashboard with analytics."""
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
-
-        # Fetch data
-        total_incomes = get_total_income()
-        total_expenses = get_total_expenses()
-        all_users = get_all_users()
+        self._show("dashboard")
 
+    def _show(self, name):
+        """
+        Show a view, rebuilding it if any data changed since it was read (a write by a user
+        session or another process), or if its read never finished.
+        """
+        version = data_version()  # None when it cannot be read, and then every show reads afresh
+        if version is None or self.read_at.get(name) != version:
+            self.views.rebuild(name)
+            self.read_at[name] = version  # Taken before the read, so a write during it shows next time
+        self.views.show(name)
+
+    def build_dashboard(self, view):
+        """Build the dashboard view with the totals of all users."""
         # Dashboard Title
         ctk.CTkLabel(
-            self.main_content,
+            view,
             text="📊 Admin Dashboard Overview",
             font=("Arial", 20, "bold"),
             text_color="white"
         ).pack(pady=(20, 10))
 
         # Analytics Section
-        analytics_frame = ctk.CTkFrame(self.main_content, corner_radius=8, fg_color="#3B3B3B")
+        analytics_frame = ctk.CTkFrame(view, corner_radius=8, fg_color="#3B3B3B")
         analytics_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
-        ctk.CTkLabel(
+        self.label_total_incomes = ctk.CTkLabel(
             analytics_frame,
-            text=f"💰 Total Incomes: ${total_incomes:.2f}",
+            text="💰 Total Incomes: ...",
             font=("Arial", 16),
             text_color="white"
-        ).pack(pady=10, padx=10)
+        )
+        self.label_total_incomes.pack(pady=10, padx=10)
 
-        ctk.CTkLabel(
+        self.label_total_expenses = ctk.CTkLabel(
             analytics_frame,
-            text=f"💸 Total Expenses: ${total_expenses:.2f}",
+            text="💸 Total Expenses: ...",
             font=("Arial", 16),
             text_color="white"
-        ).pack(pady=10, padx=10)
+        )
+        self.label_total_expenses.pack(pady=10, padx=10)
 
-        ctk.CTkLabel(
+        self.label_total_users = ctk.CTkLabel(
             analytics_frame,
-            text=f"👥 Total Users: {len(all_users)}",
+            text="👥 Total Users: ...",
             font=("Arial", 16),
             text_color="white"
-        ).pack(pady=10, padx=10)
+        )
+        self.label_total_users.pack(pady=10, padx=10)
+
+        self._load_summary()
+
+    def _load_summary(self):
+        """Read all totals in one round trip on a worker thread, then show them on the cards."""
+        self.tasks.submit(get_admin_summary, channel="summary", on_done=self._show_summary)
+
+    def _show_summary(self, summary):
+        """Show the totals read by _load_summary."""
+        self.label_total_incomes.configure(text=f"💰 Total Incomes: ${summary['total_incomes']:.2f}")
+        self.label_total_expenses.configure(text=f"💸 Total Expenses: ${summary['total_expenses']:.2f}")
+        self.label_total_users.configure(text=f"👥 Total Users: {summary['total_users']}")
 
     def show_users(self):
         """Display all users."""
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
+        self._show("users")
 
-        users = get_all_users()
-        if not users:
-            ctk.CTkLabel(
-                self.main_content,
-                text="❌ No users found.",
-                font=("Arial", 16),
-                text_color="white"
-            ).pack(pady=50)
-            return
-
-        treeview_frame = ctk.CTkFrame(self.main_content, corner_radius=8, fg_color="#3B3B3B")
+    def build_users(self, view):
+        """Build the users view."""
+        treeview_frame = ctk.CTkFrame(view, corner_radius=8, fg_color="#3B3B3B")
         treeview_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
         columns = ("ID", "Username", "Email", "Registered On")
-        self.tree = ctk.CTkTreeview(
+        tree = ctk.CTkTreeview(
             treeview_frame,
             columns=columns,
             show="headings",
             height=20
         )
         for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=150, anchor="center")
-
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
-
-        # Populate the treeview
-        for user in users:
-            self.tree.insert("", "end", values=(
-                user["id"],
-                user["username"],
-                user["email"],
-                user["registered_on"]
-            ))
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor="center")
+
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Populate the treeview in the background
+        self._load_listing("users", iter_all_users, view, treeview_frame, tree, lambda user: (
+            user["id"],
+            user["username"],
+            user["email"],
+            user["registered_on"]
+        ), "❌ No users found.")
 
     def show_incomes(self):
         """Display all incomes."""
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
+        self._show("incomes")
 
-        incomes = get_all_incomes()
-        if not incomes:
-            ctk.CTkLabel(
-                self.main_content,
-                text="❌ No incomes found.",
-                font=("Arial", 16),
-                text_color="white"
-            ).pack(pady=50)
-            return
-
-        treeview_frame = ctk.CTkFrame(self.main_content, corner_radius=8, fg_color="#3B3B3B")
+    def build_incomes(self, view):
+        """Build the incomes view."""
+        treeview_frame = ctk.CTkFrame(view, corner_radius=8, fg_color="#3B3B3B")
         treeview_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
         columns = ("ID", "User ID", "Category", "Amount", "Date")
-        self.tree = ctk.CTkTreeview(
+        tree = ctk.CTkTreeview(
             treeview_frame,
             columns=columns,
             show="headings",
             height=20
         )
         for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=150, anchor="center")
-
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
-
-        # Populate the treeview
-        for income in incomes:
-            self.tree.insert("", "end", values=(
-                income["id"],
-                income["user_id"],
-                income["category_name"],
-                income["amount"],
-                income["date"]
-            ))
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor="center")
+
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Populate the treeview in the background
+        self._load_listing("incomes", iter_all_incomes, view, treeview_frame, tree, lambda income: (
+            income["id"],
+            income["user_id"],
+            income["category_name"],
+            income["amount"],
+            income["date"]
+        ), "❌ No incomes found.")
 
     def show_expenses(self):
         """Display all expenses."""
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
+        self._show("expenses")
+
+    def build_expenses(self, view):
+        """Build the expenses view."""
+        treeview_frame = ctk.CTkFrame(view, corner_radius=8, fg_color="#3B3B3B")
+        treeview_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+        columns = ("ID", "User ID", "Category", "Amount", "Date")
+        tree = ctk.CTkTreeview(
+            treeview_frame,
+            columns=columns,
+            show="headings",
+            height=20
+        )
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor="center")
+
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Populate the treeview in the background
+        self._load_listing("expenses", iter_all_expenses, view, treeview_frame, tree, lambda expense: (
+            expense["id"],
+            expense["user_id"],
+            expense["category_name"],
+            expense["amount"],
+            expense["date"]
+        ), "❌ No expenses found.")
 
-        expenses = get_all_expenses()
-        if not expenses:
+    def _load_listing(self, name, read_rows, view, treeview_frame, tree, row_values, empty_text):
+        """
+        Stream a listing's rows from a worker thread, inserting each fetched batch into its
+        tree from its own main-loop callback, so the first rows show at once and the full
+        listing is never held in memory. Opening another listing before the rows are all in
+        cancels the read.
+
+        Args:
+            name (str): The view's name.
+            read_rows (callable): Returns an iterable of the rows (runs on the worker thread).
+            view, treeview_frame, tree: The view's widgets.
+            row_values (callable): Returns a row's values for the tree.
+            empty_text (str): Shown instead of the tree when there are no rows.
+        """
+        count = 0
+
+        def fill(rows):
+            nonlocal count
+            count += len(rows)
+            for row in rows:
+                tree.insert("", "end", values=row_values(row))
+
+        def finish():
+            self.loading = None
+            if not count:
+                treeview_frame.destroy()
+                ctk.CTkLabel(
+                    view,
+                    text=empty_text,
+                    font=("Arial", 16),
+                    text_color="white"
+                ).pack(pady=50)
+
+        # Only one listing is read at a time; one still streaming is superseded and rebuilt when next shown
+        if self.loading is not None and self.loading != name:
+            self.read_at.pop(self.loading, None)
+        self.loading = name
+        self.tasks.stream(read_rows, channel="listing", on_batch=fill, on_done=finish)
+
+    def show_search_results(self):
+        """Display every user's expenses and incomes matching the sidebar search box."""
+        # Searching runs in the background; a newer search cancels one still running
+        self.tasks.submit(
+            search_transactions,
+            None,
+            self.entry_search.get().strip(),
+            channel="search",
+            on_done=self._show_search_results
+        )
+
+    def _show_search_results(self, results):
+        """Show the results of a finished search."""
+        self.search_results = results
+        # Every search has its own results, so this view is built afresh each time
+        self.views.rebuild("search")
+        self.views.show("search")
+
+    def build_search_results(self, view):
+        """Build the search results view from the latest finished search."""
+        results = self.search_results
+        if not results:
             ctk.CTkLabel(
-                self.main_content,
-                text="❌ No expenses found.",
+                view,
+                text="❌ No matching transactions found.",
                 font=("Arial", 16),
                 text_color="white"
             ).pack(pady=50)
             return
 
-        treeview_frame = ctk.CTkFrame(self.main_content, corner_radius=8, fg_color="#3B3B3B")
+        treeview_frame = ctk.CTkFrame(view, corner_radius=8, fg_color="#3B3B3B")
         treeview_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
-        columns = ("ID", "User ID", "Category", "Amount", "Date")
-        self.tree = ctk.CTkTreeview(
+        columns = ("Type", "ID", "User ID", "Title / Source", "Amount", "Date")
+        tree = ctk.CTkTreeview(
             treeview_frame,
             columns=columns,
             show="headings",
             height=20
         )
         for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=150, anchor="center")
-
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
-
-        # Populate the treeview
-        for expense in expenses:
-            self.tree.insert("", "end", values=(
-                expense["id"],
-                expense["user_id"],
-                expense["category_name"],
-                expense["amount"],
-                expense["date"]
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor="center")
+
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Populate the treeview, best match first
+        for result in results:
+            tree.insert("", "end", values=(
+                result["kind"].capitalize(),
+                result["id"],
+                result["user_id"],
+                result["label"],
+                format_money(result["amount_minor"], result["currency"]),
+                result["date"]
             ))
 
+    def _set_busy(self, busy):
+        """Show the loading state while background tasks run."""
+        self.label_status.configure(text="⏳ Loading..." if busy else "")
+        self.window.configure(cursor="watch" if busy else "")
+
     def logout(self):
-        """Log out the admin and return to the authentication window."""
-        self.root.destroy()
-        from main import open_auth_window
-        open_auth_window()
+        """Log out the admin and return to the authentication screen."""
+        self.tasks.shutdown()
+        self.window.configure(cursor="")
+        if self.on_logout is not None:
+            self.on_logout()
+        else:
+            self.window.destroy()
 
 
 # Example usage (for testing purposes)
@@ -1,5 +1,6 @@
 import customtkinter as ctk
 from tkinter import messagebox
+from gui.task_runner import TaskRunner
 from services.auth_service import register_user, login_user, reset_password
 
 
@@ -7,8 +8,13 @@ class AuthWindow:
     def __init__(self, root, on_login_success):
         """
         Initializes the authentication window with a professional and unique design.
+
+        Args:
+            root: The frame the authentication screen fills (the window itself when run standalone).
+            on_login_success (callable): Called with the user's details after a successful login.
         """
         self.root = root
+        self.window = root.winfo_toplevel()
         self.on_login_success = on_login_success
 
         # Configure appearance mode (Dark by default)
@@ -16,15 +22,18 @@ class AuthWindow:
         ctk.set_default_color_theme("blue")
 
         # Set up the main window properties
-        self.root.title("Income & Expense Tracker - Authentication")
-        self.root.geometry("400x500")  # Compact size
-        self.root.resizable(True, True)
+        self.window.title("Income & Expense Tracker - Authentication")
+        self.window.geometry("400x500")  # Compact size
+        self.window.resizable(True, True)
 
         # Create frames for login, registration, and password reset
         self.login_frame = ctk.CTkFrame(self.root, corner_radius=8, fg_color="#2B2B2B")
         self.register_frame = ctk.CTkFrame(self.root, corner_radius=8, fg_color="#2B2B2B")
         self.reset_password_frame = ctk.CTkFrame(self.root, corner_radius=8, fg_color="#2B2B2B")
 
+        # Password hashing and the database run on a worker thread, so the window keeps redrawing
+        self.tasks = TaskRunner(self.root, max_workers=1, on_busy=self._set_busy)
+
         # Initialize the frames
         self.setup_login_frame()
         self.setup_register_frame()
@@ -94,7 +103,7 @@ class AuthWindow:
         self.entry_password.pack(pady=5)
 
         # Login button
-        login_button = ctk.CTkButton(
+        self.login_button = ctk.CTkButton(
             self.login_frame,
             text="Login 🚪",
             font=("Arial", 16, "bold"),
@@ -104,7 +113,7 @@ class AuthWindow:
             corner_radius=8,
             width=200
         )
-        login_button.pack(pady=20)
+        self.login_button.pack(pady=20)
 
         # Forgot Password link
         forgot_password_link = ctk.CTkButton(
@@ -208,7 +217,7 @@ class AuthWindow:
         self.register_entry_password.pack(pady=5)
 
         # Register button
-        register_button = ctk.CTkButton(
+        self.register_button = ctk.CTkButton(
             self.register_frame,
             text="Register ✅",
             font=("Arial", 16, "bold"),
@@ -218,7 +227,7 @@ class AuthWindow:
             corner_radius=8,
             width=200
         )
-        register_button.pack(pady=20)
+        self.register_button.pack(pady=20)
 
         # Switch to Login link
         login_link = ctk.CTkButton(
@@ -309,7 +318,7 @@ class AuthWindow:
         self.reset_entry_new_password.pack(pady=5)
 
         # Reset Password button
-        reset_password_button = ctk.CTkButton(
+        self.reset_password_button = ctk.CTkButton(
             self.reset_password_frame,
             text="Reset Password ✅",
             font=("Arial", 16, "bold"),
@@ -319,7 +328,7 @@ class AuthWindow:
             corner_radius=8,
             width=200
         )
-        reset_password_button.pack(pady=20)
+        self.reset_password_button.pack(pady=20)
 
         # Back to Login link
         back_to_login_link = ctk.CTkButton(
@@ -367,6 +376,15 @@ class AuthWindow:
         self.register_frame.pack_forget()
         self.reset_password_frame.pack(fill="both", expand=True)
 
+    def _set_busy(self, busy):
+        """
+        Disable the submit buttons while a login, registration or reset runs in the background.
+        """
+        state = "disabled" if busy else "normal"
+        for button in (self.login_button, self.register_button, self.reset_password_button):
+            button.configure(state=state)
+        self.window.configure(cursor="watch" if busy else "")
+
     def login(self):
         """
         Handles the login process by validating user credentials.
@@ -378,9 +396,13 @@ class AuthWindow:
             messagebox.showwarning("Input Error", "❌ Please enter both username and password.")
             return
 
-        user = login_user(username, password)
+        self.tasks.submit(login_user, username, password, channel="auth", on_done=self._on_login)
+
+    def _on_login(self, user):
+        """Open the dashboard after a successful login, or report the failure."""
         if user:
-            self.root.destroy()
+            self.tasks.shutdown()
+            self.window.configure(cursor="")
             self.on_login_success(user)
         else:
             messagebox.showerror("Login Failed", "❌ Invalid username or password.")
@@ -405,7 +427,10 @@ class AuthWindow:
             messagebox.showwarning("Invalid Email", "❌ Please enter a valid email address.")
             return
 
-        success = register_user(username, email, password)
+        self.tasks.submit(register_user, username, email, password, channel="auth", on_done=self._on_register)
+
+    def _on_register(self, success):
+        """Return to the login frame after registering, or report the failure."""
         if success:
             messagebox.showinfo("Success", "✅ User registered successfully! Please log in.")
             self.show_login_frame()
@@ -432,7 +457,10 @@ class AuthWindow:
             messagebox.showwarning("Invalid Email", "❌ Please enter a valid email address.")
             return
 
-        success = reset_password(username, email, new_password)
+        self.tasks.submit(reset_password, username, email, new_password, channel="auth", on_done=self._on_reset_password)
+
+    def _on_reset_password(self, success):
+        """Return to the login frame after resetting the password, or report the failure."""
         if success:
             messagebox.showinfo("Success", "✅ Password reset successfully! Please log in.")
             self.show_login_frame()
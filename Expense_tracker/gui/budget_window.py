@@ -1,6 +1,8 @@
 import customtkinter as ctk
 from tkinter import messagebox
 from services.budget_service import add_budget, get_budgets, update_budget, delete_budget
+from services.session_service import category_choices
+from utils.events import subscribe_widget, CATEGORIES_CHANGED
 
 
 class BudgetWindow:
@@ -37,7 +39,7 @@ class BudgetWindow:
         )
         self.combo_category = ctk.CTkOptionMenu(
             form_frame,
-            values=["Food", "Transport", "Entertainment", "Other"],
+            values=category_choices(),  # From the session's category cache, no query
             font=("Arial", 14),
             corner_radius=8,
             dropdown_fg_color="#3B3B3B",
@@ -45,6 +47,8 @@ class BudgetWindow:
             button_hover_color="#333333"
         )
         self.combo_category.grid(row=1, column=1, padx=10, pady=5, sticky="w")
+        subscribe_widget(self.root, CATEGORIES_CHANGED,
+                         lambda: self.combo_category.configure(values=category_choices()))
 
         # Amount Input
         ctk.CTkLabel(form_frame, text="Amount:", font=("Arial", 14), text_color="white").grid(
@@ -1,6 +1,7 @@
 import customtkinter as ctk
 from tkinter import ttk, messagebox
 from services.category_service import add_category, get_categories
+from utils.events import subscribe_widget, CATEGORIES_CHANGED
 
 class CategoryWindow:
     def __init__(self):
@@ -30,8 +31,9 @@ class CategoryWindow:
         self.tree.heading("Icon", text="Icon")
         self.tree.grid(row=3, column=0, columnspan=2, padx=10, pady=10)
 
-        # Load existing categories
+        # Load existing categories, and reload them whenever they change
         self.load_categories()
+        subscribe_widget(self.root, CATEGORIES_CHANGED, self.load_categories)
 
     def add_category(self):
         """Add a new category to the database and refresh the list."""
@@ -47,15 +49,14 @@ class CategoryWindow:
             # Add the category to the database
             if add_category(name, icon):
                 messagebox.showinfo("Success", "Category added successfully!")
-                self.clear_form()  # Clear the form after successful addition
-                self.load_categories()  # Refresh the category list
+                self.clear_form()  # Clear the form; the list reloads itself on CATEGORIES_CHANGED
             else:
                 messagebox.showerror("Error", "Failed to add category.")
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
     def load_categories(self):
-        """Load and display all categories."""
+        """Load and display all categories (from the category cache)."""
         for row in self.tree.get_children():
             self.tree.delete(row)  # Clear the existing rows
 
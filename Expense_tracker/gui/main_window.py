@@ -1,8 +1,14 @@
+import bisect
 import tkinter as tk
+from datetime import date
 from tkinter import ttk, messagebox
-from services.expense_service import add_expense, get_expenses
+from services.expense_service import add_expense, get_expenses_page, iter_expenses
+from services.rollup_service import get_category_totals, UNCATEGORIZED
+from services.session_service import category_choices
+from utils.events import subscribe_widget, CATEGORIES_CHANGED
 from gui.widgets import ExpenseChart
 from utils.exporters import export_to_csv
+from utils.money import from_minor
 
 class MainWindow:
     def __init__(self, root, user_id):
@@ -24,8 +30,21 @@ class MainWindow:
         self.combo_currency = ttk.Combobox(root, values=["USD", "NLe", "EUR", "GBP"])
         self.combo_currency.grid(row=2, column=1, padx=10, pady=5)
 
+        # Existing categories to pick from; a new name typed here is created with the expense
+        tk.Label(root, text="Category:").grid(row=3, column=0, padx=10, pady=5, sticky="w")
+        self.combo_category = ttk.Combobox(root, values=category_choices())
+        self.combo_category.grid(row=3, column=1, padx=10, pady=5)
+        combo_category = self.combo_category
+        subscribe_widget(combo_category, CATEGORIES_CHANGED,
+                         lambda: combo_category.configure(values=category_choices()))
+
+        tk.Label(root, text="Date (YYYY-MM-DD):").grid(row=4, column=0, padx=10, pady=5, sticky="w")
+        self.entry_date = tk.Entry(root)
+        self.entry_date.insert(0, date.today().isoformat())
+        self.entry_date.grid(row=4, column=1, padx=10, pady=5)
+
         tk.Button(root, text="Add Expense", command=self.add_expense).grid(
-            row=3, column=0, columnspan=2, pady=10
+            row=5, column=0, columnspan=2, pady=10
         )
 
         # Expense List
@@ -35,15 +54,15 @@ class MainWindow:
         self.tree.heading("Title", text="Title")
         self.tree.heading("Amount", text="Amount")
         self.tree.heading("Currency", text="Currency")
-        self.tree.grid(row=4, column=0, columnspan=2, padx=10, pady=10)
+        self.tree.grid(row=6, column=0, columnspan=2, padx=10, pady=10)
 
         # Chart
-        self.chart = ExpenseChart(root, get_expenses(self.user_id))
-        self.chart.grid(row=5, column=0, columnspan=2, padx=10, pady=10)
+        self.chart = ExpenseChart(root, get_category_totals(self.user_id))
+        self.chart.grid(row=7, column=0, columnspan=2, padx=10, pady=10)
 
         # Export Button
         tk.Button(root, text="Export to CSV", command=self.export_expenses).grid(
-            row=6, column=0, columnspan=2, pady=10
+            row=8, column=0, columnspan=2, pady=10
         )
 
         # Load existing expenses
@@ -54,6 +73,8 @@ class MainWindow:
         title = self.entry_title.get().strip()
         amount = self.entry_amount.get().strip()
         currency = self.combo_currency.get().strip()
+        category = self.combo_category.get().strip()
+        expense_date = self.entry_date.get().strip()
 
         # Validate inputs
         if not title:
@@ -65,41 +86,66 @@ class MainWindow:
         if not currency:
             messagebox.showwarning("Input Error", "Please select a currency.")
             return
+        if not category:
+            messagebox.showwarning("Input Error", "Please select a category.")
+            return
+        if not expense_date:
+            messagebox.showwarning("Input Error", "Please enter a date.")
+            return
 
         try:
             # Convert amount to float
             amount = float(amount)
 
             # Add the expense to the database
-            if add_expense(self.user_id, title, amount, currency):
+            added = add_expense(self.user_id, title, amount, currency, category, expense_date)
+            if added:
                 messagebox.showinfo("Success", "Expense added successfully!")
                 self.clear_form()  # Clear the form after successful addition
-                self.load_expenses()  # Refresh the expense list and chart
+                self.insert_expense(added)  # Show it in the list and chart
             else:
                 messagebox.showerror("Error", "Failed to add expense.")
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
     def load_expenses(self):
-        """Load and display all expenses for the current user."""
-        for row in self.tree.get_children():
-            self.tree.delete(row)  # Clear the existing rows
+        """Load and display all expenses for the current user; later additions use insert_expense."""
+        self.tree.delete(*self.tree.get_children())  # Clear the existing rows
+        self.row_keys = []  # (date, id) of every row, in list order
 
-        expenses = get_expenses(self.user_id)
-        for expense in expenses:
+        for expense in iter_expenses(self.user_id):
             self.tree.insert("", "end", values=(expense["title"], expense["amount"], expense["currency"]))
+            self.row_keys.append((expense["date"], expense["id"]))
 
         # Update the chart with the latest data
-        self.chart.update_chart(expenses)
+        category_totals = get_category_totals(self.user_id)
+        self.category_totals = {row["category"]: row["total_minor"] for row in category_totals}
+        self.chart.update_chart(category_totals)
+
+    def insert_expense(self, expense):
+        """
+        Show one added expense: a single row inserted at its place in the list, and its
+        amount added to the chart's category total, whatever the number of expenses.
+        """
+        key = (expense["date"], expense["id"])
+        index = bisect.bisect(self.row_keys, key)
+        self.row_keys.insert(index, key)
+        self.tree.insert("", index, values=(expense["title"], expense["amount"], expense["currency"]))
+
+        category = expense["category"] or UNCATEGORIZED
+        self.category_totals[category] = self.category_totals.get(category, 0) + expense["amount_minor"]
+        self.chart.update_chart([
+            {"category": category, "total": from_minor(total)}
+            for category, total in sorted(self.category_totals.items())
+        ])
 
     def export_expenses(self):
         """Export expenses to a CSV file."""
-        expenses = get_expenses(self.user_id)
-        if not expenses:
+        if not get_expenses_page(self.user_id, page_size=1)[0]:
             messagebox.showinfo("Info", "No expenses to export.")
             return
 
-        if export_to_csv(expenses, "expenses.csv"):
+        if export_to_csv(iter_expenses(self.user_id), "expenses.csv"):
             messagebox.showinfo("Success", "Expenses exported to expenses.csv")
         else:
             messagebox.showerror("Error", "Failed to export expenses.")
@@ -108,4 +154,7 @@ class MainWindow:
         """Clear the input fields in the expense form."""
         self.entry_title.delete(0, tk.END)
         self.entry_amount.delete(0, tk.END)
-        self.combo_currency.set("")
\ No newline at end of file
+        self.combo_currency.set("")
+        self.combo_category.set("")
+        self.entry_date.delete(0, tk.END)
+        self.entry_date.insert(0, date.today().isoformat())
\ No newline at end of file
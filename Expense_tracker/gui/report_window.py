@@ -1,7 +1,10 @@
 import customtkinter as ctk
 from tkinter import ttk, messagebox
-from services.report_service import get_monthly_report
+from services.report_service import iter_range_report
+from services.rollup_service import get_monthly_totals, get_category_totals
 from gui.widgets import ExpenseChart
+from utils.helpers import month_range
+from utils.money import format_money
 
 class ReportWindow:
     def __init__(self, user_id):
@@ -48,29 +51,29 @@ class ReportWindow:
             if year < 1000 or year > 9999:
                 raise ValueError("Invalid year. Please enter a valid 4-digit year.")
 
-            expenses, incomes = get_monthly_report(self.user_id, month, year)
-
             # Clear the treeview
             for row in self.tree.get_children():
                 self.tree.delete(row)
 
-            # Add expenses and incomes to the treeview
-            for expense in expenses:
-                self.tree.insert("", "end", values=("Expense", expense["amount"], expense["date"]))
-            for income in incomes:
-                self.tree.insert("", "end", values=("Income", income["amount"], income["date"]))
+            # Stream the month's expenses and incomes straight into the treeview
+            for kind, row in iter_range_report(self.user_id, *month_range(year, month)):
+                self.tree.insert("", "end", values=(kind.capitalize(), row["amount"], row["date"]))
 
-            # Update the chart
-            self.chart.update_chart(expenses + incomes)
+            # Update the chart from the monthly rollup
+            month_key = f"{year:04d}-{month:02d}"
+            next_key = f"{year + 1:04d}-01" if month == 12 else f"{year:04d}-{month + 1:02d}"
+            self.chart.update_chart(get_category_totals(self.user_id, "expense", month_key, next_key))
 
             # Show summary message
-            total_expenses = sum(float(expense["amount"]) for expense in expenses)
-            total_incomes = sum(float(income["amount"]) for income in incomes)
+            totals = {row["kind"]: row["total_minor"] for row in get_monthly_totals(self.user_id, year)
+                      if row["period"] == month_key}
+            total_expenses = totals.get("expense", 0)
+            total_incomes = totals.get("income", 0)
             net_balance = total_incomes - total_expenses
             messagebox.showinfo(
                 "Report Summary",
-                f"Month: {month}\nYear: {year}\n\nTotal Expenses: {total_expenses:.2f}\n"
-                f"Total Incomes: {total_incomes:.2f}\nNet Balance: {net_balance:.2f}",
+                f"Month: {month}\nYear: {year}\n\nTotal Expenses: {format_money(total_expenses)}\n"
+                f"Total Incomes: {format_money(total_incomes)}\nNet Balance: {format_money(net_balance)}",
             )
         except ValueError as ve:
             messagebox.showwarning("Input Error", str(ve))
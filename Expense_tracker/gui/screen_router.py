@@ -0,0 +1,53 @@
+import logging
+import time
+import customtkinter as ctk
+
+
+class ScreenRouter:
+    """
+    Swaps the application's screens (splash, authentication, user and admin dashboards)
+    inside one window.
+
+    The application keeps a single CTk root for its whole run: showing a screen builds it
+    into a fresh frame of that root and destroys the frame of the screen before it. The Tk
+    interpreter, theme, fonts, imported modules and service caches are therefore set up
+    once, instead of again at every login and logout as they were when each screen
+    created its own root.
+    """
+
+    def __init__(self, root):
+        """
+        Args:
+            root (ctk.CTk): The application window.
+        """
+        self.root = root
+        self.current = None  # Name of the screen shown
+        self.screen = None  # The screen object its build function returned
+        self.last_switch = None  # Seconds the last show() took, up to the new screen being laid out
+        self._frame = None
+
+    def show(self, name, build):
+        """
+        Replace the current screen.
+
+        Args:
+            name (str): Name of the screen, for logging.
+            build (callable): Called with the new screen's frame; creates the screen's widgets
+                in it and returns the screen object. The screen sets the window's title and
+                size through frame.winfo_toplevel().
+
+        Returns:
+            The screen object build returned.
+        """
+        start = time.perf_counter()
+        frame = ctk.CTkFrame(self.root, corner_radius=0, fg_color="transparent")
+        old_frame, self._frame = self._frame, frame
+        self.screen = build(frame)
+        if old_frame is not None:
+            old_frame.destroy()
+        frame.pack(fill="both", expand=True)
+        self.root.update_idletasks()
+        self.current = name
+        self.last_switch = time.perf_counter() - start
+        logging.info(f"Switched to the {name} screen in {self.last_switch * 1e3:.1f} ms.")
+        return self.screen
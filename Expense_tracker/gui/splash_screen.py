@@ -1,16 +1,32 @@
 import customtkinter as ctk
 from tkinter import messagebox
-import time
+from gui.task_runner import TaskRunner
+from services.startup_service import STARTUP_STEPS, run_startup_step
+
+# Milliseconds between frames of the fade animations
+FADE_FRAME_MS = 30
 
 class SplashScreen(ctk.CTkFrame):
+    """
+    Start-up screen. While it fades in, the startup steps (database migrations,
+    reference data and the dashboards' heavy imports) run one after another on a
+    worker thread, except the imports that load tkinter, which run on the main thread
+    from their own after() callbacks; the progress bar follows the steps as they finish
+    and the button is enabled once they are all done. Every animation frame is an after()
+    callback, so the window keeps redrawing throughout.
+
+    The screen is placed in its parent by its creator (it is packed into the router's frame).
+    """
+
     def __init__(self, parent, switch_to_auth):
         super().__init__(parent)
         self.parent = parent
         self.switch_to_auth = switch_to_auth
+        self.tasks = TaskRunner(self, max_workers=1)
+        self.ready = False
 
         # Configure frame to be responsive
         self.configure(fg_color=("white", "#1a1a1a"))
-        self.grid(row=0, column=0, sticky="nsew")
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
 
@@ -50,7 +66,8 @@ class SplashScreen(ctk.CTkFrame):
         # Get Started button with smooth transition
         self.get_started_btn = ctk.CTkButton(
             self.container,
-            text="GET STARTED →",
+            text="LOADING...",
+            state="disabled",
             command=self.smooth_transition,
             font=ctk.CTkFont(size=14, weight="bold"),
             fg_color="#2FA572",
@@ -60,7 +77,19 @@ class SplashScreen(ctk.CTkFrame):
             border_color=("white", "#1a1a1a"),
             text_color="white"
         )
-        self.get_started_btn.grid(row=3, column=0, pady=(20, 40), padx=20)
+        self.get_started_btn.grid(row=3, column=0, pady=(20, 10), padx=20)
+
+        # Start-up progress
+        self.progress_bar = ctk.CTkProgressBar(self.container, width=300, progress_color="#2FA572")
+        self.progress_bar.set(0)
+        self.progress_bar.grid(row=4, column=0, pady=(10, 5))
+        self.progress_label = ctk.CTkLabel(
+            self.container,
+            text=STARTUP_STEPS[0][0],
+            font=ctk.CTkFont(size=12),
+            text_color=("gray40", "gray60")
+        )
+        self.progress_label.grid(row=5, column=0, pady=(0, 20))
 
         # Version info
         self.version_label = ctk.CTkLabel(
@@ -69,25 +98,57 @@ class SplashScreen(ctk.CTkFrame):
             font=ctk.CTkFont(size=10),
             text_color=("gray50", "gray70")
         )
-        self.version_label.grid(row=4, column=0, pady=10)
+        self.version_label.grid(row=6, column=0, pady=10)
 
-        # Start fade-in animation
+        # Start fade-in animation and warm-up together
         self.fade_in()
+        self.run_step(0)
+
+    def fade_in(self, step=0):
+        """Smooth fade-in animation, one after() callback per frame."""
+        self.winfo_toplevel().attributes('-alpha', step / 10)
+        if step < 10:
+            self.after(FADE_FRAME_MS, self.fade_in, step + 1)
+
+    def run_step(self, index):
+        """Run startup step index on the worker thread (or the main thread), then move on to the next one."""
+        if STARTUP_STEPS[index][2]:
+            self.tasks.submit(run_startup_step, index, on_done=lambda _: self.step_done(index))
+        else:
+            self.after(1, self.run_main_thread_step, index)
+
+    def run_main_thread_step(self, index):
+        """Run a startup step that imports tkinter modules, from an after() callback."""
+        run_startup_step(index)
+        self.step_done(index)
+
+    def step_done(self, index):
+        """Show the progress of the finished step and start the next, or enable the button."""
+        done = index + 1
+        self.progress_bar.set(done / len(STARTUP_STEPS))
+        if done < len(STARTUP_STEPS):
+            self.progress_label.configure(text=STARTUP_STEPS[done][0])
+            self.run_step(done)
+        else:
+            self.ready = True
+            self.progress_label.configure(text="Ready")
+            self.get_started_btn.configure(text="GET STARTED →", state="normal")
 
-    def fade_in(self):
-        """Smooth fade-in animation."""
-        for i in range(0, 11):
-            self.update_idletasks()
-            self.parent.attributes('-alpha', i / 10)
-            time.sleep(0.05)
-
-    def smooth_transition(self):
-        """Smooth fade-out transition and switch to authentication."""
-        for i in range(10, -1, -1):
-            self.update_idletasks()
-            self.parent.attributes('-alpha', i / 10)
-            time.sleep(0.05)
-        self.switch_to_auth()
+    def smooth_transition(self, step=10):
+        """Smooth fade-out transition, one after() callback per frame, then switch to authentication."""
+        if step == 10:
+            if not self.ready:
+                return
+            self.ready = False  # Further clicks during the fade are ignored
+        window = self.winfo_toplevel()
+        window.attributes('-alpha', step / 10)
+        if step > 0:
+            self.after(FADE_FRAME_MS, self.smooth_transition, step - 1)
+        else:
+            self.tasks.shutdown()
+            # The next screen replaces this one in the same window, which is then shown again
+            self.switch_to_auth()
+            window.attributes('-alpha', 1.0)
 
 if __name__ == "__main__":
     root = ctk.CTk()
@@ -0,0 +1,255 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Milliseconds between checks for finished tasks, while any are running
+POLL_INTERVAL_MS = 15
+
+# Longest one poll spends handing results to their callbacks before yielding to the main loop, in seconds
+DELIVERY_BUDGET = 0.008
+
+# Items handled per main-loop callback by deliver_in_chunks
+CHUNK_SIZE = 500
+
+# Batches a stream() worker may have waiting for the Tk thread before it pauses reading
+STREAM_AHEAD = 4
+
+
+class Task:
+    """Handle of a call submitted to a TaskRunner."""
+    __slots__ = ("channel", "cancelled", "future")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.cancelled = False
+        self.future = None
+
+    def cancel(self):
+        """Drop the call's result: its callbacks will not run, and if it has not started it never will."""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class TaskRunner:
+    """
+    Runs slow calls (logins, searches, listings, exports) on a thread pool and hands their
+    results back to the Tk thread, so button callbacks return at once and the window keeps
+    redrawing while the work is done.
+
+    Finished calls, and the batches of streamed ones, are put on a queue that the Tk thread drains from an after() callback,
+    scheduled only while tasks are running. Widgets must only be touched in the on_done and
+    on_error callbacks, which run on the Tk thread. Submitting a task on a channel cancels
+    the task before it on the same channel, so superseded requests (a second search, a
+    quick click on another view) never deliver stale results.
+    """
+
+    def __init__(self, widget, max_workers=4, on_busy=None, poll_interval=POLL_INTERVAL_MS):
+        """
+        Args:
+            widget: A widget of the window; its after() schedules the polling.
+            max_workers (int): Number of worker threads.
+            on_busy (callable, optional): The loading state: called on the Tk thread with True
+                when a task starts while none are running, and False when the last one ends.
+            poll_interval (int): Milliseconds between polls while tasks are running.
+        """
+        self.widget = widget
+        self.on_busy = on_busy
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="gui-task")
+        # Put by any thread: (task, on_done, on_error, None) when a task ends, and
+        # (task, on_batch, semaphore, batch) for each batch of a streamed task
+        self._finished = queue.SimpleQueue()
+        self._channels = {}  # Channel -> its latest task
+        self._running = 0
+        self._after_id = None
+        self._closed = False
+
+    @property
+    def busy(self):
+        """Whether any submitted task has not been delivered or dropped yet."""
+        return self._running > 0
+
+    def submit(self, func, *args, on_done=None, on_error=None, channel=None, **kwargs):
+        """
+        Call func(*args, **kwargs) on a worker thread. Must be called from the Tk thread.
+
+        Args:
+            func (callable): The call to run; it must not touch any widget.
+            on_done (callable, optional): Called on the Tk thread with func's return value.
+            on_error (callable, optional): Called on the Tk thread with the exception func
+                raised; without one, the exception is logged.
+            channel (hashable, optional): Cancels the previous task submitted on this channel.
+
+        Returns:
+            Task: The task, which can be cancelled.
+        """
+        task = self._open(channel)
+        self._start(task, func, args, kwargs, on_done, on_error)
+        return task
+
+    def stream(self, func, *args, on_batch, on_done=None, on_error=None, channel=None, batch_size=CHUNK_SIZE,
+               **kwargs):
+        """
+        Iterate func(*args, **kwargs) on a worker thread and hand its items to the Tk thread a
+        batch at a time as they are read, so a long listing starts showing after its first
+        batch and is never held whole in memory. Must be called from the Tk thread.
+
+        The worker pauses while STREAM_AHEAD batches wait for the Tk thread, and closes the
+        iterator if the task is cancelled.
+
+        Args:
+            func (callable): Returns the iterable to stream, e.g. a fetchmany generator; it
+                must not touch any widget.
+            on_batch (callable): Called on the Tk thread with each list of up to batch_size items.
+            on_done (callable, optional): Called on the Tk thread, with no arguments, after the last batch.
+            on_error (callable, optional): Called on the Tk thread with the exception the
+                iteration raised; without one, the exception is logged.
+            channel (hashable, optional): Cancels the previous task submitted on this channel.
+            batch_size (int): Items per batch.
+
+        Returns:
+            Task: The task, which can be cancelled.
+        """
+        task = self._open(channel)
+        ahead = threading.Semaphore(STREAM_AHEAD)
+
+        def hand_over(batch):
+            # Wait for the Tk thread to catch up; give up if the task or runner goes away
+            while not ahead.acquire(timeout=0.1):
+                if task.cancelled or self._closed:
+                    return False
+            self._finished.put((task, on_batch, ahead, batch))
+            return not task.cancelled
+
+        def produce():
+            items = iter(func(*args, **kwargs))
+            try:
+                batch = []
+                for item in items:
+                    batch.append(item)
+                    if len(batch) == batch_size:
+                        if not hand_over(batch):
+                            return
+                        batch = []
+                if batch:
+                    hand_over(batch)
+            finally:
+                close = getattr(items, "close", None)
+                if close is not None:
+                    close()  # Returns a pooled connection at once when the stream stops early
+
+        self._start(task, produce, (), {}, on_done and (lambda _: on_done()), on_error)
+        return task
+
+    def _open(self, channel):
+        """Create a task on channel, cancelling the one before it, and enter the loading state."""
+        task = Task(channel)
+        if channel is not None:
+            previous = self._channels.get(channel)
+            if previous is not None:
+                previous.cancel()
+            self._channels[channel] = task
+        self._running += 1
+        if self._running == 1 and self.on_busy is not None:
+            self.on_busy(True)
+        return task
+
+    def _start(self, task, func, args, kwargs, on_done, on_error):
+        task.future = self._executor.submit(func, *args, **kwargs)
+        # Runs on completion or cancellation, in whichever thread that happens
+        task.future.add_done_callback(lambda _: self._finished.put((task, on_done, on_error, None)))
+        self._schedule()
+
+    def cancel(self, channel):
+        """Cancel the latest task submitted on channel, if it has not been delivered yet."""
+        task = self._channels.pop(channel, None)
+        if task is not None:
+            task.cancel()
+
+    def shutdown(self):
+        """Cancel every task and stop the workers, e.g. before the window is destroyed."""
+        for task in self._channels.values():
+            task.cancel()
+        self._channels.clear()
+        self._closed = True
+        self.on_busy = None  # The widgets showing the loading state may be destroyed next
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self):
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        """Deliver finished tasks until the queue is empty or the time budget is spent."""
+        self._after_id = None
+        deadline = time.perf_counter() + DELIVERY_BUDGET
+        while self._running and time.perf_counter() < deadline:
+            try:
+                task, callback, extra, batch = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None:
+                self._deliver(task, callback, extra)
+            else:
+                self._deliver_batch(task, callback, extra, batch)
+        if self._running:
+            self._schedule()
+
+    def _deliver(self, task, on_done, on_error):
+        self._running -= 1
+        if self._channels.get(task.channel) is task:
+            del self._channels[task.channel]
+        try:
+            if task.cancelled or task.future.cancelled():
+                return
+            error = task.future.exception()
+            if error is None:
+                if on_done is not None:
+                    on_done(task.future.result())
+            elif on_error is not None:
+                on_error(error)
+            else:
+                logging.error(f"Background task failed: {error!r}")
+        except Exception as e:
+            logging.error(f"Error in background task callback: {e}")
+        finally:
+            if not self._running and self.on_busy is not None:
+                self.on_busy(False)
+
+    def _deliver_batch(self, task, on_batch, ahead, batch):
+        ahead.release()  # Let the worker read on
+        if task.cancelled:
+            return
+        try:
+            on_batch(batch)
+        except Exception as e:
+            logging.error(f"Error in background task callback: {e}")
+
+
+def deliver_in_chunks(widget, items, handle, chunk_size=CHUNK_SIZE, on_finish=None):
+    """
+    Call handle(item) for every item from successive after() callbacks, chunk_size items
+    at a time, so filling a long list never blocks the main loop for long.
+
+    Args:
+        widget: A widget of the window; its after() schedules the chunks.
+        items (list): The items to handle, in order.
+        handle (callable): Called on the Tk thread with each item.
+        chunk_size (int): Items handled per callback.
+        on_finish (callable, optional): Called once every item has been handled.
+    """
+    def run_chunk(start):
+        for item in items[start:start + chunk_size]:
+            handle(item)
+        if start + chunk_size < len(items):
+            widget.after(1, run_chunk, start + chunk_size)
+        elif on_finish is not None:
+            on_finish()
+
+    run_chunk(0)
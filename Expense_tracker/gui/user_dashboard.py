@@ -1,27 +1,45 @@
 import customtkinter as ctk
+from datetime import date, timedelta
 from tkinter import messagebox, filedialog
-from tkcalendar import DateEntry
-from services.expense_service import get_expenses, add_expense, update_expense, delete_expense
-from services.income_service import get_incomes, get_total_income, add_income, update_income, delete_income
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from openpyxl import Workbook
-from database.db import initialize_db  # Import the database initializer
+from services.expense_service import get_expenses_page, iter_expenses, add_expense, update_expense, delete_expense
+from services.income_service import get_incomes_page, iter_incomes, add_income, update_income, delete_income
+from services.totals_service import get_user_totals
+from services.rollup_service import build_text_report, UNCATEGORIZED
+from services.search_service import search_transactions
+from services.session_service import category_choices, end_session
+from utils.events import subscribe_widget, CATEGORIES_CHANGED
+from gui.task_runner import TaskRunner
+from gui.view_manager import ViewManager
+from gui.virtual_list import VirtualList
+from utils.money import format_money, from_minor
+from utils.paging import PagedSource
+
+# Days covered by the recent-spending chart on the reports page
+RECENT_DAYS = 90
 
 
 class UserDashboard:
-    def __init__(self, root, user_id, username):
+    def __init__(self, root, user_id, username, on_logout=None):
         """
         Initializes the user dashboard with a professional and responsive design.
+
+        Args:
+            root: The frame the dashboard fills (the window itself when run standalone).
+            user_id (int): The signed-in user's ID.
+            username (str): The signed-in user's name.
+            on_logout (callable, optional): Called after logging out to show the next
+                screen; without one, logging out closes the window.
         """
         self.root = root
+        self.window = root.winfo_toplevel()
         self.user_id = user_id
         self.username = username
+        self.on_logout = on_logout
 
         # Set up the main window properties
-        self.root.title(f"Income & Expense Tracker - {username}")
-        self.root.geometry("1200x800")
-        self.root.resizable(True, True)
+        self.window.title(f"Income & Expense Tracker - {username}")
+        self.window.geometry("1200x800")
+        self.window.resizable(True, True)
 
         # Configure grid layout for responsiveness
         self.root.grid_rowconfigure(0, weight=1)
@@ -39,6 +57,11 @@ class UserDashboard:
             text_color="white"
         ).pack(pady=(20, 10), padx=10)
 
+        # Search Box (full-text search over titles, sources and descriptions)
+        self.entry_search = ctk.CTkEntry(self.sidebar, placeholder_text="🔍 Search...", font=("Arial", 14), corner_radius=8)
+        self.entry_search.pack(fill="x", padx=10, pady=5)
+        self.entry_search.bind("<Return>", lambda event: self.show_search_results())
+
         # Sidebar Buttons
         buttons = [
             ("🏠 Dashboard", self.show_dashboard),
@@ -58,41 +81,48 @@ class UserDashboard:
                 hover_color="#333333"
             ).pack(fill="x", padx=10, pady=5)
 
+        # Loading state, shown while background tasks run
+        self.label_status = ctk.CTkLabel(self.sidebar, text="", font=("Arial", 14), text_color="white")
+        self.label_status.pack(side="bottom", pady=10)
+
         # Main Content Area
         self.main_content = ctk.CTkFrame(self.root, corner_radius=8, fg_color="#2B2B2B")
         self.main_content.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
 
+        # Slow calls (searches, exports) run on worker threads so the window stays responsive
+        self.tasks = TaskRunner(self.root, on_busy=self._set_busy)
+
+        # Totals and recent spending, read when first shown and then patched by each write
+        self.totals_minor = None
+        self.recent = None
+
+        # Each view is built on first use, then kept and refreshed when data changes
+        self.views = ViewManager(self.main_content)
+        self.views.register("dashboard", self.build_dashboard, self.refresh_dashboard, coalesce=True)
+        self.views.register("expenses", self.build_expenses, self.refresh_expenses)
+        self.views.register("incomes", self.build_incomes, self.refresh_incomes)
+        self.views.register("reports", self.build_reports, self.refresh_reports, coalesce=True)
+        self.views.register("search", self.build_search_results, self.refresh_search, coalesce=True)
+
         # Load default view
         self.show_dashboard()
 
-    def clear_main_content(self):
-        """Clear all widgets in the main content area."""
-        for widget in self.main_content.winfo_children():
-            widget.destroy()
-
     def show_dashboard(self):
         """Display the dashboard with user analytics and charts."""
-        self.clear_main_content()
-
-        # Ensure the database is initialized
-        initialize_db()
-
-        # Fetch data
-        expenses = get_expenses(self.user_id)
-        total_expenses = sum(expense["amount"] for expense in expenses) if expenses else 0
-        incomes = get_incomes(self.user_id)
-        total_incomes = sum(income["amount"] for income in incomes) if incomes else 0
+        self.views.show("dashboard")
 
+    def build_dashboard(self, view):
+        """Build the dashboard view: totals cards and the income vs. expenses chart."""
         # Dashboard Title
         ctk.CTkLabel(
-            self.main_content,
+            view,
             text="🏠 Dashboard Overview",
             font=("Arial", 24, "bold"),
             text_color="white"
         ).pack(pady=(20, 10))
 
         # Analytics Section with Professional Cards
-        analytics_frame = ctk.CTkFrame(self.main_content, corner_radius=8, fg_color="#3B3B3B")
+        analytics_frame = ctk.CTkFrame(view, corner_radius=8, fg_color="#3B3B3B")
         analytics_frame.pack(fill="both", expand=True, padx=20, pady=10)
 
         # Total Expenses Card
@@ -104,12 +134,12 @@ class UserDashboard:
             font=("Arial", 18, "bold"),
             text_color="white"
         ).pack(pady=(10, 5), padx=10)
-        ctk.CTkLabel(
+        self.label_total_expenses = ctk.CTkLabel(
             expenses_card,
-            text=f"NLe {total_expenses:.2f}",  # Changed currency to NLe
             font=("Arial", 24, "bold"),
             text_color="white"
-        ).pack(pady=(5, 10), padx=10)
+        )
+        self.label_total_expenses.pack(pady=(5, 10), padx=10)
 
         # Total Incomes Card
         incomes_card = ctk.CTkFrame(analytics_frame, corner_radius=8, fg_color="#2E8B57")
@@ -120,79 +150,220 @@ class UserDashboard:
             font=("Arial", 18, "bold"),
             text_color="white"
         ).pack(pady=(10, 5), padx=10)
-        ctk.CTkLabel(
+        self.label_total_incomes = ctk.CTkLabel(
             incomes_card,
-            text=f"NLe {total_incomes:.2f}",  # Changed currency to NLe
             font=("Arial", 24, "bold"),
             text_color="white"
-        ).pack(pady=(5, 10), padx=10)
+        )
+        self.label_total_incomes.pack(pady=(5, 10), padx=10)
 
         # Net Balance Card
-        net_balance = total_incomes - total_expenses
-        balance_color = "#3CB371" if net_balance >= 0 else "#FF4500"
-        balance_card = ctk.CTkFrame(analytics_frame, corner_radius=8, fg_color=balance_color)
-        balance_card.grid(row=0, column=2, padx=10, pady=10, sticky="nsew")
+        self.balance_card = ctk.CTkFrame(analytics_frame, corner_radius=8)
+        self.balance_card.grid(row=0, column=2, padx=10, pady=10, sticky="nsew")
         ctk.CTkLabel(
-            balance_card,
+            self.balance_card,
             text="Net Balance",
             font=("Arial", 18, "bold"),
             text_color="white"
         ).pack(pady=(10, 5), padx=10)
-        ctk.CTkLabel(
-            balance_card,
-            text=f"NLe {net_balance:.2f}",  # Changed currency to NLe
+        self.label_net_balance = ctk.CTkLabel(
+            self.balance_card,
             font=("Arial", 24, "bold"),
             text_color="white"
-        ).pack(pady=(5, 10), padx=10)
+        )
+        self.label_net_balance.pack(pady=(5, 10), padx=10)
 
         # Configure grid weights for analytics cards
         analytics_frame.grid_columnconfigure((0, 1, 2), weight=1)
 
         # Chart Section
-        chart_frame = ctk.CTkFrame(self.main_content, corner_radius=8, fg_color="#3B3B3B")
+        chart_frame = ctk.CTkFrame(view, corner_radius=8, fg_color="#3B3B3B")
         chart_frame.pack(fill="both", expand=True, padx=20, pady=10)
-        self.plot_pie_chart(total_expenses, total_incomes)
+        self.update_dashboard_chart = self.plot_pie_chart(chart_frame)
+        self.refresh_dashboard(view, None)
+
+    def refresh_dashboard(self, view, delta):
+        """Update the totals cards and the chart in place; any write changes them."""
+        totals = self._totals()
+        total_expenses, total_incomes = from_minor(totals["expense"]), from_minor(totals["income"])
+        net_balance = from_minor(totals["income"] - totals["expense"])
+        self.label_total_expenses.configure(text=f"NLe {total_expenses:.2f}")  # Changed currency to NLe
+        self.label_total_incomes.configure(text=f"NLe {total_incomes:.2f}")
+        self.label_net_balance.configure(text=f"NLe {net_balance:.2f}")
+        self.balance_card.configure(fg_color="#3CB371" if net_balance >= 0 else "#FF4500")
+        self.update_dashboard_chart(total_expenses, total_incomes)
+
+    def _totals(self):
+        """
+        The user's expense and income totals in minor units. They are read once (one lookup in
+        the trigger-maintained UserTotals table) and then patched by _apply_write.
+        """
+        if self.totals_minor is None:
+            totals = get_user_totals(self.user_id)
+            self.totals_minor = {"expense": totals["expense_minor"], "income": totals["income_minor"]}
+        return self.totals_minor
 
-    def plot_pie_chart(self, total_expenses, total_incomes):
-        """Plot a large, centered pie chart showing income vs. expenses."""
-        if total_expenses == 0 and total_incomes == 0:
+    def _recent(self):
+        """
+        Spending over the last RECENT_DAYS days: "start" and "end" dates and "by_category",
+        {category: [total_minor, count]}. Read once from the columnar ledger and then patched
+        by _apply_write.
+        """
+        if self.recent is None:
+            # numpy is loaded with the analytics service, on the first visit to the reports
+            from services.analytics_service import get_range_analytics
+            today = date.today()
+            start, end = (today - timedelta(days=RECENT_DAYS - 1)).isoformat(), (today + timedelta(days=1)).isoformat()
+            breakdown = get_range_analytics(self.user_id, start, end)["expense"]["by_category"]
+            self.recent = {"start": start, "end": end, "by_category": {
+                category: [int(total), int(count)]
+                for category, total, count in zip(breakdown["category"], breakdown["total_minor"], breakdown["count"])
+            }}
+        return self.recent
+
+    def _apply_write(self, kind, old=None, new=None):
+        """
+        Patch the totals and recent spending with one written record, then pass the change to
+        the views, which apply it without re-reading their data.
+
+        Args:
+            kind (str): "expense" or "income".
+            old (Record, optional): The record before an update or delete.
+            new (Record, optional): The record after an insert or update.
+        """
+        for record, sign in ((old, -1), (new, 1)):
+            if record is None:
+                continue
+            if self.totals_minor is not None:
+                self.totals_minor[kind] += sign * record["amount_minor"]
+            recent = self.recent
+            if kind == "expense" and recent is not None and recent["start"] <= record["date"] < recent["end"]:
+                entry = recent["by_category"].setdefault(record["category"] or UNCATEGORIZED, [0, 0])
+                entry[0] += sign * record["amount_minor"]
+                entry[1] += sign
+        self.views.refresh({"kind": kind, "old": old, "new": new})
+
+    def plot_pie_chart(self, parent):
+        """
+        Embed a large, centered pie chart showing income vs. expenses in parent.
+
+        Returns:
+            callable: Redraws the chart in place from new (total_expenses, total_incomes).
+        """
+        from gui.widgets import PieChart
+
+        # One figure for the life of the view, resized in place on every update
+        pie = PieChart(
+            parent,
+            labels=('Expenses', 'Incomes'),
+            colors=("#FF4500", "#2E8B57"),
+            title="Income vs. Expenses",
+            figsize=(6, 6)  # Larger size for better visibility
+        )
+        no_data = ctk.CTkLabel(
+            parent,
+            text="No data available to display charts.",
+            font=("Arial", 16),
+            text_color="white"
+        )
+
+        def update(total_expenses, total_incomes):
+            if total_expenses == 0 and total_incomes == 0:
+                pie.pack_forget()
+                no_data.pack(pady=10)
+                return
+            no_data.pack_forget()
+            pie.update_chart((total_expenses, total_incomes))
+            pie.pack(side="top", fill="both", expand=True, padx=10, pady=10)
+
+        return update
+
+    def show_search_results(self):
+        """Display the user's expenses and incomes matching the sidebar search box."""
+        self._run_search(self.entry_search.get().strip())
+
+    def refresh_search(self, view, delta):
+        """Run the search on screen again, since the write may have added, changed or removed a match."""
+        self._run_search(self.search_results[0], switch=False)
+
+    def _run_search(self, text, switch=True):
+        """
+        Search in the background; a newer search cancels one still running.
+
+        Args:
+            text (str): The search text.
+            switch (bool): Whether to switch to the results; otherwise they replace the
+                results view only if it is still on screen.
+        """
+        self.tasks.submit(
+            search_transactions,
+            self.user_id,
+            text,
+            channel="search",
+            on_done=lambda results: self._show_search_results(text, results, switch)
+        )
+
+    def _show_search_results(self, text, results, switch=True):
+        """Show the results of a finished search."""
+        self.search_results = (text, results)
+        if not switch and self.views.current != "search":
+            return  # The view was left before the search finished; a new search rebuilds it
+        # Every search has its own results, so this view is built afresh each time
+        self.views.rebuild("search")
+        self.views.show("search")
+
+    def build_search_results(self, view):
+        """Build the search results view from the latest finished search."""
+        text, results = self.search_results
+
+        ctk.CTkLabel(
+            view,
+            text=f"Search results for \"{text}\"",
+            font=("Arial", 18, "bold"),
+            text_color="white"
+        ).pack(pady=(20, 10), padx=10)
+        if not results:
             ctk.CTkLabel(
-                self.main_content,
-                text="No data available to display charts.",
+                view,
+                text="❌ No matching transactions found.",
                 font=("Arial", 16),
                 text_color="white"
-            ).pack(pady=10)
+            ).pack(pady=50)
             return
 
-        # Create the pie chart
-        fig, ax = plt.subplots(figsize=(6, 6))  # Larger size for better visibility
-        labels = ['Expenses', 'Incomes']
-        sizes = [total_expenses, total_incomes]
-        ax.pie(
-            sizes,
-            labels=labels,
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=["#FF4500", "#2E8B57"],
-            wedgeprops={'edgecolor': 'black'}
-        )
-        ax.axis('equal')  # Equal aspect ratio ensures the pie chart is circular.
-        ax.set_title("Income vs. Expenses", fontsize=18, color="white")
-
-        # Embed the chart into the dashboard
-        canvas = FigureCanvasTkAgg(fig, master=self.main_content)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side="top", fill="both", expand=True, padx=10, pady=10)
+        list_frame = ctk.CTkScrollableFrame(view, corner_radius=8, fg_color="#3B3B3B")
+        list_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        for col_idx, col in enumerate(("Type", "Title / Source", "Amount", "Date", "Description")):
+            ctk.CTkLabel(
+                list_frame,
+                text=col,
+                font=("Arial", 14, "bold"),
+                text_color="white"
+            ).grid(row=0, column=col_idx, padx=10, pady=5, sticky="w")
+        for row_idx, result in enumerate(results, start=1):
+            values = (
+                "💰 Expense" if result["kind"] == "expense" else "💸 Income",
+                result["label"],
+                format_money(result["amount_minor"], result["currency"]),
+                result["date"],
+                result["description"] or "",
+            )
+            for col_idx, value in enumerate(values):
+                ctk.CTkLabel(
+                    list_frame,
+                    text=value,
+                    font=("Arial", 14),
+                    text_color="white"
+                ).grid(row=row_idx, column=col_idx, padx=10, pady=5, sticky="w")
 
     def show_expenses(self):
         """Display the user's expenses with CRUD options."""
-        self.clear_main_content()
-
-        # Ensure the database is initialized
-        initialize_db()
+        self.views.show("expenses")
 
+    def build_expenses(self, view):
+        """Build the expenses view: the add form and the expense list."""
         # Expense Form Section
-        form_frame = ctk.CTkFrame(self.main_content, corner_radius=8, fg_color="#3B3B3B")
+        form_frame = ctk.CTkFrame(view, corner_radius=8, fg_color="#3B3B3B")
         form_frame.pack(fill="both", expand=False, padx=20, pady=10)
         ctk.CTkLabel(
             form_frame,
@@ -206,12 +377,16 @@ class UserDashboard:
         self.entry_amount = ctk.CTkEntry(form_frame, placeholder_text="Enter expense amount", font=("Arial", 14), corner_radius=8)
         self.combo_category = ctk.CTkOptionMenu(
             form_frame,
-            values=["Food", "Transport", "Entertainment", "Other"],
+            values=category_choices(),  # From the session's category cache, no query
             font=("Arial", 14),
             dropdown_fg_color="#3B3B3B",
             button_color="#4A4A4A",
             button_hover_color="#333333"
         )
+        combo_category = self.combo_category
+        subscribe_widget(combo_category, CATEGORIES_CHANGED,
+                         lambda: combo_category.configure(values=category_choices()))
+        from tkcalendar import DateEntry
         self.entry_date = DateEntry(
             form_frame,
             selectmode="day",
@@ -265,118 +440,63 @@ class UserDashboard:
             corner_radius=8
         ).pack(pady=10)
 
-        # Expense List Section
-        list_frame = ctk.CTkScrollableFrame(self.main_content, corner_radius=8, fg_color="#3B3B3B")
-        list_frame.pack(fill="both", expand=True, padx=20, pady=10)
-        columns = ("ID", "Title", "Amount", "Category", "Date", "Actions")
-        self.load_expenses(list_frame, columns)
-
-    def load_expenses(self, parent_frame, columns):
-        """Load and display all expenses for the current user with inline buttons."""
-        header_frame = ctk.CTkFrame(parent_frame, corner_radius=8, fg_color="#3B3B3B")
-        header_frame.pack(fill="x", pady=(10, 5))
-        for idx, col in enumerate(columns):
-            ctk.CTkLabel(
-                header_frame,
-                text=col,
-                font=("Arial", 14, "bold"),
-                text_color="white"
-            ).grid(row=0, column=idx, padx=10, pady=5, sticky="w")
-
-        expenses = get_expenses(self.user_id)
-        for idx, expense in enumerate(expenses):
-            row_frame = ctk.CTkFrame(parent_frame, corner_radius=6, fg_color="#4A4A4A")
-            row_frame.pack(fill="x", pady=5, padx=10)
-
-            ctk.CTkLabel(
-                row_frame,
-                text=str(expense["id"]),
-                font=("Arial", 14),
-                text_color="white"
-            ).grid(row=0, column=0, padx=10, pady=5, sticky="w")
-
-            ctk.CTkLabel(
-                row_frame,
-                text=expense["title"],
-                font=("Arial", 14),
-                text_color="white"
-            ).grid(row=0, column=1, padx=10, pady=5, sticky="w")
-
-            ctk.CTkLabel(
-                row_frame,
-                text=f"NLe {expense['amount']:.2f}",  # Changed currency to NLe
-                font=("Arial", 14),
-                text_color="white"
-            ).grid(row=0, column=2, padx=10, pady=5, sticky="w")
-
-            ctk.CTkLabel(
-                row_frame,
-                text=expense["category"],
-                font=("Arial", 14),
-                text_color="white"
-            ).grid(row=0, column=3, padx=10, pady=5, sticky="w")
+        # Expense List Section (widgets exist only for the rows in view, so any history opens as fast)
+        columns = (("ID", 60), ("Title", 200), ("Amount", 120), ("Category", 140), ("Date", 110))
+        self.expense_list = VirtualList(
+            view,
+            PagedSource(lambda cursor: get_expenses_page(self.user_id, cursor)),
+            columns,
+            lambda expense: (
+                str(expense["id"]),
+                expense["title"],
+                format_money(expense["amount_minor"], expense["currency"]),
+                expense["category"],
+                expense["date"],
+            ),
+            actions=(
+                ("📝", "#FFA500", "#FF8C00", self.edit_expense),
+                ("🗑️", "#FF4500", "#FF0000", self.delete_expense),
+            ),
+            tasks=self.tasks,  # Pages are read on worker threads as the list scrolls
+        )
+        self.expense_list.pack(fill="both", expand=True, padx=20, pady=10)
 
-            ctk.CTkLabel(
-                row_frame,
-                text=expense["date"],
-                font=("Arial", 14),
-                text_color="white"
-            ).grid(row=0, column=4, padx=10, pady=5, sticky="w")
-
-            # Inline Buttons for Edit and Delete
-            edit_button = ctk.CTkButton(
-                row_frame,
-                text="📝",
-                font=("Arial", 12),
-                width=30,
-                command=lambda id=expense["id"]: self.edit_expense(id),
-                fg_color="#FFA500",
-                hover_color="#FF8C00"
-            )
-            edit_button.grid(row=0, column=5, padx=5, pady=5)
-
-            delete_button = ctk.CTkButton(
-                row_frame,
-                text="🗑️",
-                font=("Arial", 12),
-                width=30,
-                command=lambda id=expense["id"]: self.delete_expense(id),
-                fg_color="#FF4500",
-                hover_color="#FF0000"
-            )
-            delete_button.grid(row=0, column=6, padx=5, pady=5)
+    def refresh_expenses(self, view, delta):
+        """Insert, update or remove the written expense in the list."""
+        if delta["kind"] == "expense":
+            self.expense_list.apply(delta["old"], delta["new"])
 
     def export_expenses_to_excel(self):
-        """Export expenses to an Excel file."""
-        try:
-            file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Files", "*.xlsx")])
-            if not file_path:
-                return
-
-            workbook = Workbook()
-            sheet = workbook.active
-            sheet.title = "Expenses"
-
-            # Write headers
-            headers = ["ID", "Title", "Amount (NLe)", "Category", "Date"]
-            sheet.append(headers)
-
-            # Write data rows
-            expenses = get_expenses(self.user_id)
-            for expense in expenses:
-                sheet.append([
-                    expense["id"],
-                    expense["title"],
-                    f"{expense['amount']:.2f}",  # Format amount to two decimal places
-                    expense["category"],
-                    expense["date"]
-                ])
-
-            # Save the workbook
-            workbook.save(file_path)
-            messagebox.showinfo("Success", "Expenses exported to Excel successfully!")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export expenses: {str(e)}")
+        """Export expenses to an Excel file (written in the background)."""
+        file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Files", "*.xlsx")])
+        if not file_path:
+            return
+        self._run_export(self._write_expenses_workbook, file_path, "Expenses exported to Excel successfully!",
+                         "Failed to export expenses")
+
+    def _write_expenses_workbook(self, file_path):
+        """Write the expenses workbook to file_path (runs on a worker thread)."""
+        from openpyxl import Workbook
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "Expenses"
+
+        # Write headers
+        headers = ["ID", "Title", "Amount (NLe)", "Category", "Date"]
+        sheet.append(headers)
+
+        # Write data rows
+        for expense in iter_expenses(self.user_id):
+            sheet.append([
+                expense["id"],
+                expense["title"],
+                f"{expense['amount']:.2f}",  # Format amount to two decimal places
+                expense["category"],
+                expense["date"]
+            ])
+
+        # Save the workbook
+        workbook.save(file_path)
 
     def add_expense(self):
         """Add a new expense to the database and refresh the list."""
@@ -393,15 +513,14 @@ class UserDashboard:
             messagebox.showwarning("Input Error", "❌ Please enter a valid amount (numeric value).")
             return
 
-        try:
-            if add_expense(self.user_id, title, float(amount), "NLe", category, date):  # Changed currency to NLe
-                messagebox.showinfo("Success", "✅ Expense added successfully!")
-                self.clear_form()
-                self.show_expenses()
-            else:
-                messagebox.showerror("Error", "❌ Failed to add expense.")
-        except Exception as e:
-            messagebox.showerror("Error", f"❌ An error occurred: {str(e)}")
+        self._run_write(
+            "expense",
+            add_expense,
+            (self.user_id, title, amount, "NLe", category, date),  # Changed currency to NLe
+            "✅ Expense added successfully!",
+            "❌ Failed to add expense.",
+            on_success=self.clear_form
+        )
 
     def clear_form(self):
         """Clear the input fields in the expense form."""
@@ -414,8 +533,8 @@ class UserDashboard:
         if hasattr(self, "entry_date"):
             self.entry_date.set_date(None)  # Reset the DateEntry widget
 
-    def edit_expense(self, expense_id):
-        """Edit an existing expense."""
+    def edit_expense(self, expense):
+        """Edit an existing expense (its record as listed)."""
         title = self._get_input("Enter new title:", "Edit Expense")
         if not title:
             return
@@ -432,37 +551,36 @@ class UserDashboard:
         if not date:
             return
 
-        try:
-            if update_expense(expense_id, title, float(amount), "NLe", category, date):  # Changed currency to NLe
-                messagebox.showinfo("Success", "✅ Expense updated successfully!")
-                self.show_expenses()
-            else:
-                messagebox.showerror("Error", "❌ Failed to update expense.")
-        except Exception as e:
-            messagebox.showerror("Error", f"❌ An error occurred: {str(e)}")
+        self._run_write(
+            "expense",
+            update_expense,
+            (expense["id"], title, amount, "NLe", category, date),  # Changed currency to NLe
+            "✅ Expense updated successfully!",
+            "❌ Failed to update expense.",
+            old=expense
+        )
 
-    def delete_expense(self, expense_id):
-        """Delete an existing expense."""
+    def delete_expense(self, expense):
+        """Delete an existing expense (its record as listed)."""
         confirm = messagebox.askyesno("Confirm", "Are you sure you want to delete this expense?")
         if confirm:
-            try:
-                if delete_expense(expense_id):
-                    messagebox.showinfo("Success", "✅ Expense deleted successfully!")
-                    self.show_expenses()
-                else:
-                    messagebox.showerror("Error", "❌ Failed to delete expense.")
-            except Exception as e:
-                messagebox.showerror("Error", f"❌ An error occurred: {str(e)}")
+            self._run_write(
+                "expense",
+                delete_expense,
+                (expense["id"],),
+                "✅ Expense deleted successfully!",
+                "❌ Failed to delete expense.",
+                deletes=True
+            )
 
     def show_incomes(self):
         """Display the user's incomes with CRUD options."""
-        self.clear_main_content()
-
-        # Ensure the database is initialized
-        initialize_db()
+        self.views.show("incomes")
 
+    def build_incomes(self, view):
+        """Build the incomes view: the add form and the income list."""
         # Income Form Section
-        form_frame = ctk.CTkFrame(self.main_content, corner_radius=8, fg_color="#3B3B3B")
+        form_frame = ctk.CTkFrame(view, corner_radius=8, fg_color="#3B3B3B")
         form_frame.pack(fill="both", expand=False, padx=20, pady=10)
         ctk.CTkLabel(
             form_frame,
@@ -474,6 +592,7 @@ class UserDashboard:
         # Inputs for Income
         self.entry_income_source = ctk.CTkEntry(form_frame, placeholder_text="Enter income source", font=("Arial", 14), corner_radius=8)
         self.entry_income_amount = ctk.CTkEntry(form_frame, placeholder_text="Enter income amount", font=("Arial", 14), corner_radius=8)
+        from tkcalendar import DateEntry
         self.entry_income_date = DateEntry(
             form_frame,
             selectmode="day",
@@ -523,110 +642,61 @@ class UserDashboard:
             corner_radius=8
         ).pack(pady=10)
 
-        # Income List Section
-        list_frame = ctk.CTkScrollableFrame(self.main_content, corner_radius=8, fg_color="#3B3B3B")
-        list_frame.pack(fill="both", expand=True, padx=20, pady=10)
-        columns = ("ID", "Source", "Amount", "Date", "Actions")
-        self.load_incomes(list_frame, columns)
-
-    def load_incomes(self, parent_frame, columns):
-        """Load and display all incomes for the current user with inline buttons."""
-        header_frame = ctk.CTkFrame(parent_frame, corner_radius=8, fg_color="#3B3B3B")
-        header_frame.pack(fill="x", pady=(10, 5))
-        for idx, col in enumerate(columns):
-            ctk.CTkLabel(
-                header_frame,
-                text=col,
-                font=("Arial", 14, "bold"),
-                text_color="white"
-            ).grid(row=0, column=idx, padx=10, pady=5, sticky="w")
-
-        incomes = get_incomes(self.user_id)
-        for idx, income in enumerate(incomes):
-            row_frame = ctk.CTkFrame(parent_frame, corner_radius=6, fg_color="#4A4A4A")
-            row_frame.pack(fill="x", pady=5, padx=10)
-
-            ctk.CTkLabel(
-                row_frame,
-                text=str(income["id"]),
-                font=("Arial", 14),
-                text_color="white"
-            ).grid(row=0, column=0, padx=10, pady=5, sticky="w")
-
-            ctk.CTkLabel(
-                row_frame,
-                text=income["source"],
-                font=("Arial", 14),
-                text_color="white"
-            ).grid(row=0, column=1, padx=10, pady=5, sticky="w")
-
-            ctk.CTkLabel(
-                row_frame,
-                text=f"NLe {income['amount']:.2f}",  # Changed currency to NLe
-                font=("Arial", 14),
-                text_color="white"
-            ).grid(row=0, column=2, padx=10, pady=5, sticky="w")
+        # Income List Section (widgets exist only for the rows in view, so any history opens as fast)
+        columns = (("ID", 60), ("Source", 200), ("Amount", 120), ("Date", 110))
+        self.income_list = VirtualList(
+            view,
+            PagedSource(lambda cursor: get_incomes_page(self.user_id, cursor)),
+            columns,
+            lambda income: (
+                str(income["id"]),
+                income["source"],
+                format_money(income["amount_minor"]),
+                income["date"],
+            ),
+            actions=(
+                ("📝", "#FFA500", "#FF8C00", self.edit_income),
+                ("🗑️", "#FF4500", "#FF0000", self.delete_income),
+            ),
+            tasks=self.tasks,
+        )
+        self.income_list.pack(fill="both", expand=True, padx=20, pady=10)
 
-            ctk.CTkLabel(
-                row_frame,
-                text=income["date"],
-                font=("Arial", 14),
-                text_color="white"
-            ).grid(row=0, column=3, padx=10, pady=5, sticky="w")
-
-            # Inline Buttons for Edit and Delete
-            edit_button = ctk.CTkButton(
-                row_frame,
-                text="📝",
-                font=("Arial", 12),
-                width=30,
-                command=lambda id=income["id"]: self.edit_income(id),
-                fg_color="#FFA500",
-                hover_color="#FF8C00"
-            )
-            edit_button.grid(row=0, column=4, padx=5, pady=5)
-
-            delete_button = ctk.CTkButton(
-                row_frame,
-                text="🗑️",
-                font=("Arial", 12),
-                width=30,
-                command=lambda id=income["id"]: self.delete_income(id),
-                fg_color="#FF4500",
-                hover_color="#FF0000"
-            )
-            delete_button.grid(row=0, column=5, padx=5, pady=5)
+    def refresh_incomes(self, view, delta):
+        """Insert, update or remove the written income in the list."""
+        if delta["kind"] == "income":
+            self.income_list.apply(delta["old"], delta["new"])
 
     def export_incomes_to_excel(self):
-        """Export incomes to an Excel file."""
-        try:
-            file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Files", "*.xlsx")])
-            if not file_path:
-                return
-
-            workbook = Workbook()
-            sheet = workbook.active
-            sheet.title = "Incomes"
-
-            # Write headers
-            headers = ["ID", "Source", "Amount (NLe)", "Date"]
-            sheet.append(headers)
-
-            # Write data rows
-            incomes = get_incomes(self.user_id)
-            for income in incomes:
-                sheet.append([
-                    income["id"],
-                    income["source"],
-                    f"{income['amount']:.2f}",  # Format amount to two decimal places
-                    income["date"]
-                ])
-
-            # Save the workbook
-            workbook.save(file_path)
-            messagebox.showinfo("Success", "Incomes exported to Excel successfully!")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export incomes: {str(e)}")
+        """Export incomes to an Excel file (written in the background)."""
+        file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Files", "*.xlsx")])
+        if not file_path:
+            return
+        self._run_export(self._write_incomes_workbook, file_path, "Incomes exported to Excel successfully!",
+                         "Failed to export incomes")
+
+    def _write_incomes_workbook(self, file_path):
+        """Write the incomes workbook to file_path (runs on a worker thread)."""
+        from openpyxl import Workbook
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "Incomes"
+
+        # Write headers
+        headers = ["ID", "Source", "Amount (NLe)", "Date"]
+        sheet.append(headers)
+
+        # Write data rows
+        for income in iter_incomes(self.user_id):
+            sheet.append([
+                income["id"],
+                income["source"],
+                f"{income['amount']:.2f}",  # Format amount to two decimal places
+                income["date"]
+            ])
+
+        # Save the workbook
+        workbook.save(file_path)
 
     def add_income(self):
         """Add a new income to the database and refresh the list."""
@@ -642,18 +712,17 @@ class UserDashboard:
             messagebox.showwarning("Input Error", "❌ Please enter a valid amount (numeric value).")
             return
 
-        try:
-            if add_income(self.user_id, source, float(amount), date):
-                messagebox.showinfo("Success", "✅ Income added successfully!")
-                self.clear_form()
-                self.show_incomes()
-            else:
-                messagebox.showerror("Error", "❌ Failed to add income.")
-        except Exception as e:
-            messagebox.showerror("Error", f"❌ An error occurred: {str(e)}")
+        self._run_write(
+            "income",
+            add_income,
+            (self.user_id, source, amount, date),
+            "✅ Income added successfully!",
+            "❌ Failed to add income.",
+            on_success=self.clear_form
+        )
 
-    def edit_income(self, income_id):
-        """Edit an existing income."""
+    def edit_income(self, income):
+        """Edit an existing income (its record as listed)."""
         source = self._get_input("Enter new source:", "Edit Income")
         if not source:
             return
@@ -666,38 +735,37 @@ class UserDashboard:
         if not date:
             return
 
-        try:
-            if update_income(income_id, source, float(amount), date):
-                messagebox.showinfo("Success", "✅ Income updated successfully!")
-                self.show_incomes()
-            else:
-                messagebox.showerror("Error", "❌ Failed to update income.")
-        except Exception as e:
-            messagebox.showerror("Error", f"❌ An error occurred: {str(e)}")
+        self._run_write(
+            "income",
+            update_income,
+            (income["id"], source, amount, date),
+            "✅ Income updated successfully!",
+            "❌ Failed to update income.",
+            old=income
+        )
 
-    def delete_income(self, income_id):
-        """Delete an existing income."""
+    def delete_income(self, income):
+        """Delete an existing income (its record as listed)."""
         confirm = messagebox.askyesno("Confirm", "Are you sure you want to delete this income?")
         if confirm:
-            try:
-                if delete_income(income_id):
-                    messagebox.showinfo("Success", "✅ Income deleted successfully!")
-                    self.show_incomes()
-                else:
-                    messagebox.showerror("Error", "❌ Failed to delete income.")
-            except Exception as e:
-                messagebox.showerror("Error", f"❌ An error occurred: {str(e)}")
+            self._run_write(
+                "income",
+                delete_income,
+                (income["id"],),
+                "✅ Income deleted successfully!",
+                "❌ Failed to delete income.",
+                deletes=True
+            )
 
     def show_reports(self):
         """Generate and display reports with charts."""
-        self.clear_main_content()
-
-        # Ensure the database is initialized
-        initialize_db()
+        self.views.show("reports")
 
+    def build_reports(self, view):
+        """Build the reports view: export buttons, the income vs. expenses chart and recent spending."""
         # Reports Title
         ctk.CTkLabel(
-            self.main_content,
+            view,
             text="📊 Reports",
             font=("Arial", 24, "bold"),
             text_color="white"
@@ -705,7 +773,7 @@ class UserDashboard:
 
         # Export Combined Report Button
         ctk.CTkButton(
-            self.main_content,
+            view,
             text="Export Combined Report to Excel",
             font=("Arial", 14),
             command=self.export_combined_report,
@@ -714,89 +782,156 @@ class UserDashboard:
             corner_radius=8
         ).pack(pady=10)
 
-        # Display Charts
-        expenses = get_expenses(self.user_id)
-        total_expenses = sum(expense["amount"] for expense in expenses) if expenses else 0
-        incomes = get_incomes(self.user_id)
-        total_incomes = sum(income["amount"] for income in incomes) if incomes else 0
-
-        if total_expenses == 0 and total_incomes == 0:
-            ctk.CTkLabel(
-                self.main_content,
-                text="No data available to display charts.",
-                font=("Arial", 16),
-                text_color="white"
-            ).pack(pady=10)
-            return
+        # Export Text Report Button
+        ctk.CTkButton(
+            view,
+            text="Export Text Report",
+            font=("Arial", 14),
+            command=self.export_text_report,
+            fg_color="#FFA500",
+            hover_color="#FF8C00",
+            corner_radius=8
+        ).pack(pady=10)
 
-        # Plot Income vs. Expenses Pie Chart
-        fig, ax = plt.subplots(figsize=(6, 6))  # Larger pie chart
-        labels = ['Expenses', 'Incomes']
-        sizes = [total_expenses, total_incomes]
-        ax.pie(
-            sizes,
-            labels=labels,
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=["#FF4500", "#2E8B57"],
-            wedgeprops={'edgecolor': 'black'}
+        # Income vs. Expenses Pie Chart
+        chart_frame = ctk.CTkFrame(view, fg_color="transparent")
+        chart_frame.pack(fill="both", expand=True)
+        self.update_reports_chart = self.plot_pie_chart(chart_frame)
+
+        # Recent spending by category, aggregated from the columnar ledger
+        self.label_recent = ctk.CTkLabel(view, font=("Arial", 16), text_color="white")
+        self.label_recent.pack(pady=10)
+        from gui.widgets import ExpenseChart
+        self.recent_chart = ExpenseChart(view, [])
+        self.recent_chart.pack()
+        self.refresh_reports(view, None)
+
+    def refresh_reports(self, view, delta):
+        """Redraw the charts in place from the patched totals and recent spending."""
+        totals = self._totals()
+        self.update_reports_chart(from_minor(totals["expense"]), from_minor(totals["income"]))
+        by_category = self._recent()["by_category"]
+        self.label_recent.configure(
+            text=f"Last {RECENT_DAYS} days: {format_money(sum(total for total, _ in by_category.values()))} spent "
+                 f"in {sum(count for _, count in by_category.values())} expenses"
         )
-        ax.axis('equal')  # Equal aspect ratio ensures the pie chart is circular.
-        ax.set_title("Income vs. Expenses", fontsize=18, color="white")
-
-        # Embed the chart into the dashboard
-        canvas = FigureCanvasTkAgg(fig, master=self.main_content)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side="top", fill="both", expand=True, padx=10, pady=10)
+        self.recent_chart.update_chart([
+            {"category": category, "total": from_minor(total)}
+            for category, (total, count) in sorted(by_category.items()) if count
+        ])
 
     def export_combined_report(self):
-        """Export a combined report of incomes and expenses to an Excel file."""
-        try:
-            file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Files", "*.xlsx")])
-            if not file_path:
+        """Export a combined report of incomes and expenses to an Excel file (written in the background)."""
+        file_path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel Files", "*.xlsx")])
+        if not file_path:
+            return
+        self._run_export(self._write_combined_workbook, file_path, "Report exported to Excel successfully!",
+                         "Failed to export report")
+
+    def _write_combined_workbook(self, file_path):
+        """Write the combined incomes and expenses workbook to file_path (runs on a worker thread)."""
+        from openpyxl import Workbook
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "Combined Report"
+
+        # Write headers
+        headers = ["ID", "Type", "Description", "Amount (NLe)", "Date"]
+        sheet.append(headers)
+
+        # Write expenses
+        for expense in iter_expenses(self.user_id):
+            sheet.append([
+                expense["id"],
+                "Expense",
+                expense["title"],
+                f"{expense['amount']:.2f}",  # Format amount to two decimal places
+                expense["date"]
+            ])
+
+        # Write incomes
+        for income in iter_incomes(self.user_id):
+            sheet.append([
+                income["id"],
+                "Income",
+                income["source"],
+                f"{income['amount']:.2f}",  # Format amount to two decimal places
+                income["date"]
+            ])
+
+        # Save the workbook
+        workbook.save(file_path)
+
+    def export_text_report(self):
+        """Export the income and expense summary (built from the monthly rollup) to a text file in the background."""
+        file_path = filedialog.asksaveasfilename(defaultextension=".txt", filetypes=[("Text Files", "*.txt")])
+        if not file_path:
+            return
+        self._run_export(self._write_text_report, file_path, "Report exported to text file successfully!",
+                         "Failed to export report")
+
+    def _write_text_report(self, file_path):
+        """Write the text report to file_path. (runs on a worker thread)."""
+        with open(file_path, "w", encoding="utf-8") as file:
+            file.write(build_text_report(self.user_id))
+
+    def _run_export(self, write, file_path, success, failure):
+        """Run write(file_path) on a worker thread and report the outcome when it is done."""
+        self.tasks.submit(
+            write,
+            file_path,
+            on_done=lambda _: messagebox.showinfo("Success", success),
+            on_error=lambda e: messagebox.showerror("Error", f"{failure}: {str(e)}")
+        )
+
+    def _run_write(self, kind, write, args, success, failure, old=None, deletes=False, on_success=None):
+        """
+        Run a service write on a worker thread; when it is done, report the outcome and apply
+        the written record to the totals and views.
+
+        Args:
+            kind (str): "expense" or "income".
+            write (callable): The service call; returns the written record, or None on failure.
+            args (tuple): Its arguments.
+            success (str): Shown when the write succeeds.
+            failure (str): Shown when the service reports a failure.
+            old (Record, optional): The record as listed before an update.
+            deletes (bool): Whether write is a delete; it returns the record it removed.
+            on_success (callable, optional): Called after a successful write, e.g. to clear the form.
+        """
+        def done(record):
+            if not record:
+                messagebox.showerror("Error", failure)
                 return
+            messagebox.showinfo("Success", success)
+            if on_success is not None:
+                on_success()
+            if deletes:
+                self._apply_write(kind, old=record)
+            else:
+                self._apply_write(kind, old=old, new=record)
+
+        self.tasks.submit(
+            write,
+            *args,
+            on_done=done,
+            on_error=lambda e: messagebox.showerror("Error", f"❌ An error occurred: {str(e)}")
+        )
 
-            workbook = Workbook()
-            sheet = workbook.active
-            sheet.title = "Combined Report"
-
-            # Write headers
-            headers = ["ID", "Type", "Description", "Amount (NLe)", "Date"]
-            sheet.append(headers)
-
-            # Write expenses
-            expenses = get_expenses(self.user_id)
-            for expense in expenses:
-                sheet.append([
-                    expense["id"],
-                    "Expense",
-                    expense["title"],
-                    f"{expense['amount']:.2f}",  # Format amount to two decimal places
-                    expense["date"]
-                ])
-
-            # Write incomes
-            incomes = get_incomes(self.user_id)
-            for income in incomes:
-                sheet.append([
-                    income["id"],
-                    "Income",
-                    income["source"],
-                    f"{income['amount']:.2f}",  # Format amount to two decimal places
-                    income["date"]
-                ])
-
-            # Save the workbook
-            workbook.save(file_path)
-            messagebox.showinfo("Success", "Report exported to Excel successfully!")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export report: {str(e)}")
+    def _set_busy(self, busy):
+        """Show the loading state while background tasks run."""
+        self.label_status.configure(text="⏳ Working..." if busy else "")
+        self.window.configure(cursor="watch" if busy else "")
 
     def logout(self):
-        """Log out the user and return to the authentication window."""
-        self.root.destroy()
-        from main import open_auth_window
-        open_auth_window()
+        """Log out the user and return to the authentication screen."""
+        self.tasks.shutdown()
+        end_session(self.user_id)
+        self.window.configure(cursor="")
+        if self.on_logout is not None:
+            self.on_logout()
+        else:
+            self.window.destroy()
 
     def _get_input(self, prompt, title):
         """Helper method to get string input from the user."""
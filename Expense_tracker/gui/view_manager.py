@@ -0,0 +1,90 @@
+import customtkinter as ctk
+
+
+class ViewManager:
+    """
+    Switches the views of a window's content area without rebuilding them.
+
+    Each view is built into its own frame the first time it is shown and afterwards only
+    packed and unpacked, so switching back to a view costs no widget creation. When data
+    changes, refresh(delta) lets the views update just what the change affects: the view on
+    screen is refreshed at once, views built but hidden when they are next shown, and views
+    never built are left alone, since they read fresh data when they are. A hidden view
+    registered with coalesce=True is refreshed once on showing, however many writes it missed.
+    """
+
+    def __init__(self, container):
+        """
+        Args:
+            container: The widget the views are packed into.
+        """
+        self.container = container
+        self._builders = {}  # View name -> (build, refresh, coalesce)
+        self._frames = {}  # View name -> frame, once built
+        self._pending = {}  # View name -> deltas not yet applied to the hidden view
+        self.current = None
+
+    def register(self, name, build, refresh=None, coalesce=False):
+        """
+        Add a view.
+
+        Args:
+            name (str): Name to show the view by.
+            build (callable): Called with a new frame to fill with the view's widgets.
+            refresh (callable, optional): Called with the frame and a delta after data the
+                view shows has changed; views without one are never refreshed.
+            coalesce (bool): refresh redraws from current data and ignores what the delta
+                says, so while the view is hidden only the latest delta is kept and showing
+                it refreshes it once.
+        """
+        self._builders[name] = (build, refresh, coalesce)
+
+    def show(self, name):
+        """
+        Show a view, building it if this is the first time and bringing it up to date.
+
+        Returns:
+            The view's frame.
+        """
+        build, refresh, _ = self._builders[name]
+        frame = self._frames.get(name)
+        if frame is None:
+            frame = ctk.CTkFrame(self.container, fg_color="transparent")
+            build(frame)
+            self._frames[name] = frame
+        else:
+            for delta in self._pending.pop(name, ()):
+                refresh(frame, delta)
+        if self.current != name:
+            if self.current is not None:
+                self._frames[self.current].pack_forget()
+            frame.pack(fill="both", expand=True)
+            self.current = name
+        return frame
+
+    def refresh(self, delta):
+        """
+        Tell the views that data changed.
+
+        Args:
+            delta (dict): What changed; passed to the views' refresh callbacks as is.
+        """
+        for name, frame in self._frames.items():
+            _, refresh, coalesce = self._builders[name]
+            if refresh is None:
+                continue
+            if name == self.current:
+                refresh(frame, delta)
+            elif coalesce:
+                self._pending[name] = [delta]
+            else:
+                self._pending.setdefault(name, []).append(delta)
+
+    def rebuild(self, name):
+        """Discard a view's widgets so the next show() builds it again from scratch."""
+        frame = self._frames.pop(name, None)
+        self._pending.pop(name, None)
+        if frame is not None:
+            frame.destroy()
+            if self.current == name:
+                self.current = None
@@ -0,0 +1,226 @@
+import logging
+import tkinter as tk
+import customtkinter as ctk
+
+# Rows fetched beyond the last rendered one, so the next page is usually in before it scrolls into view
+PREFETCH_ROWS = 50
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Scrollable list that only creates widgets for the rows in view.
+
+    The rows are laid out on a canvas whose scroll region spans every loaded row, but only
+    a small pool of row widgets exists: enough for the viewport plus `overscan` rows above
+    and below it. Scrolling moves the pool to the rows now in view and refills it instead
+    of creating widgets, so the widget count, and the time to open the list, do not grow
+    with the number of rows. Rows come from a PagedSource and further pages are fetched as
+    the view nears the end of the loaded rows; given a TaskRunner, the fetches run on its
+    workers and the list is redrawn when each page arrives.
+    """
+
+    def __init__(self, master, source, columns, row_values, actions=(), row_height=40, overscan=4, tasks=None,
+                 **kwargs):
+        """
+        Args:
+            master: Parent widget.
+            source (PagedSource): The rows to list.
+            columns (tuple): (heading, width in pixels) of each text column.
+            row_values (callable): Returns the column texts of a row from its record.
+            actions (tuple): (text, fg_color, hover_color, callback) of each inline button;
+                the callback is called with the row's record.
+            row_height (int): Height of one row in pixels.
+            overscan (int): Rows rendered above and below the viewport.
+            tasks (TaskRunner, optional): Runs the page fetches; without one they run
+                on the Tk thread.
+        """
+        kwargs.setdefault("corner_radius", 8)
+        kwargs.setdefault("fg_color", "#3B3B3B")
+        super().__init__(master, **kwargs)
+        self.source = source
+        self.columns = columns
+        self.row_values = row_values
+        self.actions = actions
+        self.row_height = row_height
+        self.overscan = overscan
+        self.tasks = tasks
+        self._fetching = None  # The page fetch running on the task runner, if any
+        self._slots = []  # Recycled rows: (canvas window item, labels)
+        self._slot_rows = []  # Index of the row each slot shows, None while hidden, -1 if outdated
+        self._region_rows = None  # Rows the scroll region was last sized for
+
+        header = ctk.CTkFrame(self, corner_radius=8, fg_color="#3B3B3B")
+        header.pack(fill="x", padx=10, pady=(10, 5))
+        for idx, (heading, width) in enumerate(columns):
+            ctk.CTkLabel(
+                header,
+                text=heading,
+                width=width,
+                anchor="w",
+                font=("Arial", 14, "bold"),
+                text_color="white"
+            ).grid(row=0, column=idx, padx=10, pady=5, sticky="w")
+        ctk.CTkLabel(
+            header,
+            text="Actions",
+            font=("Arial", 14, "bold"),
+            text_color="white"
+        ).grid(row=0, column=len(columns), padx=10, pady=5, sticky="w")
+
+        body = ctk.CTkFrame(self, fg_color="transparent")
+        body.pack(fill="both", expand=True, padx=(10, 0), pady=(0, 10))
+        self.canvas = tk.Canvas(body, bg="#3B3B3B", highlightthickness=0, yscrollincrement=row_height)
+        self.scrollbar = ctk.CTkScrollbar(body, command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.canvas)
+
+    def reload(self):
+        """Drop the loaded rows and show the list again from the top, e.g. after a write."""
+        self.source.reset()
+        for window, _ in self._slots:
+            self.canvas.itemconfigure(window, state="hidden")
+        self._slot_rows = [None] * len(self._slots)
+        self._fetching = None  # A fetch still running is superseded by the next one on the channel
+        self.canvas.yview_moveto(0)
+        self._render()
+
+    def apply(self, old=None, new=None):
+        """
+        Show one written row without reloading: old is the record as listed before an update
+        or delete, new the record after an update or insert. Only the rows in view are
+        redrawn, so the cost does not depend on how many rows are loaded.
+        """
+        moved = [index for index in (
+            self.source.remove(old) if old is not None else None,
+            self.source.insert(new) if new is not None else None,
+        ) if index is not None]
+        if not moved:
+            return
+        # Rows from the first change on have shifted; their slots are refilled or hidden
+        first = min(moved)
+        for slot, index in enumerate(self._slot_rows):
+            if index is not None and index >= first:
+                self._slot_rows[slot] = -1
+        self._render()
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self._render()
+
+    def _on_wheel(self, event):
+        if event.num == 4:
+            step = -3
+        elif event.num == 5:
+            step = 3
+        else:
+            step = -3 if event.delta > 0 else 3
+        self.canvas.yview_scroll(step, "units")
+        self._render()
+        return "break"
+
+    def _bind_wheel(self, widget):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            widget.bind(sequence, self._on_wheel)
+
+    def _on_resize(self, event):
+        for window, _ in self._slots:
+            self.canvas.itemconfigure(window, width=event.width)
+        self._render()
+
+    def _load(self, count):
+        """Have at least count rows loaded, or fetching in the background, if that many exist."""
+        if self.tasks is None:
+            self.source.ensure(count)
+            return
+        if self._fetching is not None:
+            return  # _on_page renders again, and so asks for any further page, when it arrives
+        request = self.source.next_fetch(count)
+        if request is None:
+            return
+        self._fetching = request
+        self.tasks.submit(
+            self.source.fetch,
+            request,
+            channel=("page", id(self)),
+            on_done=lambda page: self._on_page(request, page),
+            on_error=lambda e: self._on_page_error(request, e)
+        )
+
+    def _on_page(self, request, page):
+        """Show a page fetched in the background."""
+        if self._fetching != request:
+            return
+        self._fetching = None
+        if self.source.add_page(request, page):
+            self._render()
+
+    def _on_page_error(self, request, error):
+        if self._fetching == request:
+            self._fetching = None
+        logging.error(f"Error fetching list page: {error}")
+
+    def _make_slot(self):
+        """Create one recycled row: a frame with a label per column and the action buttons."""
+        slot = len(self._slots)
+        frame = ctk.CTkFrame(self.canvas, corner_radius=6, fg_color="#4A4A4A", height=self.row_height - 4)
+        labels = []
+        for idx, (_, width) in enumerate(self.columns):
+            label = ctk.CTkLabel(frame, text="", width=width, anchor="w", font=("Arial", 14), text_color="white")
+            label.grid(row=0, column=idx, padx=10, pady=5, sticky="w")
+            self._bind_wheel(label)
+            labels.append(label)
+        for idx, (text, fg_color, hover_color, callback) in enumerate(self.actions, start=len(self.columns)):
+            ctk.CTkButton(
+                frame,
+                text=text,
+                font=("Arial", 12),
+                width=30,
+                # The slot shows different rows over time, so look the record up when clicked
+                command=lambda slot=slot, callback=callback: callback(self.source[self._slot_rows[slot]]),
+                fg_color=fg_color,
+                hover_color=hover_color
+            ).grid(row=0, column=idx, padx=5, pady=5)
+        self._bind_wheel(frame)
+        window = self.canvas.create_window(
+            0, 0, window=frame, anchor="nw", width=self.canvas.winfo_width(), height=self.row_height - 4,
+            state="hidden"
+        )
+        self._slots.append((window, labels))
+        self._slot_rows.append(None)
+
+    def _render(self):
+        """Point the slot pool at the rows in and around the viewport, fetching rows as needed."""
+        top = int(self.canvas.canvasy(0))
+        height = max(self.canvas.winfo_height(), self.row_height)
+        first = max(top // self.row_height - self.overscan, 0)
+        end = (top + height) // self.row_height + 1 + self.overscan
+        self._load(end + PREFETCH_ROWS)
+        if len(self.source) != self._region_rows:  # Rows were fetched or reloaded: resize the scroll region
+            self._region_rows = len(self.source)
+            self.canvas.configure(scrollregion=(0, 0, 0, self._region_rows * self.row_height))
+        end = min(end, len(self.source))
+        while len(self._slots) < end - first:
+            self._make_slot()
+
+        # Slots already showing a row in range keep it; the rest take the rows left over
+        wanted = set(range(first, end))
+        free = []
+        for slot, index in enumerate(self._slot_rows):
+            if index in wanted:
+                wanted.discard(index)
+            else:
+                free.append(slot)
+        for slot, index in zip(free, sorted(wanted)):
+            window, labels = self._slots[slot]
+            for label, text in zip(labels, self.row_values(self.source[index])):
+                label.configure(text=text)
+            self.canvas.coords(window, 0, index * self.row_height + 2)
+            self.canvas.itemconfigure(window, state="normal")
+            self._slot_rows[slot] = index
+        for slot in free[len(wanted):]:
+            if self._slot_rows[slot] is not None:
+                self.canvas.itemconfigure(self._slots[slot][0], state="hidden")
+                self._slot_rows[slot] = None
@@ -1,22 +1,177 @@
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import math
+from utils.money import DEFAULT_EXPONENT
 
-class ExpenseChart:
-    def __init__(self, root, expenses):
-        self.root = root
-        self.fig, self.ax = plt.subplots()
-        self.canvas = FigureCanvasTkAgg(self.fig, master=root)
-        self.canvas.get_tk_widget().pack()
 
-        self.update_chart(expenses)
+class Chart:
+    """
+    One chart slot: a matplotlib Figure and its Tk canvas, created once and then redrawn in
+    place as the data changes.
+
+    The figure is built from matplotlib.figure.Figure rather than through pyplot, so it is
+    never registered with pyplot's global figure manager and is freed together with the
+    widget that shows it. Subclasses update the data of their artists instead of clearing
+    the axes. The artists that change are marked animated: after a full draw the figure is
+    saved without them, and an update that leaves the layout alone only restores that
+    background and redraws them (blitting).
+    """
+
+    def __init__(self, master, figsize=None):
+        """
+        Args:
+            master: The widget the chart's canvas is created in.
+            figsize (tuple, optional): Figure size in inches.
+        """
+        # Imported here so that importing a window module does not load matplotlib
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self._animated = []  # Artists redrawn by blitting
+        self._background = None  # The figure without them, saved after each full draw
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def pack(self, **kwargs):
+        self.widget.pack(**kwargs)
+
+    def pack_forget(self):
+        self.widget.pack_forget()
+
+    def grid(self, **kwargs):
+        self.widget.grid(**kwargs)
+
+    def set_animated(self, artists):
+        """Make artists the ones updates redraw by blitting."""
+        for artist in self._animated:
+            artist.set_animated(False)
+        self._animated = list(artists)
+        for artist in self._animated:
+            artist.set_animated(True)
+
+    def _on_draw(self, event):
+        """After a full draw, save the background and draw the animated artists over it."""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self._animated:
+            self.figure.draw_artist(artist)
+
+    def redraw(self, full=False):
+        """
+        Show updated artists: blit them over the saved background, or draw the whole figure
+        if the axes changed (full) or it has not been drawn yet.
+        """
+        if full or self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        for artist in self._animated:
+            self.figure.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
 
-    def update_chart(self, expenses):
-        self.ax.clear()
-        categories = [expense["category_id"] for expense in expenses]
-        amounts = [expense["amount"] for expense in expenses]
+class PieChart(Chart):
+    """Pie chart with a fixed set of slices whose sizes are updated in place."""
 
-        self.ax.bar(categories, amounts)
+    def __init__(self, master, labels, colors, title=None, figsize=None, start_angle=90):
+        """
+        Args:
+            master: The widget the chart's canvas is created in.
+            labels (tuple): Slice labels.
+            colors (tuple): Slice colors.
+            title (str, optional): Chart title.
+            figsize (tuple, optional): Figure size in inches.
+            start_angle (float): Angle of the first slice's edge, in degrees.
+        """
+        super().__init__(master, figsize)
+        self.start_angle = start_angle
+        self.wedges, self.label_texts, self.pct_texts = self.ax.pie(
+            [1] * len(labels),
+            labels=labels,
+            autopct='%1.1f%%',
+            startangle=start_angle,
+            colors=colors,
+            wedgeprops={'edgecolor': 'black'}
+        )
+        self.ax.axis('equal')  # Equal aspect ratio ensures the pie chart is circular.
+        if title:
+            self.ax.set_title(title, fontsize=18, color="white")
+        self.set_animated([*self.wedges, *self.label_texts, *self.pct_texts])
+
+    def update_chart(self, values):
+        """
+        Resize the slices to values, placing the labels as Axes.pie does. The axes do not
+        change, so after the first draw this is a blit.
+        """
+        total = float(sum(values))
+        theta = self.start_angle
+        for wedge, label, pct, value in zip(self.wedges, self.label_texts, self.pct_texts, values):
+            share = float(value) / total if total else 0.0
+            end = theta + 360 * share
+            wedge.set_theta1(theta)
+            wedge.set_theta2(end)
+            middle = math.radians((theta + end) / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment("left" if x >= 0 else "right")
+            pct.set_position((0.6 * x, 0.6 * y))
+            pct.set_text(f"{share * 100:.1f}%")
+            theta = end
+        self.redraw()
+
+
+class ExpenseChart(Chart):
+    """Bar chart of totals by category, with bar heights updated in place."""
+
+    def __init__(self, root, category_totals):
+        super().__init__(root)
+        self.root = root
+        self.categories = None  # The categories the bars are for
+        self.bars = []
         self.ax.set_xlabel("Category")
         self.ax.set_ylabel("Amount")
         self.ax.set_title("Expenses by Category")
-        self.canvas.draw()
\ No newline at end of file
+
+        self.update_chart(category_totals)
+
+    def update_chart(self, category_totals):
+        """
+        Redraw the bars from pre-aggregated totals: rows with "category" and "total" keys
+        (services.rollup_service), or a columnar breakdown with "category" and "total_minor"
+        arrays (services.analytics_service), which is plotted without a per-row loop.
+
+        With the same categories as before only the bar heights change, and if they still
+        fit the y axis the bars are blitted; otherwise the bars or the axis are rebuilt and
+        the figure is drawn again.
+        """
+        if isinstance(category_totals, dict):
+            categories = list(category_totals["category"])
+            amounts = [float(amount) for amount in category_totals["total_minor"] / 10 ** DEFAULT_EXPONENT]
+        else:
+            categories = [row["category"] for row in category_totals]
+            amounts = [float(row["total"]) for row in category_totals]
+
+        full = False
+        if categories == self.categories:
+            for bar, amount in zip(self.bars, amounts):
+                bar.set_height(amount)
+        else:
+            for bar in self.bars:
+                bar.remove()
+            # Numeric positions with tick labels, so categories that are gone leave no slot behind
+            positions = range(len(categories))
+            self.bars = list(self.ax.bar(positions, amounts))
+            self.ax.set_xticks(positions)
+            self.ax.set_xticklabels(categories)
+            self.ax.set_xlim(-0.5, max(len(categories), 1) - 0.5)
+            self.categories = categories
+            self.set_animated(self.bars)
+            full = True
+
+        # Rescale when the bars outgrow the y axis or shrink to under half of it
+        low, high = min(amounts + [0.0]), max(amounts + [0.0])
+        bottom, top = self.ax.get_ylim()
+        if low < bottom or high > top or 0 < high < top / 2:
+            self.ax.set_ylim(low * 1.05, high * 1.05 or 1.0)
+            full = True
+        self.redraw(full)
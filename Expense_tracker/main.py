@@ -1,53 +1,77 @@
+import logging
 import customtkinter as ctk
 from gui.auth_window import AuthWindow
+from gui.screen_router import ScreenRouter
 from gui.splash_screen import SplashScreen
+from services.session_service import start_session
+
+
+# The application's single window and its screens, set up by open_splash_screen()
+router = None
 
 
 def open_auth_window():
     """
-    Opens the authentication window.
+    Shows the authentication screen in the application window.
     """
-    root = ctk.CTk()
-    root.geometry("800x600")  # ✅ Set window size properly
-    auth_window = AuthWindow(root, on_login_success)
-    root.mainloop()
+    router.show("auth", lambda frame: AuthWindow(frame, on_login_success))
 
 
 def on_login_success(user):
     """
-    Callback function after successful login.
+    Callback function after successful login: shows the admin or user dashboard.
     """
     if "id" not in user or "username" not in user:
         raise ValueError("User object must contain 'id' and 'username' keys.")
 
+    # Categories and the profile are cached for the session, so forms open without queries
+    start_session(user["id"])
+
+    if user.get("user_type") == "ADMIN":
+        from gui.admin_dashboard import AdminDashboard
+        router.show("admin", lambda frame: AdminDashboard(frame, on_logout=open_auth_window))
+    else:
+        from gui.user_dashboard import UserDashboard
+        router.show("user", lambda frame: UserDashboard(
+            frame, user["id"], user["username"], on_logout=open_auth_window
+        ))
+
+
+def open_splash_screen():
+    """
+    Creates the application window showing the splash screen. The splash warms up the
+    database and the heavy modules in the background while it is shown; every later
+    screen replaces it in the same window.
+
+    Returns:
+        The application window; call its mainloop() to run the application.
+    """
+    global router
     root = ctk.CTk()
-    root.geometry("1200x800")  # ✅ Set window size correctly
-    
-    from gui.user_dashboard import UserDashboard
-    UserDashboard(root, user["id"], user["username"])
-    
-    root.mainloop()  # ✅ Removed incorrect arguments
+    root.geometry("1200x600")
+    root.title("Daily Income & Expense Tracker Management System")
+    root.minsize(400, 300)
+    root.resizable(False, False)
+
+    def build_splash(frame):
+        splash = SplashScreen(frame, open_auth_window)
+        splash.pack(fill="both", expand=True)
+        return splash
+
+    router = ScreenRouter(root)
+    router.show("splash", build_splash)
+    return root
 
 
 if __name__ == "__main__":
-    # Main application configuration
-    app = ctk.CTk()
-    app.geometry("1200x800")
-    app.title("Daily Income & Expenses Tracker Management System")
-    app.minsize(400, 300)  # ✅ Corrected minimum window size
+    # Configure logging (importing the application's modules leaves it alone)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
     # Set custom theme
     ctk.set_appearance_mode("System")
     ctk.set_default_color_theme("blue")
 
-    # Create and show splash screen
-    splash_root = ctk.CTk()
-    splash_root.geometry("1200x600")
-    splash_root.title("Daily Income & Expense Tracker Management System")
-    splash_root.minsize(400, 300)
-    splash_root.resizable(False, False)
-
-    splash = SplashScreen(splash_root, open_auth_window)
-    splash.pack(fill="both", expand=True)
-
-    splash_root.mainloop()
+    # One window for the whole run: the splash, authentication and dashboard screens are swapped
+    # inside it. Schema migrations, the legacy database merge and the heavy imports run behind
+    # the splash screen (services.startup_service), so no window waits on them here
+    open_splash_screen().mainloop()
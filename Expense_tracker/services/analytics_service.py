@@ -0,0 +1,183 @@
+import sqlite3
+import numpy as np
+from database.db import db_connection
+from services.category_service import category_names
+from services.rollup_service import UNCATEGORIZED
+from utils.helpers import to_iso_date
+from utils.cache import cached_read
+
+# Columnar queries: integer amounts, epoch days (1970-01-01 is Julian day 2440587.5) and an
+# integer category code. Expense categories are already integer keys (0 when uncategorized);
+# income sources are dictionary-encoded in SQL ({codes} becomes "WHEN ? THEN 0 WHEN ? THEN 1 ..."
+# over the labels).
+COLUMNAR_QUERIES = {
+    "expense": '''
+        SELECT amount_minor,
+               CAST(julianday(date) - 2440587.5 AS INTEGER),
+               COALESCE(category_id, 0)
+        FROM Expense
+        WHERE user_id = ? AND date >= ? AND date < ?
+    ''',
+    "income": '''
+        SELECT amount_minor,
+               CAST(julianday(date) - 2440587.5 AS INTEGER),
+               CASE COALESCE(source, '') {codes} END
+        FROM Income
+        WHERE user_id = ? AND date >= ? AND date < ?
+    ''',
+}
+
+# The income labels come from the monthly rollup, which is tiny next to the ledger: every
+# source used in the months the range touches, a superset of the sources in the range itself.
+SOURCE_LABELS_SQL = '''
+    SELECT DISTINCT category
+    FROM MonthlyRollup
+    WHERE user_id = ? AND kind = 'income' AND month >= substr(?, 1, 7) AND month <= substr(?, 1, 7)
+    ORDER BY category
+'''
+
+# Record layout the cursor rows are read into
+_ROW_DTYPE = np.dtype([("amount_minor", np.int64), ("day", np.int64), ("category", np.int32)])
+
+
+def _empty_columns():
+    return {
+        "amount_minor": np.zeros(0, dtype=np.int64),
+        "date": np.zeros(0, dtype="datetime64[D]"),
+        "category": np.zeros(0, dtype=np.int32),
+        "categories": [],
+    }
+
+
+def fetch_columns(user_id, kind="expense", start_date=None, end_date=None):
+    """
+    Fetch a user's expenses or incomes as NumPy columns, read straight from the cursor
+    without building a Python object per row.
+
+    Args:
+        user_id (int): The ID of the user.
+        kind (str): "expense" or "income" (categories are income sources for incomes).
+        start_date (str, optional): First day included (YYYY-MM-DD); defaults to all history.
+        end_date (str, optional): First day excluded (YYYY-MM-DD).
+
+    Returns:
+        dict: "amount_minor" (int64 array), "date" (datetime64[D] array), "category"
+              (int32 array of codes into "categories") and "categories" (list of labels
+              indexed by code, possibly including some without rows in the range).
+              Empty columns on error.
+    """
+    try:
+        start = to_iso_date(start_date) if start_date else "0000-01-01"
+        end = to_iso_date(end_date) if end_date else "9999-12-31"
+        rows_sql = COLUMNAR_QUERIES[kind]
+        with db_connection(readonly=True) as conn:
+            conn.execute("BEGIN")  # Read the labels and the rows they encode from the same snapshot
+            try:
+                cursor = conn.cursor()
+                cursor.row_factory = None  # Plain tuples, which np.fromiter can unpack into records
+                if kind == "expense":
+                    labels = None  # The codes are category IDs, named from the category cache below
+                    rows = np.fromiter(cursor.execute(rows_sql, (user_id, start, end)), dtype=_ROW_DTYPE)
+                else:
+                    labels = [row[0] for row in conn.execute(SOURCE_LABELS_SQL, (user_id, start, end))]
+                    if not labels:
+                        return _empty_columns()
+                    codes = " ".join(f"WHEN ? THEN {code}" for code in range(len(labels)))
+                    rows = np.fromiter(
+                        cursor.execute(rows_sql.format(codes=codes), (*labels, user_id, start, end)), dtype=_ROW_DTYPE
+                    )
+            finally:
+                conn.rollback()
+        if labels is None:
+            top = int(rows["category"].max()) if len(rows) else 0
+            names = category_names()
+            if top > max(names, default=0):
+                names = category_names(refresh=True)  # Categories added by another process
+            labels = [names.get(code) for code in range(top + 1)]
+        return {
+            "amount_minor": rows["amount_minor"],
+            "date": rows["day"].astype("datetime64[D]"),
+            "category": rows["category"],
+            "categories": [label or UNCATEGORIZED for label in labels],
+        }
+    except sqlite3.Error as e:
+        print(f"Database error fetching {kind} columns: {e}")
+        return _empty_columns()
+    except (KeyError, ValueError) as e:
+        print(f"Value error fetching {kind} columns: {e}")
+        return _empty_columns()
+
+
+def _group_totals(codes, amounts, size):
+    """Sum amounts and count rows per integer code with two bincount passes."""
+    # float64 weights are exact for sums below 2**53 minor units
+    totals = np.bincount(codes, weights=amounts, minlength=size).astype(np.int64)
+    counts = np.bincount(codes, minlength=size)
+    return totals, counts
+
+
+def category_breakdown(columns):
+    """
+    Total the columns per category (or income source).
+
+    Args:
+        columns (dict): The result of fetch_columns.
+
+    Returns:
+        dict: "category" (list of labels), "total_minor" and "count" (int64 arrays),
+              ordered by category.
+    """
+    labels = columns["categories"]
+    totals, counts = _group_totals(columns["category"], columns["amount_minor"], len(labels))
+    # The labels may include categories with no rows in the range
+    order = sorted(np.flatnonzero(counts).tolist(), key=labels.__getitem__)
+    return {
+        "category": [labels[code] for code in order],
+        "total_minor": totals[order],
+        "count": counts[order],
+    }
+
+
+def period_breakdown(columns, unit="M"):
+    """
+    Total the columns per calendar period.
+
+    Args:
+        columns (dict): The result of fetch_columns.
+        unit (str): NumPy datetime unit of the periods: "D" (day), "M" (month) or "Y" (year).
+
+    Returns:
+        dict: "period" (datetime64 array of the periods with transactions, in order),
+              "total_minor" and "count" (int64 arrays).
+    """
+    periods, codes = np.unique(columns["date"].astype(f"datetime64[{unit}]"), return_inverse=True)
+    totals, counts = _group_totals(codes, columns["amount_minor"], len(periods))
+    return {"period": periods, "total_minor": totals, "count": counts}
+
+
+@cached_read
+def get_range_analytics(user_id, start_date, end_date):
+    """
+    Totals, category and monthly breakdowns of a user's expenses and incomes over any date
+    range. Month-aligned figures are cheaper from services.rollup_service; this covers
+    ranges such as "the last 90 days" that do not line up with whole months.
+
+    Args:
+        user_id (int): The ID of the user.
+        start_date (str): First day included (YYYY-MM-DD).
+        end_date (str): First day excluded (YYYY-MM-DD).
+
+    Returns:
+        dict: For "expense" and "income": total_minor, count, by_category (see
+              category_breakdown) and by_month (see period_breakdown).
+    """
+    analytics = {}
+    for kind in ("expense", "income"):
+        columns = fetch_columns(user_id, kind, start_date, end_date)
+        analytics[kind] = {
+            "total_minor": int(columns["amount_minor"].sum()),
+            "count": len(columns["amount_minor"]),
+            "by_category": category_breakdown(columns),
+            "by_month": period_breakdown(columns, "M"),
+        }
+    return analytics
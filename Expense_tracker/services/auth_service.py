@@ -3,10 +3,7 @@ from pathlib import Path
 import logging
 
 # Import the get_db_connection function from the database module
-from database.db import get_db_connection
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+from database.db import db_connection
 
 
 class AuthService:
@@ -45,22 +42,24 @@ class AuthService:
                 logging.warning("Registration failed: Invalid user type.")
                 return False
 
-            conn = get_db_connection()
-            cursor = conn.cursor()
+            with db_connection() as conn:
+                cursor = conn.cursor()
 
-            # Check if the username or email already exists
-            cursor.execute("SELECT id FROM User WHERE username = ? OR email = ?", (username, email))
-            if cursor.fetchone():
-                logging.info(f"Registration failed: Username '{username}' or email '{email}' already exists.")
-                return False
+                # Check if the username or email already exists
+                cursor.execute("SELECT id FROM User WHERE username = ? OR email = ?", (username, email))
+                if cursor.fetchone():
+                    logging.info(f"Registration failed: Username '{username}' or email '{email}' already exists.")
+                    return False
+
+                # Insert the new user into the database
+                cursor.execute('''
+                    INSERT INTO User (username, email, password, user_type, is_staff, is_superuser)
+                    VALUES (?, ?, ?, ?, 0, 0)
+                ''', (username, email, password, user_type))
 
-            # Insert the new user into the database
-            cursor.execute('''
-                INSERT INTO User (username, email, password, user_type, is_staff, is_superuser)
-                VALUES (?, ?, ?, ?, 0, 0)
-            ''', (username, email, password, user_type))
+                # Every user starts with a default profile
+                cursor.execute("INSERT INTO UserProfile (user_id) VALUES (?)", (cursor.lastrowid,))
 
-            conn.commit()
             logging.info(f"User '{username}' registered successfully with user type '{user_type}'.")
             return True
         except sqlite3.IntegrityError as ie:
@@ -69,9 +68,6 @@ class AuthService:
         except sqlite3.Error as e:
             logging.error(f"Database error during registration: {e}")
             return False
-        finally:
-            if conn:
-                conn.close()
 
     def login_user(self, username, password):
         """
@@ -84,13 +80,12 @@ class AuthService:
             None: If login fails.
         """
         try:
-            conn = get_db_connection()
-            conn.row_factory = sqlite3.Row  # Enable accessing columns by name
-            cursor = conn.cursor()
+            with db_connection() as conn:
+                cursor = conn.cursor()
 
-            # Query the database for the user with matching credentials
-            cursor.execute("SELECT id, username, email, user_type FROM User WHERE username = ? AND password = ?", (username, password))
-            user = cursor.fetchone()
+                # Query the database for the user with matching credentials
+                cursor.execute("SELECT id, username, email, user_type FROM User WHERE username = ? AND password = ?", (username, password))
+                user = cursor.fetchone()
 
             if user:
                 logging.info(f"User '{username}' logged in successfully.")
@@ -101,9 +96,6 @@ class AuthService:
         except sqlite3.Error as e:
             logging.error(f"Database error during login: {e}")
             return None
-        finally:
-            if conn:
-                conn.close()
 
     def reset_password(self, username, email, new_password):
         """
@@ -128,26 +120,23 @@ class AuthService:
                 logging.warning("Password reset failed: Invalid email format.")
                 return False
 
-            conn = get_db_connection()
-            cursor = conn.cursor()
+            with db_connection() as conn:
+                cursor = conn.cursor()
 
-            # Validate the user's existence
-            cursor.execute("SELECT id FROM User WHERE username = ? AND email = ?", (username, email))
-            if not cursor.fetchone():
-                logging.info(f"Password reset failed: No user found with username '{username}' and email '{email}'.")
-                return False
+                # Validate the user's existence
+                cursor.execute("SELECT id FROM User WHERE username = ? AND email = ?", (username, email))
+                if not cursor.fetchone():
+                    logging.info(f"Password reset failed: No user found with username '{username}' and email '{email}'.")
+                    return False
+
+                # Update the password
+                cursor.execute("UPDATE User SET password = ? WHERE username = ? AND email = ?", (new_password, username, email))
 
-            # Update the password
-            cursor.execute("UPDATE User SET password = ? WHERE username = ? AND email = ?", (new_password, username, email))
-            conn.commit()
             logging.info(f"Password for user '{username}' reset successfully.")
             return True
         except sqlite3.Error as e:
             logging.error(f"Database error during password reset: {e}")
             return False
-        finally:
-            if conn:
-                conn.close()
 
 
 # Export the functions for use in the AuthWindow
@@ -1,13 +1,16 @@
 import sqlite3
+import logging
+import threading
+from database.db import db_connection, run_in_transaction
+from database.records import Category
+from utils.events import publish, CATEGORIES_CHANGED
 
-# Database configuration
-DATABASE_FILE = 'expense_tracker.db'
-
-def get_db_connection():
-    """Create and return a SQLite database connection."""
-    conn = sqlite3.connect(DATABASE_FILE)
-    conn.row_factory = sqlite3.Row  # Enable dictionary-style row access
-    return conn
+# In-process cache of the categories: (records ordered by name, {category ID: name}).
+# Names never change once a category exists, so the cache only has to grow: it is
+# reloaded after add_category, and whenever an ID turns up that it does not know yet
+# (a category added by another process).
+_category_cache = None
+_category_lock = threading.Lock()
 
 def add_category(name, icon):
     """
@@ -18,8 +21,6 @@ def add_category(name, icon):
     Returns:
         bool: True if the category was added successfully, False otherwise.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
     try:
         # Validate inputs
         if not isinstance(name, str) or not name.strip():
@@ -28,41 +29,143 @@ def add_category(name, icon):
             raise ValueError("Icon must be a string.")
 
         # Insert the category into the database
-        cursor.execute('''
-            INSERT INTO Category (name, icon)
-            VALUES (?, ?)
-        ''', (name.strip(), icon.strip()))
-        conn.commit()
+        with db_connection() as conn:
+            conn.execute('''
+                INSERT INTO Category (name, icon)
+                VALUES (?, ?)
+            ''', (name.strip(), icon.strip()))
+        invalidate_categories()
+        publish(CATEGORIES_CHANGED)
         return True
     except sqlite3.IntegrityError:
-        print(f"Error adding category: A category with the name '{name}' already exists.")
+        logging.warning(f"Error adding category: A category with the name '{name}' already exists.")
         return False
     except sqlite3.Error as e:
-        print(f"Database error adding category: {str(e)}")
+        logging.error(f"Database error adding category: {str(e)}")
         return False
     except ValueError as ve:
-        print(f"Value error adding category: {str(ve)}")
+        logging.error(f"Value error adding category: {str(ve)}")
         return False
-    finally:
-        conn.close()
 
-def get_categories():
+def _load_categories(refresh=False):
+    """Return the category cache, reading the Category table on first use or when refresh is set."""
+    global _category_cache
+    cache = _category_cache
+    if cache is None or refresh:
+        with _category_lock:
+            try:
+                with db_connection(readonly=True) as conn:
+                    cursor = conn.cursor()
+                    cursor.execute('''
+                        SELECT id, name, icon
+                        FROM Category
+                        ORDER BY name ASC
+                    ''')
+                    records = [Category(*row) for row in cursor.fetchall()]
+            except sqlite3.Error as e:
+                logging.error(f"Database error retrieving categories: {str(e)}")
+                return _category_cache or ([], {})
+            cache = _category_cache = (records, {record.id: record.name for record in records})
+    return cache
+
+
+def get_categories(refresh=False):
     """
-    Retrieve all categories from the database.
+    Retrieve all categories, from the in-process cache after the first call.
+    Args:
+        refresh (bool): Read the Category table again first.
     Returns:
-        list: A list of category dictionaries with id, name, and icon.
+        list: A list of Category records with id, name, and icon, ordered by name.
     """
-    conn = get_db_connection()
-    try:
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT id, name, icon
-            FROM Category
-            ORDER BY name ASC
-        ''')
-        return [dict(row) for row in cursor.fetchall()]  # Convert rows to dictionaries
-    except sqlite3.Error as e:
-        print(f"Database error retrieving categories: {str(e)}")
-        return []
-    finally:
-        conn.close()
\ No newline at end of file
+    return list(_load_categories(refresh)[0])
+
+
+def invalidate_categories():
+    """Drop the cached categories; the next lookup reloads them."""
+    global _category_cache
+    _category_cache = None
+
+
+def category_names(refresh=False):
+    """
+    Return the cached {category ID: name} map, loading it on first use.
+
+    Args:
+        refresh (bool): Reload the map from the database first.
+    Returns:
+        dict: Category names by ID (empty if the categories cannot be read).
+    """
+    return _load_categories(refresh)[1]
+
+
+def category_name(category_id):
+    """
+    Look up the name of a category ID in the cache.
+
+    Args:
+        category_id (int): The ID of the category, or None.
+    Returns:
+        str: The category name, or None for no (or an unknown) category.
+    """
+    if category_id is None:
+        return None
+    name = category_names().get(category_id)
+    if name is None:
+        name = category_names(refresh=True).get(category_id)
+    return name
+
+
+def category_ids(names, create=False):
+    """
+    Map category names to IDs, optionally creating the missing categories.
+
+    Args:
+        names (iterable): Category names; surrounding spaces are ignored and empty names skipped.
+        create (bool): Add every name that has no category yet (without an icon).
+    Returns:
+        dict: Category IDs by the names as given; names without a category are left out.
+    Raises:
+        sqlite3.Error: If the missing categories could not be created.
+    """
+    wanted = {name: name.strip() for name in names if name and name.strip()}
+    ids = {name: category_id for category_id, name in category_names().items()}
+    if not all(name in ids for name in wanted.values()):
+        if create:
+            ids_by_given, new_categories = run_in_transaction(lambda conn: add_missing_categories(conn, wanted))
+            if new_categories:
+                categories_added()
+            return ids_by_given
+        ids = {name: category_id for category_id, name in category_names(refresh=True).items()}
+    return {given: ids[name] for given, name in wanted.items() if name in ids}
+
+
+def add_missing_categories(conn, names):
+    """
+    Map category names to IDs within the caller's write transaction, adding the names
+    that have no category yet (without an icon), so the new categories commit or roll
+    back together with the rows that use them. The category cache is not touched: after
+    the transaction has committed, a caller that added categories calls categories_added().
+
+    Args:
+        conn (sqlite3.Connection): A read-write connection; the inserts join its transaction.
+        names (iterable): Category names; surrounding spaces are ignored and empty names skipped.
+    Returns:
+        tuple: (dict of category IDs by the names as given, bool: True if names were added).
+    Raises:
+        sqlite3.Error: If the missing categories could not be created.
+    """
+    wanted = {name: name.strip() for name in names if name and name.strip()}
+    ids = {name: category_id for category_id, name in category_names().items()}
+    missing = sorted({name for name in wanted.values() if name not in ids})
+    if missing:
+        conn.executemany("INSERT OR IGNORE INTO Category (name) VALUES (?)", [(name,) for name in missing])
+        ids.update((name, category_id) for category_id, name in conn.execute(
+            f"SELECT id, name FROM Category WHERE name IN ({', '.join('?' * len(missing))})", missing
+        ))
+    return {given: ids[name] for given, name in wanted.items()}, bool(missing)
+
+
+def categories_added():
+    """Reload the category cache and notify subscribers once added categories have committed."""
+    invalidate_categories()
+    publish(CATEGORIES_CHANGED)
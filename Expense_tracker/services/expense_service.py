@@ -1,102 +1,52 @@
 import sqlite3
 import logging
-from pathlib import Path
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+from database.db import db_connection, run_in_transaction, insert_chunked, iter_query
+from database.records import Expense
+from services.category_service import category_name, category_ids, add_missing_categories, categories_added
+from utils.helpers import to_iso_date, keyset_clause
+from utils.money import to_minor, from_minor, currency_exponent
+from utils.cache import cached_read, bump_data_version
 
-# Define the database path
-DB_PATH = Path("finance_tracker.db")
+# Rows per executemany call in the bulk insert functions
+BULK_CHUNK_SIZE = 5000
 
+# Columns filled by add_expenses_bulk, in the order _expense_row returns them
+EXPENSE_COLUMNS = ("user_id", "title", "amount_minor", "currency", "currency_exponent", "category_id", "date")
 
-def get_db_connection():
-    """
-    Create and return a database connection.
-    Ensures the database file exists before connecting.
-    """
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)  # Ensure the directory exists
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Access columns by name
-    return conn
+# Columns an Expense record is built from (before its category name), as returned by the writes
+EXPENSE_RECORD_COLUMNS = "id, user_id, title, amount_minor, currency, currency_exponent, category_id, date"
+
+# Default number of expenses per page in get_expenses_page
+PAGE_SIZE = 50
 
 
-def initialize_db():
+def iter_expenses(user_id, batch_size=None):
     """
-    Initialize the database with required tables.
-    Ensures tables are created only if they don't exist.
+    Stream all expenses of a specific user, oldest first, without building a list.
+    Rows are fetched in batches and the connection is held only while iterating.
+    Args:
+        user_id (int): The ID of the user.
+        batch_size (int, optional): Rows per fetch; defaults to database.db.ITER_BATCH_SIZE.
+    Yields:
+        Expense: One expense record at a time. A database error is logged and ends the stream.
     """
+    # Currencies and dates repeat from row to row; keep one string object for each value
+    # (category names already come from the shared category cache)
+    shared = {}.setdefault
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Create User table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS User (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                email TEXT UNIQUE NOT NULL CHECK(email LIKE '%@%.%'),
-                password TEXT NOT NULL,
-                user_type TEXT NOT NULL CHECK(user_type IN ('ADMIN', 'USER')),
-                is_staff INTEGER DEFAULT 0,
-                is_superuser INTEGER DEFAULT 0
-            )
-        ''')
-
-        # Create Category table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Category (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                icon TEXT
-            )
-        ''')
-
-        # Create Expense table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Expense (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                title TEXT NOT NULL,
-                amount REAL NOT NULL,
-                currency TEXT NOT NULL,
-                category TEXT,
-                date TEXT NOT NULL,
-                description TEXT,
-                receipt TEXT,
-                FOREIGN KEY (user_id) REFERENCES User(id)
-            )
-        ''')
-
-        # Create Income table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS Income (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                source TEXT NOT NULL,
-                amount REAL NOT NULL,
-                date TEXT NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES User(id)
-            )
-        ''')
-
-        # Add default categories
-        default_categories = [
-            ("Food", "food_icon.png"),
-            ("Transport", "transport_icon.png"),
-            ("Entertainment", "entertainment_icon.png"),
-        ]
-        cursor.executemany('''
-            INSERT OR IGNORE INTO Category (name, icon) VALUES (?, ?)
-        ''', default_categories)
-
-        # Commit changes
-        conn.commit()
-        logging.info("Database initialized successfully.")
+        for expense_id, user_id, title, amount_minor, currency, exponent, category_id, date in iter_query('''
+            SELECT id, user_id, title, amount_minor, currency, currency_exponent, category_id, date
+            FROM Expense
+            WHERE user_id = ?
+            ORDER BY date, id
+        ''', (user_id,), batch_size):
+            yield Expense(expense_id, user_id, title, amount_minor, shared(currency, currency),
+                          exponent, category_id, shared(date, date), category_name(category_id))
+    except sqlite3.OperationalError:
+        logging.warning("Expense table does not exist. Please initialize the database.")
     except sqlite3.Error as e:
-        logging.error(f"Error initializing database: {e}")
-    finally:
-        if conn:
-            conn.close()
+        logging.error(f"Database error retrieving expenses: {e}")
 
 
 def get_expenses(user_id):
@@ -105,38 +55,154 @@ def get_expenses(user_id):
     Args:
         user_id (int): The ID of the user.
     Returns:
-        list: A list of expense dictionaries for the specified user.
+        list: A list of Expense records for the specified user, oldest first.
+    """
+    return list(iter_expenses(user_id))
+
+
+def get_expenses_page(user_id, cursor=None, page_size=PAGE_SIZE, descending=True, category=None,
+                      start_date=None, end_date=None, min_amount=None, max_amount=None):
+    """
+    Retrieve one page of a user's expenses ordered by (date, id).
+    Pages are found by seeking to the cursor (keyset pagination) rather than with
+    OFFSET, so every page costs the same however deep into the history it is.
+    Args:
+        user_id (int): The ID of the user.
+        cursor (tuple, optional): The next_cursor returned with the previous page; None for the first page.
+        page_size (int): Maximum number of expenses on the page.
+        descending (bool): Newest first if True, oldest first otherwise.
+        category (str, optional): Only expenses in this category.
+        start_date (str, optional): Only expenses on or after this date (YYYY-MM-DD).
+        end_date (str, optional): Only expenses before this date (YYYY-MM-DD).
+        min_amount (float, optional): Only expenses of at least this amount.
+        max_amount (float, optional): Only expenses of at most this amount.
+    Returns:
+        tuple: (list of Expense records, next_cursor); next_cursor is None on the last page.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    conditions, params = ["user_id = ?"], [user_id]
     try:
-        cursor.execute('''
-            SELECT id, user_id, title, amount, currency, category, date
-            FROM Expense
-            WHERE user_id = ?
-        ''', (user_id,))
-        rows = cursor.fetchall()
-        expenses = [
-            {
-                "id": row["id"],
-                "user_id": row["user_id"],
-                "title": row["title"],
-                "amount": row["amount"],
-                "currency": row["currency"],
-                "category": row["category"],
-                "date": row["date"]
-            }
-            for row in rows
-        ]
-        return expenses
+        if category is not None:
+            category_id = category_ids([category]).get(category)
+            if category_id is None:
+                return [], None  # No such category, so no expenses in it
+            conditions.append("category_id = ?")
+            params.append(category_id)
+        if start_date is not None:
+            conditions.append("date >= ?")
+            params.append(to_iso_date(start_date))
+        if end_date is not None:
+            conditions.append("date < ?")
+            params.append(to_iso_date(end_date))
+        if min_amount is not None:
+            conditions.append("amount_minor >= ?")
+            params.append(to_minor(min_amount))
+        if max_amount is not None:
+            conditions.append("amount_minor <= ?")
+            params.append(to_minor(max_amount))
+        keyset, keyset_params, order_by = keyset_clause(cursor, descending)
+        conditions.append(keyset)
+        params.extend(keyset_params)
+
+        with db_connection(readonly=True) as conn:
+            # One extra row tells whether another page follows
+            rows = conn.execute(f'''
+                SELECT id, user_id, title, amount_minor, currency, currency_exponent, category_id, date
+                FROM Expense
+                WHERE {" AND ".join(conditions)}
+                ORDER BY {order_by}
+                LIMIT ?
+            ''', (*params, page_size + 1)).fetchall()
+        expenses = [Expense(*row, category_name(row[6])) for row in rows[:page_size]]
+        next_cursor = (expenses[-1]["date"], expenses[-1]["id"]) if len(rows) > page_size else None
+        return expenses, next_cursor
     except sqlite3.OperationalError:
         logging.warning("Expense table does not exist. Please initialize the database.")
-        return []
+        return [], None
     except sqlite3.Error as e:
         logging.error(f"Database error retrieving expenses: {e}")
-        return []
-    finally:
-        conn.close()
+        return [], None
+    except ValueError as ve:
+        logging.error(f"Value error retrieving expenses: {ve}")
+        return [], None
+
+
+def _expense_row(user_id, title, amount, currency, category, date):
+    """
+    Validate one expense and convert it to the column values stored in the Expense table,
+    except that the category is still a name (add_expenses_bulk maps it to category_id).
+    """
+    if not title:
+        raise ValueError("Expense title is required.")
+    if category is not None and not isinstance(category, str):
+        raise ValueError("Expense category must be a category name.")
+    exponent = currency_exponent(currency)
+    return (user_id, title, to_minor(amount, exponent), currency, exponent, category, to_iso_date(date))
+
+
+def _insert_expenses(expenses, chunk_size):
+    """
+    Validate and insert expenses as add_expenses_bulk does.
+    Returns:
+        list: One (result, row) pair per input row, in input order: the result dictionary
+              add_expenses_bulk returns, and for an added row its stored column values in
+              EXPENSE_COLUMNS order (None for a row that was not added).
+    """
+    outcomes, pending = [], []
+    for expense in expenses:
+        result = {"ok": False, "id": None, "error": None}
+        outcomes.append((result, None))
+        try:
+            pending.append((len(outcomes) - 1, _expense_row(**expense)))
+        except (TypeError, ValueError) as ve:
+            result["error"] = str(ve)
+    if not pending:
+        return outcomes
+
+    # Validation happens before the transaction, so the write lock is held only for the inserts
+    rows = [params for _, params in pending]
+    names = {row[5] for row in rows if row[5]}
+
+    def insert(conn):
+        # All category names are resolved in one lookup; the categories that are new are
+        # created in the same transaction as the expenses
+        conn.execute("BEGIN IMMEDIATE")
+        ids_by_name, new_categories = add_missing_categories(conn, names)
+        converted = [(*row[:5], ids_by_name.get(row[5]), row[6]) for row in rows]
+        return converted, new_categories, insert_chunked(conn, "Expense", EXPENSE_COLUMNS, converted, chunk_size)
+
+    try:
+        rows, new_categories, ids = run_in_transaction(insert)
+    except sqlite3.Error as e:
+        logging.error(f"Database error adding expenses: {e}")
+        for index, _ in pending:
+            outcomes[index][0]["error"] = str(e)
+        return outcomes
+    if new_categories:
+        categories_added()
+    bump_data_version(*{row[0] for row in rows})
+    for (index, _), row, expense_id in zip(pending, rows, ids):
+        result = outcomes[index][0]
+        result.update(ok=True, id=expense_id)
+        outcomes[index] = (result, row)
+    return outcomes
+
+
+def add_expenses_bulk(expenses, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Add many expense entries in a single write transaction.
+    Rows are validated one by one; valid rows are inserted with executemany
+    in chunks of chunk_size, and the transaction is committed once at the end.
+    Args:
+        expenses (iterable): Dictionaries with the same keys as add_expense's arguments
+            (user_id, title, amount, currency, category, date).
+        chunk_size (int): Number of rows passed to each executemany call.
+    Returns:
+        list: One result dictionary per input row, in input order, with keys
+              "ok" (bool), "id" (int or None) and "error" (str or None).
+              A database that stays busy, or any other database error, rolls back
+              the whole batch and fails every valid row.
+    """
+    return [result for result, _ in _insert_expenses(expenses, chunk_size)]
 
 
 def add_expense(user_id, title, amount, currency, category, date):
@@ -150,25 +216,18 @@ def add_expense(user_id, title, amount, currency, category, date):
         category (str): The category of the expense.
         date (str): The date of the expense (YYYY-MM-DD).
     Returns:
-        bool: True if the expense was added successfully, False otherwise.
+        Expense: The added expense, for views to insert without re-reading their lists;
+                 None if it could not be added.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute('''
-            INSERT INTO Expense (user_id, title, amount, currency, category, date)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (user_id, title, amount, currency, category, date))
-        conn.commit()
-        return True
-    except sqlite3.OperationalError:
-        logging.warning("Expense table does not exist. Please initialize the database.")
-        return False
-    except sqlite3.Error as e:
-        logging.error(f"Database error adding expense: {e}")
-        return False
-    finally:
-        conn.close()
+    (result, row), = _insert_expenses([{
+        "user_id": user_id, "title": title, "amount": amount,
+        "currency": currency, "category": category, "date": date,
+    }], BULK_CHUNK_SIZE)
+    if not result["ok"]:
+        logging.error(f"Error adding expense: {result['error']}")
+        return None
+    # The record is built from the values the insert stored
+    return Expense(result["id"], *row, category_name(row[5]))
 
 
 def update_expense(expense_id, title, amount, currency, category, date):
@@ -182,31 +241,40 @@ def update_expense(expense_id, title, amount, currency, category, date):
         category (str): The updated category of the expense.
         date (str): The updated date of the expense (YYYY-MM-DD).
     Returns:
-        bool: True if the expense was updated successfully, False otherwise.
+        Expense: The expense as updated, or None if it could not be updated.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
     try:
-        cursor.execute('''
-            UPDATE Expense
-            SET title = ?, amount = ?, currency = ?, category = ?, date = ?
-            WHERE id = ?
-        ''', (title, amount, currency, category, date, expense_id))
-        conn.commit()
-        if cursor.rowcount == 0:
-            raise ValueError("No expense found with the provided ID.")
-        return True
+        params = (title, to_minor(amount, currency_exponent(currency)), currency,
+                  currency_exponent(currency), to_iso_date(date), expense_id)
+
+        def update(conn):
+            # A new category is created in the same transaction as the update
+            ids_by_name, new_categories = add_missing_categories(conn, [category])
+            rows = conn.execute(f'''
+                UPDATE Expense
+                SET title = ?, amount_minor = ?, currency = ?, currency_exponent = ?, category_id = ?, date = ?
+                WHERE id = ?
+                RETURNING {EXPENSE_RECORD_COLUMNS}
+            ''', (*params[:4], ids_by_name.get(category), *params[4:])).fetchall()
+            if not rows:
+                raise ValueError("No expense found with the provided ID.")  # Rolls the category back
+            return rows, new_categories
+
+        rows, new_categories = run_in_transaction(update)
+        if new_categories:
+            categories_added()
+        expense = Expense(*rows[0], category_name(rows[0][6]))
+        bump_data_version(expense.user_id)
+        return expense
     except sqlite3.OperationalError:
         logging.warning("Expense table does not exist. Please initialize the database.")
-        return False
+        return None
     except sqlite3.Error as e:
         logging.error(f"Database error updating expense: {e}")
-        return False
+        return None
     except ValueError as ve:
         logging.error(f"Value error updating expense: {ve}")
-        return False
-    finally:
-        conn.close()
+        return None
 
 
 def delete_expense(expense_id):
@@ -215,32 +283,80 @@ def delete_expense(expense_id):
     Args:
         expense_id (int): The ID of the expense to delete.
     Returns:
-        bool: True if the expense was deleted successfully, False otherwise.
+        Expense: The expense as it was before deletion, or None if it could not be deleted.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
     try:
-        cursor.execute('''
+        rows = run_in_transaction(lambda conn: conn.execute(f'''
             DELETE FROM Expense
             WHERE id = ?
-        ''', (expense_id,))
-        conn.commit()
-        if cursor.rowcount == 0:
+            RETURNING {EXPENSE_RECORD_COLUMNS}
+        ''', (expense_id,)).fetchall())
+        if not rows:
             raise ValueError("No expense found with the provided ID.")
-        return True
+        expense = Expense(*rows[0], category_name(rows[0][6]))
+        bump_data_version(expense.user_id)
+        return expense
     except sqlite3.OperationalError:
         logging.warning("Expense table does not exist. Please initialize the database.")
-        return False
+        return None
     except sqlite3.Error as e:
         logging.error(f"Database error deleting expense: {e}")
-        return False
+        return None
     except ValueError as ve:
         logging.error(f"Value error deleting expense: {ve}")
-        return False
-    finally:
-        conn.close()
+        return None
 
 
-# Ensure the database is initialized when this module is imported
-if not DB_PATH.exists():  # Only initialize if the database file doesn't exist
-    initialize_db()
\ No newline at end of file
+def iter_all_expenses(batch_size=None):
+    """
+    Stream the expenses of every user, with the owner's username (admin view).
+    Args:
+        batch_size (int, optional): Rows per fetch; defaults to database.db.ITER_BATCH_SIZE.
+    Yields:
+        dict: One expense dictionary at a time, newest first.
+    """
+    try:
+        for row in iter_query('''
+            SELECT e.id, e.user_id, u.username, e.title, e.amount_minor, e.currency_exponent,
+                   e.currency, e.category_id, e.date
+            FROM Expense e
+            LEFT JOIN User u ON u.id = e.user_id
+            ORDER BY e.date DESC, e.id DESC
+        ''', (), batch_size):
+            yield dict(row, category_name=category_name(row["category_id"]),
+                       amount=from_minor(row["amount_minor"], row["currency_exponent"]))
+    except sqlite3.Error as e:
+        logging.error(f"Database error retrieving all expenses: {e}")
+
+
+def get_all_expenses():
+    """
+    Retrieve the expenses of every user, with the owner's username (admin view).
+    Returns:
+        list: A list of expense dictionaries, newest first.
+    """
+    return list(iter_all_expenses())
+
+
+@cached_read
+def get_total_expenses(user_id=None):
+    """
+    Calculate the total expenses of one user, or of all users when user_id is None.
+    Read from the trigger-maintained UserTotals table, so the cost does not grow
+    with the number of expenses; the sums are exact integer minor units.
+    Args:
+        user_id (int, optional): The ID of the user.
+    Returns:
+        float: The total expense amount.
+    """
+    try:
+        with db_connection(readonly=True) as conn:
+            cursor = conn.cursor()
+            if user_id is None:
+                cursor.execute("SELECT COALESCE(SUM(expense_minor), 0) FROM UserTotals")
+            else:
+                cursor.execute("SELECT COALESCE(SUM(expense_minor), 0) FROM UserTotals WHERE user_id = ?", (user_id,))
+            return from_minor(cursor.fetchone()[0])
+    except sqlite3.Error as e:
+        logging.error(f"Database error calculating total expenses: {e}")
+        return 0.0
@@ -1,8 +1,91 @@
 import sqlite3
-from database.db import get_db_connection
+import logging
+from database.db import db_connection, run_in_transaction, insert_chunked, iter_query
+from database.records import Income
+from utils.helpers import to_iso_date, keyset_clause
+from utils.money import to_minor, from_minor, DEFAULT_EXPONENT
+from utils.cache import cached_read, bump_data_version
 
 
-def add_income(user_id: int, source: str, amount: float, date: str) -> bool:
+# Rows per executemany call in add_incomes_bulk
+BULK_CHUNK_SIZE = 5000
+
+# Columns filled by add_incomes_bulk, in the order _income_row returns them
+INCOME_COLUMNS = ("user_id", "source", "amount_minor", "date")
+
+# Columns an Income record is built from, as returned by the writes
+INCOME_RECORD_COLUMNS = "id, source, amount_minor, currency_exponent, date"
+
+# Default number of incomes per page in get_incomes_page
+PAGE_SIZE = 50
+
+
+def _income_row(user_id: int, source: str, amount: float, date: str) -> tuple:
+    """Validate one income and convert it to the column values stored in the Income table."""
+    if not source:
+        raise ValueError("Income source is required.")
+    return (user_id, source, to_minor(amount), to_iso_date(date))
+
+
+def _insert_incomes(incomes, chunk_size: int) -> list:
+    """
+    Validates and inserts incomes as add_incomes_bulk does.
+
+    Returns:
+        list: One (result, row) pair per input row, in input order: the result dictionary
+              add_incomes_bulk returns, and for an added row its stored column values in
+              INCOME_COLUMNS order (None for a row that was not added).
+    """
+    outcomes, pending = [], []
+    for income in incomes:
+        result = {"ok": False, "id": None, "error": None}
+        outcomes.append((result, None))
+        try:
+            pending.append((len(outcomes) - 1, _income_row(**income)))
+        except (TypeError, ValueError) as ve:
+            result["error"] = str(ve)
+    if not pending:
+        return outcomes
+
+    # Validation happens before the transaction, so the write lock is held only for the inserts
+    rows = [params for _, params in pending]
+    try:
+        ids = run_in_transaction(lambda conn: insert_chunked(conn, "Income", INCOME_COLUMNS, rows, chunk_size))
+    except sqlite3.Error as e:
+        logging.error(f"Database error adding incomes: {e}")
+        for index, _ in pending:
+            outcomes[index][0]["error"] = str(e)
+        return outcomes
+    bump_data_version(*{row[0] for row in rows})
+    for (index, row), income_id in zip(pending, ids):
+        result = outcomes[index][0]
+        result.update(ok=True, id=income_id)
+        outcomes[index] = (result, row)
+    return outcomes
+
+
+def add_incomes_bulk(incomes, chunk_size: int = BULK_CHUNK_SIZE) -> list:
+    """
+    Adds many income entries in a single write transaction.
+
+    Rows are validated one by one; valid rows are inserted with executemany
+    in chunks of chunk_size, and the transaction is committed once at the end.
+
+    Args:
+        incomes (iterable): Dictionaries with the same keys as add_income's arguments
+            (user_id, source, amount, date).
+        chunk_size (int): Number of rows passed to each executemany call.
+
+    Returns:
+        list: One result dictionary per input row, in input order, with keys
+              "ok" (bool), "id" (int or None) and "error" (str or None).
+              A database that stays busy, or any other database error, rolls back
+              the whole batch and fails every valid row.
+    """
+    return [result for result, _ in _insert_incomes(incomes, chunk_size)]
+
+
+def add_income(user_id: int, source: str, amount: float, date: str) -> Income:
     """
     Adds a new income entry to the database.
 
@@ -13,20 +96,40 @@ def add_income(user_id: int, source: str, amount: float, date: str) -> bool:
         date (str): The date of the income (YYYY-MM-DD).
 
     Returns:
-        bool: True if the income was added successfully, False otherwise.
+        Income: The added income, for views to insert without re-reading their lists;
+                None if it could not be added.
+    """
+    (result, row), = _insert_incomes([{"user_id": user_id, "source": source, "amount": amount, "date": date}],
+                                     BULK_CHUNK_SIZE)
+    if not result["ok"]:
+        logging.error(f"Error adding income: {result['error']}")
+        return None
+    _, source, amount_minor, date = row  # The values the insert stored
+    return Income(result["id"], source, amount_minor, DEFAULT_EXPONENT, date)
+
+
+def iter_incomes(user_id: int, batch_size: int = None):
     """
+    Streams all incomes of a specific user, oldest first, without building a list.
+    Rows are fetched in batches and the connection is held only while iterating.
+
+    Args:
+        user_id (int): The ID of the user.
+        batch_size (int, optional): Rows per fetch; defaults to database.db.ITER_BATCH_SIZE.
+
+    Yields:
+        Income: One income record at a time. A database error is reported and ends the stream.
+    """
+    # Sources and dates repeat from row to row; keep one string object for each value
+    shared = {}.setdefault
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO Income (user_id, source, amount, date)
-                VALUES (?, ?, ?, ?)
-            """, (user_id, source, amount, date))
-            conn.commit()
-            return True
+        for income_id, source, amount_minor, exponent, date in iter_query(
+            "SELECT id, source, amount_minor, currency_exponent, date FROM Income WHERE user_id = ? ORDER BY date, id",
+            (user_id,), batch_size,
+        ):
+            yield Income(income_id, shared(source, source), amount_minor, exponent, shared(date, date))
     except sqlite3.Error as e:
-        print(f"Database error adding income: {e}")
-        return False
+        logging.error(f"Database error retrieving incomes: {e}")
 
 
 def get_incomes(user_id: int) -> list:
@@ -37,49 +140,135 @@ def get_incomes(user_id: int) -> list:
         user_id (int): The ID of the user.
 
     Returns:
-        list: A list of income dictionaries.
+        list: A list of Income records, oldest first.
+    """
+    return list(iter_incomes(user_id))
+
+
+def get_incomes_page(user_id: int, cursor: tuple = None, page_size: int = PAGE_SIZE, descending: bool = True,
+                     source: str = None, start_date: str = None, end_date: str = None,
+                     min_amount: float = None, max_amount: float = None) -> tuple:
+    """
+    Retrieves one page of a user's incomes ordered by (date, id).
+    Pages are found by seeking to the cursor (keyset pagination) rather than with
+    OFFSET, so every page costs the same however deep into the history it is.
+
+    Args:
+        user_id (int): The ID of the user.
+        cursor (tuple, optional): The next_cursor returned with the previous page; None for the first page.
+        page_size (int): Maximum number of incomes on the page.
+        descending (bool): Newest first if True, oldest first otherwise.
+        source (str, optional): Only incomes from this source.
+        start_date (str, optional): Only incomes on or after this date (YYYY-MM-DD).
+        end_date (str, optional): Only incomes before this date (YYYY-MM-DD).
+        min_amount (float, optional): Only incomes of at least this amount.
+        max_amount (float, optional): Only incomes of at most this amount.
+
+    Returns:
+        tuple: (list of Income records, next_cursor); next_cursor is None on the last page.
     """
+    conditions, params = ["user_id = ?"], [user_id]
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, source, amount, date FROM Income WHERE user_id = ?", (user_id,))
-            rows = cursor.fetchall()
-            return [
-                {
-                    "id": row[0],
-                    "source": row[1],
-                    "amount": row[2],
-                    "date": row[3],
-                }
-                for row in rows
-            ]
+        if source is not None:
+            conditions.append("source = ?")
+            params.append(source)
+        if start_date is not None:
+            conditions.append("date >= ?")
+            params.append(to_iso_date(start_date))
+        if end_date is not None:
+            conditions.append("date < ?")
+            params.append(to_iso_date(end_date))
+        if min_amount is not None:
+            conditions.append("amount_minor >= ?")
+            params.append(to_minor(min_amount))
+        if max_amount is not None:
+            conditions.append("amount_minor <= ?")
+            params.append(to_minor(max_amount))
+        keyset, keyset_params, order_by = keyset_clause(cursor, descending)
+        conditions.append(keyset)
+        params.extend(keyset_params)
+
+        with db_connection(readonly=True) as conn:
+            # One extra row tells whether another page follows
+            rows = conn.execute(f"""
+                SELECT id, source, amount_minor, currency_exponent, date
+                FROM Income
+                WHERE {" AND ".join(conditions)}
+                ORDER BY {order_by}
+                LIMIT ?
+            """, (*params, page_size + 1)).fetchall()
+        incomes = [Income(*row) for row in rows[:page_size]]
+        next_cursor = (incomes[-1]["date"], incomes[-1]["id"]) if len(rows) > page_size else None
+        return incomes, next_cursor
     except sqlite3.Error as e:
-        print(f"Database error retrieving incomes: {e}")
-        return []
+        logging.error(f"Database error retrieving incomes: {e}")
+        return [], None
+    except ValueError as ve:
+        logging.error(f"Value error retrieving incomes: {ve}")
+        return [], None
 
 
-def get_total_income(user_id: int) -> float:
+def iter_all_incomes(batch_size: int = None):
     """
-    Calculates the total income for a specific user.
+    Streams the incomes of every user, with the owner's username (admin view).
 
     Args:
-        user_id (int): The ID of the user.
+        batch_size (int, optional): Rows per fetch; defaults to database.db.ITER_BATCH_SIZE.
+
+    Yields:
+        dict: One income dictionary at a time, newest first.
+    """
+    try:
+        for row in iter_query("""
+            SELECT i.id, i.user_id, u.username, i.source AS category_name,
+                   i.amount_minor, i.currency_exponent, i.date
+            FROM Income i
+            LEFT JOIN User u ON u.id = i.user_id
+            ORDER BY i.date DESC, i.id DESC
+        """, (), batch_size):
+            yield dict(row, amount=from_minor(row["amount_minor"], row["currency_exponent"]))
+    except sqlite3.Error as e:
+        logging.error(f"Database error retrieving all incomes: {e}")
+
+
+def get_all_incomes() -> list:
+    """
+    Retrieves the incomes of every user, with the owner's username (admin view).
+
+    Returns:
+        list: A list of income dictionaries, newest first.
+    """
+    return list(iter_all_incomes())
+
+
+@cached_read
+def get_total_income(user_id: int = None) -> float:
+    """
+    Calculates the total income for a specific user, or for all users when user_id is None.
+    Read from the trigger-maintained UserTotals table, so the cost does not grow
+    with the number of incomes; the sums are exact integer minor units.
+
+    Args:
+        user_id (int, optional): The ID of the user.
 
     Returns:
         float: The total income amount.
     """
     try:
-        with get_db_connection() as conn:
+        with db_connection(readonly=True) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT COALESCE(SUM(amount), 0) FROM Income WHERE user_id = ?", (user_id,))
+            if user_id is None:
+                cursor.execute("SELECT COALESCE(SUM(income_minor), 0) FROM UserTotals")
+            else:
+                cursor.execute("SELECT COALESCE(SUM(income_minor), 0) FROM UserTotals WHERE user_id = ?", (user_id,))
             result = cursor.fetchone()[0]
-            return float(result)
+            return from_minor(result)
     except sqlite3.Error as e:
-        print(f"Database error calculating total income: {e}")
+        logging.error(f"Database error calculating total income: {e}")
         return 0.0
 
 
-def update_income(income_id: int, source: str, amount: float, date: str) -> bool:
+def update_income(income_id: int, source: str, amount: float, date: str) -> Income:
     """
     Updates an existing income entry in the database.
 
@@ -90,23 +279,28 @@ def update_income(income_id: int, source: str, amount: float, date: str) -> bool
         date (str): The updated date of the income (YYYY-MM-DD).
 
     Returns:
-        bool: True if the income was updated successfully, False otherwise.
+        Income: The income as updated, or None if it could not be updated.
     """
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE Income SET source = ?, amount = ?, date = ?
-                WHERE id = ?
-            """, (source, amount, date, income_id))
-            conn.commit()
-            return cursor.rowcount > 0
+        params = (source, to_minor(amount), to_iso_date(date), income_id)
+        rows = run_in_transaction(lambda conn: conn.execute(f"""
+            UPDATE Income SET source = ?, amount_minor = ?, date = ?
+            WHERE id = ?
+            RETURNING user_id, {INCOME_RECORD_COLUMNS}
+        """, params).fetchall())
+        if not rows:
+            return None
+        bump_data_version(rows[0][0])
+        return Income(*rows[0][1:])
     except sqlite3.Error as e:
-        print(f"Database error updating income: {e}")
-        return False
+        logging.error(f"Database error updating income: {e}")
+        return None
+    except ValueError as ve:
+        logging.error(f"Value error updating income: {ve}")
+        return None
 
 
-def delete_income(income_id: int) -> bool:
+def delete_income(income_id: int) -> Income:
     """
     Deletes an existing income entry from the database.
 
@@ -114,14 +308,16 @@ def delete_income(income_id: int) -> bool:
         income_id (int): The ID of the income to delete.
 
     Returns:
-        bool: True if the income was deleted successfully, False otherwise.
+        Income: The income as it was before deletion, or None if it could not be deleted.
     """
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM Income WHERE id = ?", (income_id,))
-            conn.commit()
-            return cursor.rowcount > 0
+        rows = run_in_transaction(lambda conn: conn.execute(
+            f"DELETE FROM Income WHERE id = ? RETURNING user_id, {INCOME_RECORD_COLUMNS}", (income_id,)
+        ).fetchall())
+        if not rows:
+            return None
+        bump_data_version(rows[0][0])
+        return Income(*rows[0][1:])
     except sqlite3.Error as e:
-        print(f"Database error deleting income: {e}")
-        return False
\ No newline at end of file
+        logging.error(f"Database error deleting income: {e}")
+        return None
\ No newline at end of file
@@ -1,5 +1,10 @@
 import sqlite3
-from database.db import get_db_connection
+from database.db import db_connection
+from database.records import Profile
+from utils.events import publish, PROFILE_CHANGED
+
+# Profiles already read in this process, by user ID (see get_profile and forget_profile)
+_profiles = {}
 
 def update_profile(user_id, currency, income, theme):
     """
@@ -14,8 +19,6 @@ def update_profile(user_id, currency, income, theme):
     Returns:
         bool: True if the profile was updated successfully, False otherwise.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
     try:
         # Validate inputs
         if not isinstance(user_id, int) or user_id <= 0:
@@ -28,18 +31,21 @@ def update_profile(user_id, currency, income, theme):
             raise ValueError("Theme must be either 'light' or 'dark'.")
 
         # Update the user's profile in the database
-        cursor.execute('''
-            UPDATE UserProfile
-            SET default_currency = ?, monthly_income = ?, theme_preference = ?
-            WHERE user_id = ?
-        ''', (currency.strip(), income, theme.strip(), user_id))
-        conn.commit()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE UserProfile
+                SET default_currency = ?, monthly_income = ?, theme_preference = ?
+                WHERE user_id = ?
+            ''', (currency.strip(), income, theme.strip(), user_id))
 
         # Check if any rows were affected
         if cursor.rowcount == 0:
             print(f"No profile found for user ID {user_id}.")
             return False
 
+        _profiles.pop(user_id, None)
+        publish(PROFILE_CHANGED, user_id)
         return True
     except sqlite3.IntegrityError as ie:
         print(f"Integrity error updating profile: {ie}")
@@ -50,43 +56,39 @@ def update_profile(user_id, currency, income, theme):
     except ValueError as ve:
         print(f"Value error updating profile: {ve}")
         return False
-    finally:
-        conn.close()
 
-def get_profile(user_id):
+def get_profile(user_id, refresh=False):
     """
-    Retrieve the user's profile from the database.
+    Retrieve the user's profile, from the in-process cache after the first call.
+    update_profile drops the cached copy, so the next call reads the new values.
 
     Args:
         user_id (int): The ID of the user.
+        refresh (bool): Read the UserProfile table again first.
 
     Returns:
-        dict: A dictionary containing the user's profile details, or None if no profile exists.
+        Profile: A record (dictionary-compatible) with the user's profile details, or None if no profile exists.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
     try:
         # Validate input
         if not isinstance(user_id, int) or user_id <= 0:
             raise ValueError("User ID must be a positive integer.")
+        if not refresh and user_id in _profiles:
+            return _profiles[user_id]
 
         # Query the database for the user's profile
-        cursor.execute('''
-            SELECT id, user_id, default_currency, monthly_income, theme_preference
-            FROM UserProfile
-            WHERE user_id = ?
-        ''', (user_id,))
-        row = cursor.fetchone()
+        with db_connection(readonly=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, user_id, default_currency, monthly_income, theme_preference
+                FROM UserProfile
+                WHERE user_id = ?
+            ''', (user_id,))
+            row = cursor.fetchone()
 
-        # Convert the row to a dictionary if it exists
         if row:
-            return {
-                "id": row[0],
-                "user_id": row[1],
-                "default_currency": row[2],
-                "monthly_income": row[3],
-                "theme_preference": row[4],
-            }
+            _profiles[user_id] = Profile(*row)
+            return _profiles[user_id]
         else:
             print(f"No profile found for user ID {user_id}.")
             return None
@@ -96,5 +98,7 @@ def get_profile(user_id):
     except ValueError as ve:
         print(f"Value error retrieving profile: {ve}")
         return None
-    finally:
-        conn.close()
\ No newline at end of file
+
+def forget_profile(user_id):
+    """Drop a user's cached profile, e.g. when their session ends."""
+    _profiles.pop(user_id, None)
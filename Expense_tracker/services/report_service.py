@@ -1,5 +1,101 @@
 import sqlite3
-from database.db import get_db_connection
+from database.db import db_connection, iter_query
+from database.records import ReportExpense, ReportIncome
+from services.category_service import category_name
+from utils.helpers import to_iso_date, month_range, quarter_range
+from utils.money import from_minor
+from utils.cache import cached_read
+
+# Report queries filter on half-open [start, end) date ranges so that they can
+# be answered from the (user_id, date, amount_minor) indexes instead of scanning.
+REPORT_QUERIES = {
+    "range_expenses": '''
+        SELECT id, user_id, title, amount_minor, currency, currency_exponent, category_id, date, description
+        FROM Expense
+        WHERE user_id = ? AND date >= ? AND date < ?
+        ORDER BY date, id
+    ''',
+    "range_incomes": '''
+        SELECT id, source, amount_minor, currency_exponent, date, user_id, description
+        FROM Income
+        WHERE user_id = ? AND date >= ? AND date < ?
+        ORDER BY date, id
+    ''',
+    "range_totals": '''
+        SELECT
+            (SELECT COALESCE(SUM(amount_minor), 0) FROM Expense
+             WHERE user_id = ? AND date >= ? AND date < ?) AS total_expenses,
+            (SELECT COALESCE(SUM(amount_minor), 0) FROM Income
+             WHERE user_id = ? AND date >= ? AND date < ?) AS total_incomes
+    ''',
+}
+
+
+def _validate_user_id(user_id):
+    if not isinstance(user_id, int) or user_id <= 0:
+        raise ValueError("User ID must be a positive integer.")
+
+
+def _validate_year(year):
+    if not isinstance(year, int) or year < 1000 or year > 9999:
+        raise ValueError("Year must be a valid 4-digit integer.")
+
+
+def iter_range_report(user_id, start_date, end_date, batch_size=None):
+    """
+    Stream a user's expenses and then incomes dated on or after start_date and
+    before end_date, without building lists. Each query streams straight from
+    the (user_id, date, amount_minor) index order in batches.
+
+    Args:
+        user_id (int): The ID of the user.
+        start_date (str): First day included in the report (YYYY-MM-DD).
+        end_date (str): First day after the report (YYYY-MM-DD), i.e. exclusive.
+        batch_size (int, optional): Rows per fetch; defaults to database.db.ITER_BATCH_SIZE.
+
+    Yields:
+        tuple: ("expense", ReportExpense) or ("income", ReportIncome), by date.
+               An invalid argument or database error is reported and ends the stream.
+    """
+    try:
+        # Validate inputs
+        _validate_user_id(user_id)
+        start_date, end_date = to_iso_date(start_date), to_iso_date(end_date)
+        if start_date >= end_date:
+            raise ValueError("Start date must be before end date.")
+        params = (user_id, start_date, end_date)
+
+        # The queries list the columns in record slot order; category names come from the cache
+        for row in iter_query(REPORT_QUERIES["range_expenses"], params, batch_size):
+            yield "expense", ReportExpense(*row[:8], category_name(row[6]), row[8])
+
+        for row in iter_query(REPORT_QUERIES["range_incomes"], params, batch_size):
+            yield "income", ReportIncome(*row)
+    except sqlite3.Error as e:
+        print(f"Database error retrieving report: {e}")
+    except ValueError as ve:
+        print(f"Value error retrieving report: {ve}")
+
+
+@cached_read
+def get_range_report(user_id, start_date, end_date):
+    """
+    Retrieve a user's expenses and incomes dated on or after start_date and before end_date.
+
+    Args:
+        user_id (int): The ID of the user.
+        start_date (str): First day included in the report (YYYY-MM-DD).
+        end_date (str): First day after the report (YYYY-MM-DD), i.e. exclusive.
+
+    Returns:
+        tuple: (expenses, incomes), tuples of read-only ReportExpense and ReportIncome
+               records, so a cached report can be shared by every caller as is.
+    """
+    report = {"expense": [], "income": []}
+    for kind, row in iter_range_report(user_id, start_date, end_date):
+        report[kind].append(row)
+    return tuple(report["expense"]), tuple(report["income"])
+
 
 def get_monthly_report(user_id, month, year):
     """
@@ -11,71 +107,86 @@ def get_monthly_report(user_id, month, year):
         year (int): The year for which the report is generated.
 
     Returns:
-        tuple: A tuple containing two lists:
-               - A list of expense dictionaries.
-               - A list of income dictionaries.
+        tuple: (expenses, incomes) as returned by get_range_report; both empty on invalid input.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
     try:
-        # Validate inputs
-        if not isinstance(user_id, int) or user_id <= 0:
-            raise ValueError("User ID must be a positive integer.")
         if not isinstance(month, int) or month < 1 or month > 12:
             raise ValueError("Month must be an integer between 1 and 12.")
-        if not isinstance(year, int) or year < 1000 or year > 9999:
-            raise ValueError("Year must be a valid 4-digit integer.")
-
-        # Query expenses for the given month and year
-        cursor.execute('''
-            SELECT id, user_id, title, amount, currency, category_id, date, description
-            FROM Expense
-            WHERE user_id = ? AND strftime('%m', date) = ? AND strftime('%Y', date) = ?
-        ''', (user_id, f"{month:02d}", str(year)))
-        expense_rows = cursor.fetchall()
-
-        # Convert expense rows to a list of dictionaries
-        expenses = [
-            {
-                "id": row[0],
-                "user_id": row[1],
-                "title": row[2],
-                "amount": row[3],
-                "currency": row[4],
-                "category_id": row[5],
-                "date": row[6],
-                "description": row[7],
-            }
-            for row in expense_rows
-        ]
-
-        # Query incomes for the given month and year
-        cursor.execute('''
-            SELECT id, user_id, source, amount, date, description
-            FROM Income
-            WHERE user_id = ? AND strftime('%m', date) = ? AND strftime('%Y', date) = ?
-        ''', (user_id, f"{month:02d}", str(year)))
-        income_rows = cursor.fetchall()
-
-        # Convert income rows to a list of dictionaries
-        incomes = [
-            {
-                "id": row[0],
-                "user_id": row[1],
-                "source": row[2],
-                "amount": row[3],
-                "date": row[4],
-                "description": row[5],
-            }
-            for row in income_rows
-        ]
-
-        return expenses, incomes
-    except sqlite3.Error as e:
-        print(f"Database error retrieving monthly report: {e}")
-        return [], []
+        _validate_year(year)
     except ValueError as ve:
         print(f"Value error retrieving monthly report: {ve}")
-        return [], []
-    finally:
-        conn.close()
\ No newline at end of file
+        return (), ()
+    return get_range_report(user_id, *month_range(year, month))
+
+
+def get_quarterly_report(user_id, quarter, year):
+    """
+    Retrieve the quarterly report for a user, including expenses and incomes.
+
+    Args:
+        user_id (int): The ID of the user.
+        quarter (int): The quarter for which the report is generated (1-4).
+        year (int): The year for which the report is generated.
+
+    Returns:
+        tuple: (expenses, incomes) as returned by get_range_report; both empty on invalid input.
+    """
+    try:
+        if not isinstance(quarter, int) or quarter < 1 or quarter > 4:
+            raise ValueError("Quarter must be an integer between 1 and 4.")
+        _validate_year(year)
+    except ValueError as ve:
+        print(f"Value error retrieving quarterly report: {ve}")
+        return (), ()
+    return get_range_report(user_id, *quarter_range(year, quarter))
+
+
+@cached_read
+def get_range_totals(user_id, start_date, end_date):
+    """
+    Calculate a user's total expenses and incomes in a half-open date range.
+    Answered entirely from the covering (user_id, date, amount_minor) indexes.
+
+    Args:
+        user_id (int): The ID of the user.
+        start_date (str): First day included (YYYY-MM-DD).
+        end_date (str): First day excluded (YYYY-MM-DD).
+
+    Returns:
+        dict: total_expenses and total_incomes (both 0.0 on error).
+    """
+    try:
+        _validate_user_id(user_id)
+        start_date, end_date = to_iso_date(start_date), to_iso_date(end_date)
+        with db_connection(readonly=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                REPORT_QUERIES["range_totals"],
+                (user_id, start_date, end_date, user_id, start_date, end_date),
+            )
+            row = cursor.fetchone()
+        return {"total_expenses": from_minor(row[0]), "total_incomes": from_minor(row[1])}
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Error calculating report totals: {e}")
+        return {"total_expenses": 0.0, "total_incomes": 0.0}
+
+
+def find_full_scans():
+    """
+    Run EXPLAIN QUERY PLAN on every report query and list the ones that scan a table.
+    Used as a regression check that report latency stays independent of ledger size.
+
+    Returns:
+        list: (query name, plan detail) tuples for every full table scan found.
+    """
+    from services.rollup_service import ROLLUP_QUERIES
+
+    scans = []
+    with db_connection(readonly=True) as conn:
+        for name, sql in {**REPORT_QUERIES, **ROLLUP_QUERIES}.items():
+            params = (0,) * sql.count("?")  # Placeholder values do not affect the plan
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params):
+                detail = row[3]
+                if detail.startswith("SCAN") and detail != "SCAN CONSTANT ROW":
+                    scans.append((name, detail))
+    return scans
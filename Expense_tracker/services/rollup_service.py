@@ -0,0 +1,254 @@
+import sqlite3
+from database.db import db_connection, run_in_transaction
+from services.category_service import category_name
+from utils.cache import cached_read, bump_data_version
+from utils.helpers import month_range
+from utils.money import from_minor, format_money
+
+# Reports read the trigger-maintained MonthlyRollup table (one row per user, month,
+# kind and category); only the day level goes back to the ledger, for one month.
+# Expense rows are keyed by the integer category_id (0 when uncategorized), income
+# rows by their source text in category (with category_id 0).
+ROLLUP_QUERIES = {
+    "yearly_totals": '''
+        SELECT substr(month, 1, 4) AS period, kind, SUM(total_minor), SUM(entry_count)
+        FROM MonthlyRollup
+        WHERE user_id = ?
+        GROUP BY period, kind
+        ORDER BY period, kind
+    ''',
+    "monthly_totals": '''
+        SELECT month AS period, kind, SUM(total_minor), SUM(entry_count)
+        FROM MonthlyRollup
+        WHERE user_id = ? AND month >= ? AND month < ?
+        GROUP BY month, kind
+        ORDER BY month, kind
+    ''',
+    "category_totals": '''
+        SELECT category_id, category, SUM(total_minor), SUM(entry_count)
+        FROM MonthlyRollup
+        WHERE user_id = ? AND kind = ? AND month >= ? AND month < ?
+        GROUP BY category_id, category
+    ''',
+    "daily_totals": '''
+        SELECT date AS period, 'expense' AS kind, SUM(amount_minor), COUNT(*)
+        FROM Expense
+        WHERE user_id = ? AND date >= ? AND date < ?
+        GROUP BY date
+        UNION ALL
+        SELECT date, 'income', SUM(amount_minor), COUNT(*)
+        FROM Income
+        WHERE user_id = ? AND date >= ? AND date < ?
+        GROUP BY date
+        ORDER BY period, kind
+    ''',
+}
+
+# MonthlyRollup recomputed from the ledger itself; the table must always match this
+LEDGER_ROLLUP_SQL = '''
+    SELECT user_id, substr(date, 1, 7), 'expense', COALESCE(category_id, 0), '', SUM(amount_minor), COUNT(*)
+    FROM Expense GROUP BY 1, 2, 4
+    UNION ALL
+    SELECT user_id, substr(date, 1, 7), 'income', 0, COALESCE(source, ''), SUM(amount_minor), COUNT(*)
+    FROM Income GROUP BY 1, 2, 5
+'''
+
+# Label used for expenses saved without a category
+UNCATEGORIZED = "Uncategorized"
+
+
+def _period_rows(sql, params):
+    """Run a yearly/monthly/daily totals query and convert its rows to dictionaries."""
+    with db_connection(readonly=True) as conn:
+        rows = conn.execute(sql, params).fetchall()
+    return [
+        {"period": row[0], "kind": row[1], "total": from_minor(row[2]), "total_minor": row[2], "count": row[3]}
+        for row in rows
+    ]
+
+
+@cached_read
+def get_yearly_totals(user_id):
+    """
+    Retrieve a user's expense and income totals for every year with transactions.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        list: Dictionaries with period ("YYYY"), kind ("expense" or "income"),
+              total, total_minor and count, ordered by year.
+    """
+    try:
+        return _period_rows(ROLLUP_QUERIES["yearly_totals"], (user_id,))
+    except sqlite3.Error as e:
+        print(f"Database error retrieving yearly totals: {e}")
+        return []
+
+
+@cached_read
+def get_monthly_totals(user_id, year=None):
+    """
+    Drill down into one year: a user's expense and income totals per month.
+
+    Args:
+        user_id (int): The ID of the user.
+        year (int, optional): The year to break down; None for the user's whole history.
+
+    Returns:
+        list: Dictionaries with period ("YYYY-MM"), kind, total, total_minor and count,
+              ordered by month. Months without transactions are omitted.
+    """
+    try:
+        start, end = ("0000-00", "9999-99") if year is None else (f"{year:04d}-01", f"{year + 1:04d}-01")
+        return _period_rows(ROLLUP_QUERIES["monthly_totals"], (user_id, start, end))
+    except sqlite3.Error as e:
+        print(f"Database error retrieving monthly totals: {e}")
+        return []
+
+
+@cached_read
+def get_daily_totals(user_id, year, month):
+    """
+    Drill down into one month: a user's expense and income totals per day.
+    Days are not pre-aggregated; the month is read as one range from the
+    (user_id, date, amount_minor) indexes.
+
+    Args:
+        user_id (int): The ID of the user.
+        year (int): The year of the month.
+        month (int): The month to break down (1-12).
+
+    Returns:
+        list: Dictionaries with period ("YYYY-MM-DD"), kind, total, total_minor and count,
+              ordered by date.
+    """
+    try:
+        start, end = month_range(year, month)
+        return _period_rows(ROLLUP_QUERIES["daily_totals"], (user_id, start, end) * 2)
+    except sqlite3.Error as e:
+        print(f"Database error retrieving daily totals: {e}")
+        return []
+
+
+@cached_read
+def get_category_totals(user_id, kind="expense", start_month="0000-00", end_month="9999-99"):
+    """
+    Retrieve a user's totals per category (expenses) or per source (incomes).
+
+    Args:
+        user_id (int): The ID of the user.
+        kind (str): "expense" or "income".
+        start_month (str): First month included (YYYY-MM); defaults to all history.
+        end_month (str): First month excluded (YYYY-MM).
+
+    Returns:
+        list: Dictionaries with category (the name), category_id (None for income
+              sources and uncategorized expenses), total, total_minor and count,
+              ordered by category.
+    """
+    try:
+        with db_connection(readonly=True) as conn:
+            rows = conn.execute(
+                ROLLUP_QUERIES["category_totals"], (user_id, kind, start_month, end_month)
+            ).fetchall()
+        totals = [
+            {
+                "category": (category_name(category_id) if category_id else category) or UNCATEGORIZED,
+                "category_id": category_id or None,
+                "total": from_minor(total_minor),
+                "total_minor": total_minor,
+                "count": count,
+            }
+            for category_id, category, total_minor, count in rows
+        ]
+        totals.sort(key=lambda row: row["category"])
+        return totals
+    except sqlite3.Error as e:
+        print(f"Database error retrieving category totals: {e}")
+        return []
+
+
+@cached_read
+def build_text_report(user_id, currency="NLe"):
+    """
+    Build the plain-text income and expense report (the format of man.txt)
+    entirely from the rollup table.
+
+    Args:
+        user_id (int): The ID of the user.
+        currency (str): Currency code used to format the amounts.
+
+    Returns:
+        str: The report text.
+    """
+    expenses_by_category = get_category_totals(user_id, "expense")
+    incomes_by_source = sorted(get_category_totals(user_id, "income"), key=lambda row: -row["total_minor"])
+    monthly = [row for row in get_monthly_totals(user_id) if row["kind"] == "expense"]
+
+    total_expenses = sum(row["total_minor"] for row in expenses_by_category)
+    total_incomes = sum(row["total_minor"] for row in incomes_by_source)
+
+    lines = [
+        "Income & Expense Report",
+        f"Total Expenses: {format_money(total_expenses, currency)}",
+        f"Total Incomes: {format_money(total_incomes, currency)}",
+        f"Net Balance: {format_money(total_incomes - total_expenses, currency)}",
+        "",
+        "Expenses by Category:",
+    ]
+    lines += [f"{row['category']}: {format_money(row['total_minor'], currency)}" for row in expenses_by_category]
+    lines += ["", "Monthly Expense Breakdown:"]
+    lines += [
+        f"{int(row['period'][5:7])}-{row['period'][:4]}: {format_money(row['total_minor'], currency)}"
+        for row in monthly
+    ]
+    lines += ["", "Income Sources:"]
+    lines += [f"{row['category']}: {format_money(row['total_minor'], currency)}" for row in incomes_by_source]
+    return "\n".join(lines) + "\n"
+
+
+def check_rollup(repair=False):
+    """
+    Compare every MonthlyRollup row with sums recomputed from the Expense and Income tables.
+
+    Args:
+        repair (bool): Rebuild MonthlyRollup from scratch if any row is wrong or missing.
+
+    Returns:
+        list: (user_id, month, kind, category_id, category) keys whose stored values did not match the ledger.
+    """
+    def check(conn):
+        expected = {tuple(row[:5]): tuple(row[5:]) for row in conn.execute(LEDGER_ROLLUP_SQL)}
+        stored = {
+            tuple(row[:5]): tuple(row[5:])
+            for row in conn.execute(
+                "SELECT user_id, month, kind, category_id, category, total_minor, entry_count FROM MonthlyRollup"
+            )
+        }
+        mismatched = sorted(key for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key))
+        if mismatched and repair:
+            conn.execute("DELETE FROM MonthlyRollup")
+            conn.execute(f'''
+                INSERT INTO MonthlyRollup (user_id, month, kind, category_id, category, total_minor, entry_count)
+                {LEDGER_ROLLUP_SQL}
+            ''')
+        return mismatched
+
+    def check_and_repair(conn):
+        # Take the write lock first so no write slips in between the check and the rebuild
+        conn.execute("BEGIN IMMEDIATE")
+        return check(conn)
+
+    try:
+        if not repair:
+            with db_connection(readonly=True) as conn:
+                conn.execute("BEGIN")  # Read both sides from the same snapshot
+                return check(conn)
+        mismatched = run_in_transaction(check_and_repair)
+        if mismatched:
+            bump_data_version()  # Cached results were computed from the wrong figures
+        return mismatched
+    except sqlite3.Error as e:
+        print(f"Database error checking monthly rollup: {e}")
+        return []
@@ -0,0 +1,170 @@
+import sqlite3
+from database.db import db_connection
+from services.category_service import category_name
+from utils.helpers import search_words
+from utils.money import from_minor
+
+# Default number of matches returned by a search
+SEARCH_LIMIT = 50
+
+# Matches are ranked inside the FTS5 index with bm25 (lower is better) on the terms column
+# alone (the owner column weighs 0); the join back to Expense/Income happens only for the
+# top `limit` rows.
+SEARCH_QUERIES = {
+    "expense": '''
+        SELECT e.id, e.user_id, e.title, e.amount_minor, e.currency, e.currency_exponent,
+               e.category_id, e.date, e.description, m.score
+        FROM (
+            SELECT rowid, bm25(ExpenseSearch, 0.0, 1.0) AS score
+            FROM ExpenseSearch
+            WHERE ExpenseSearch MATCH ?
+            ORDER BY score
+            LIMIT ?
+        ) AS m
+        JOIN Expense e ON e.id = m.rowid
+        ORDER BY m.score
+    ''',
+    "income": '''
+        SELECT i.id, i.user_id, i.source, i.amount_minor, i.currency, i.currency_exponent,
+               i.date, i.description, m.score
+        FROM (
+            SELECT rowid, bm25(IncomeSearch, 0.0, 1.0) AS score
+            FROM IncomeSearch
+            WHERE IncomeSearch MATCH ?
+            ORDER BY score
+            LIMIT ?
+        ) AS m
+        JOIN Income i ON i.id = m.rowid
+        ORDER BY m.score
+    ''',
+}
+
+
+def build_match_query(text, user_id=None, prefix=True):
+    """
+    Turn free text typed by a user into a safe FTS5 MATCH expression.
+
+    Every word must match (implicit AND); quotes, operators and punctuation are
+    dropped. With prefix=True each word also matches longer words it starts, so
+    "groc" finds "groceries". Words are matched in the terms column only; for
+    one user the owner column must also hold their token (see migration 10).
+
+    Args:
+        text (str): The search text.
+        user_id (int, optional): Only match this user's rows; None searches all users.
+        prefix (bool): Treat every word as a prefix.
+
+    Returns:
+        str: The MATCH expression, or None if the text contains no words.
+    """
+    words = search_words(text)
+    if not words:
+        return None
+    star = "*" if prefix else ""
+    terms = [f'terms : "{word}"{star}' for word in words]
+    if user_id is not None:
+        terms.insert(0, f'owner : "u{int(user_id)}x"')
+    return " AND ".join(terms)
+
+
+def search_expenses(user_id, text, limit=SEARCH_LIMIT, prefix=True):
+    """
+    Search expense titles and descriptions.
+
+    Args:
+        user_id (int): The ID of the user, or None to search every user (admin view).
+        text (str): Words to look for.
+        limit (int): Maximum number of matches to return.
+        prefix (bool): Match words that start with the given words.
+
+    Returns:
+        list: Expense dictionaries ordered by relevance (best first), each with a "score".
+    """
+    query = build_match_query(text, user_id, prefix)
+    if query is None:
+        return []
+    try:
+        with db_connection(readonly=True) as conn:
+            rows = conn.execute(SEARCH_QUERIES["expense"], (query, limit)).fetchall()
+        return [
+            {
+                "id": row["id"],
+                "user_id": row["user_id"],
+                "title": row["title"],
+                "amount": from_minor(row["amount_minor"], row["currency_exponent"]),
+                "amount_minor": row["amount_minor"],
+                "currency": row["currency"],
+                "category_id": row["category_id"],
+                "category": category_name(row["category_id"]),
+                "date": row["date"],
+                "description": row["description"],
+                "score": row["score"],
+            }
+            for row in rows
+        ]
+    except sqlite3.Error as e:
+        print(f"Database error searching expenses: {e}")
+        return []
+
+
+def search_incomes(user_id, text, limit=SEARCH_LIMIT, prefix=True):
+    """
+    Search income sources and descriptions.
+
+    Args:
+        user_id (int): The ID of the user, or None to search every user (admin view).
+        text (str): Words to look for.
+        limit (int): Maximum number of matches to return.
+        prefix (bool): Match words that start with the given words.
+
+    Returns:
+        list: Income dictionaries ordered by relevance (best first), each with a "score".
+    """
+    query = build_match_query(text, user_id, prefix)
+    if query is None:
+        return []
+    try:
+        with db_connection(readonly=True) as conn:
+            rows = conn.execute(SEARCH_QUERIES["income"], (query, limit)).fetchall()
+        return [
+            {
+                "id": row["id"],
+                "user_id": row["user_id"],
+                "source": row["source"],
+                "amount": from_minor(row["amount_minor"], row["currency_exponent"]),
+                "amount_minor": row["amount_minor"],
+                "currency": row["currency"],
+                "date": row["date"],
+                "description": row["description"],
+                "score": row["score"],
+            }
+            for row in rows
+        ]
+    except sqlite3.Error as e:
+        print(f"Database error searching incomes: {e}")
+        return []
+
+
+def search_transactions(user_id, text, limit=SEARCH_LIMIT, prefix=True):
+    """
+    Search expenses and incomes together, for the dashboard search box.
+
+    Args:
+        user_id (int): The ID of the user, or None to search every user (admin view).
+        text (str): Words to look for.
+        limit (int): Maximum number of matches to return in total.
+        prefix (bool): Match words that start with the given words.
+
+    Returns:
+        list: Dictionaries with kind ("expense" or "income"), id, user_id, label,
+              amount, amount_minor, currency, date and score, best match first.
+    """
+    results = [
+        {"kind": "expense", "label": row["title"], **row}
+        for row in search_expenses(user_id, text, limit, prefix)
+    ] + [
+        {"kind": "income", "label": row["source"], **row}
+        for row in search_incomes(user_id, text, limit, prefix)
+    ]
+    results.sort(key=lambda row: row["score"])
+    return results[:limit]
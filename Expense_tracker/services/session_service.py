@@ -0,0 +1,40 @@
+from services.category_service import get_categories
+from services.profile_service import get_profile, forget_profile
+
+
+def start_session(user_id):
+    """
+    Preload the reference data the GUI forms need for a signed-in user (the
+    categories and the user's profile), so building a form costs no database
+    round trip. The services keep the data cached and refresh it when it changes,
+    announcing the change with the utils.events CATEGORIES_CHANGED and
+    PROFILE_CHANGED events.
+
+    Args:
+        user_id (int): The ID of the user who signed in.
+
+    Returns:
+        Profile: The user's profile record, or None if they have none.
+    """
+    get_categories(refresh=True)
+    return get_profile(user_id, refresh=True)
+
+
+def end_session(user_id):
+    """
+    Forget the per-user reference data when a user signs out.
+
+    Args:
+        user_id (int): The ID of the user who signed out.
+    """
+    forget_profile(user_id)
+
+
+def category_choices():
+    """
+    Category names for option menus, served from the category cache.
+
+    Returns:
+        list: Category names in alphabetical order.
+    """
+    return [category.name for category in get_categories()]
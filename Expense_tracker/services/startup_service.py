@@ -0,0 +1,103 @@
+import importlib
+import logging
+import time
+
+from database.db import initialize_db, merge_legacy_database
+from services.category_service import get_categories
+
+# Older versions kept expenses in this separate file; it is merged in once
+LEGACY_DB_PATH = "finance_tracker.db"
+
+# Modules the dashboards need, imported while the splash screen is up instead of on first use.
+# These do not load tkinter, so a worker thread imports them
+CHART_MODULES = ("matplotlib.figure",)
+EXPORT_MODULES = ("openpyxl",)
+VIEW_MODULES = (
+    "services.analytics_service",
+    "services.expense_service",
+    "services.income_service",
+    "services.rollup_service",
+    "services.search_service",
+    "services.totals_service",
+)
+
+# Modules that load tkinter. Tk is not thread-safe, so the main thread imports these; the
+# dashboards' services are already loaded by then, which keeps each of these steps short
+CHART_TK_MODULES = ("matplotlib.backends.backend_tkagg", "gui.widgets")
+FORM_MODULES = ("tkcalendar",)
+DASHBOARD_MODULES = ("gui.user_dashboard", "gui.admin_dashboard")
+
+
+def prepare_database(legacy_path=None):
+    """
+    Open the connection pool, apply pending schema migrations and merge the legacy
+    expenses file, so the first query of a dashboard finds everything ready.
+
+    Args:
+        legacy_path (str | Path, optional): Path of the old expenses database file;
+            defaults to LEGACY_DB_PATH.
+    """
+    initialize_db()
+    merge_legacy_database(legacy_path or LEGACY_DB_PATH)
+
+
+def preload_reference_data():
+    """
+    Read the categories into the category cache; this also opens the read-only pool.
+    """
+    get_categories(refresh=True)
+
+
+def preload_modules(names):
+    """
+    Import modules ahead of their first use. A module that cannot be imported is
+    logged and skipped; the view that needs it reports the error when it is opened.
+
+    Args:
+        names (tuple): Dotted module names.
+    Returns:
+        bool: True if every module was imported.
+    """
+    imported = True
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logging.warning(f"Could not preload module {name}: {e}")
+            imported = False
+    return imported
+
+
+# (progress label, step, on_worker) triples in the order they run; later steps rely on the
+# database ones. Steps with on_worker False import tkinter modules and must run on the main thread
+STARTUP_STEPS = (
+    ("Opening the database...", prepare_database, True),
+    ("Loading categories...", preload_reference_data, True),
+    ("Loading charts...", lambda: preload_modules(CHART_MODULES), True),
+    ("Loading exports...", lambda: preload_modules(EXPORT_MODULES), True),
+    ("Loading services...", lambda: preload_modules(VIEW_MODULES), True),
+    ("Loading chart widgets...", lambda: preload_modules(CHART_TK_MODULES), False),
+    ("Loading forms...", lambda: preload_modules(FORM_MODULES), False),
+    ("Loading dashboards...", lambda: preload_modules(DASHBOARD_MODULES), False),
+)
+
+
+def run_startup_step(index):
+    """
+    Run one startup step. No step touches a widget, so the steps marked on_worker are safe
+    to run on a worker thread; the others import tkinter modules and belong on the main thread.
+
+    Args:
+        index (int): Position of the step in STARTUP_STEPS.
+    Returns:
+        float: Seconds the step took.
+    """
+    label, step, _ = STARTUP_STEPS[index]
+    start = time.perf_counter()
+    try:
+        step()
+    except Exception as e:
+        logging.error(f"Startup step '{label}' failed: {e}")
+    elapsed = time.perf_counter() - start
+    logging.info(f"Startup step '{label}' took {elapsed * 1e3:.0f} ms.")
+    return elapsed
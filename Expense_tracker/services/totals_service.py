@@ -0,0 +1,108 @@
+import sqlite3
+from database.db import db_connection, run_in_transaction
+from utils.cache import cached_read, bump_data_version
+from utils.money import from_minor
+
+# Totals recomputed from the ledger itself; UserTotals must always match this
+LEDGER_TOTALS_SQL = '''
+    SELECT user_id, SUM(expense_minor), SUM(expense_count), SUM(income_minor), SUM(income_count)
+    FROM (
+        SELECT user_id, SUM(amount_minor) AS expense_minor, COUNT(*) AS expense_count,
+               0 AS income_minor, 0 AS income_count
+        FROM Expense GROUP BY user_id
+        UNION ALL
+        SELECT user_id, 0, 0, SUM(amount_minor), COUNT(*)
+        FROM Income GROUP BY user_id
+    )
+    GROUP BY user_id
+'''
+
+
+@cached_read
+def get_user_totals(user_id):
+    """
+    Retrieve a user's dashboard totals from the trigger-maintained UserTotals table.
+    This is a single primary-key lookup, independent of how many transactions the user has.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        dict: total_expenses, total_incomes and net_balance (floats), the same
+              sums as exact integer minor units (expense_minor, income_minor and
+              net_minor), and expense_count and income_count. All zero if the user
+              has no transactions or an error occurs.
+    """
+    try:
+        with db_connection(readonly=True) as conn:
+            row = conn.execute('''
+                SELECT expense_minor, expense_count, income_minor, income_count
+                FROM UserTotals
+                WHERE user_id = ?
+            ''', (user_id,)).fetchone()
+    except sqlite3.Error as e:
+        print(f"Database error retrieving user totals: {e}")
+        row = None
+
+    expense_minor, expense_count, income_minor, income_count = row if row else (0, 0, 0, 0)
+    return {
+        "total_expenses": from_minor(expense_minor),
+        "total_incomes": from_minor(income_minor),
+        "net_balance": from_minor(income_minor - expense_minor),
+        "expense_minor": expense_minor,
+        "income_minor": income_minor,
+        "net_minor": income_minor - expense_minor,
+        "expense_count": expense_count,
+        "income_count": income_count,
+    }
+
+
+def check_user_totals(repair=False):
+    """
+    Compare every UserTotals row with totals recomputed from the Expense and Income tables.
+
+    Args:
+        repair (bool): Rebuild UserTotals from scratch if any user's totals are wrong.
+
+    Returns:
+        list: The IDs of users whose stored totals did not match the ledger.
+    """
+    def check(conn):
+        expected = {row[0]: tuple(row[1:]) for row in conn.execute(LEDGER_TOTALS_SQL)}
+        stored = {
+            row[0]: tuple(row[1:])
+            for row in conn.execute('''
+                SELECT user_id, expense_minor, expense_count, income_minor, income_count
+                FROM UserTotals
+                WHERE expense_count != 0 OR income_count != 0
+            ''')
+        }
+        mismatched = sorted(
+            user_id for user_id in expected.keys() | stored.keys()
+            if expected.get(user_id) != stored.get(user_id)
+        )
+        if mismatched and repair:
+            conn.execute("DELETE FROM UserTotals")
+            conn.execute(f'''
+                INSERT INTO UserTotals (user_id, expense_minor, expense_count, income_minor, income_count)
+                {LEDGER_TOTALS_SQL}
+            ''')
+        return mismatched
+
+    def check_and_repair(conn):
+        # Take the write lock first so no write slips in between the check and the rebuild
+        conn.execute("BEGIN IMMEDIATE")
+        return check(conn)
+
+    try:
+        if not repair:
+            with db_connection(readonly=True) as conn:
+                conn.execute("BEGIN")  # Read both sides from the same snapshot
+                return check(conn)
+        mismatched = run_in_transaction(check_and_repair)
+        if mismatched:
+            bump_data_version()  # Cached results were computed from the wrong figures
+        return mismatched
+    except sqlite3.Error as e:
+        print(f"Database error checking user totals: {e}")
+        return []
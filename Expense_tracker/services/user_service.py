@@ -1,39 +1,62 @@
 import sqlite3
-from database.db import get_db_connection
+from database.db import db_connection, iter_query
+from database.records import User
+from utils.money import from_minor
+
+def iter_all_users(batch_size=None):
+    """
+    Stream all users from the User table without building a list.
+
+    Args:
+        batch_size (int, optional): Rows per fetch; defaults to database.db.ITER_BATCH_SIZE.
+
+    Yields:
+        User: One user record at a time. A database error is reported and ends the stream.
+    """
+    try:
+        for row in iter_query('''
+            SELECT id, username, email, user_type, is_staff, is_superuser
+            FROM User
+        ''', (), batch_size):
+            yield User(*row)
+    except sqlite3.Error as e:
+        print(f"Database error retrieving users: {e}")
+
 
 def get_all_users():
     """
     Retrieve all users from the User table.
 
     Returns:
-        list: A list of user dictionaries, where each dictionary contains user details.
+        list: A list of User records (dictionary-compatible) with the user details.
               If no users exist or an error occurs, an empty list is returned.
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    return list(iter_all_users())
+
+
+def get_admin_summary():
+    """
+    Retrieve the admin dashboard totals in a single query.
+
+    Returns:
+        dict: total_incomes, total_expenses and total_users.
+              All values are zero if an error occurs.
+    """
     try:
-        # Query the database for all users
-        cursor.execute('''
-            SELECT id, username, email, user_type, is_staff, is_superuser
-            FROM User
-        ''')
-        rows = cursor.fetchall()
-
-        # Convert rows to a list of dictionaries
-        users = [
-            {
-                "id": row[0],
-                "username": row[1],
-                "email": row[2],
-                "user_type": row[3],
-                "is_staff": bool(row[4]),
-                "is_superuser": bool(row[5]),
-            }
-            for row in rows
-        ]
-        return users
+        with db_connection(readonly=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT
+                    (SELECT COALESCE(SUM(income_minor), 0) FROM UserTotals) AS total_incomes,
+                    (SELECT COALESCE(SUM(expense_minor), 0) FROM UserTotals) AS total_expenses,
+                    (SELECT COUNT(*) FROM User) AS total_users
+            ''')
+            row = cursor.fetchone()
+        return {
+            "total_incomes": from_minor(row[0]),
+            "total_expenses": from_minor(row[1]),
+            "total_users": row[2],
+        }
     except sqlite3.Error as e:
-        print(f"Database error retrieving users: {e}")
-        return []
-    finally:
-        conn.close()
\ No newline at end of file
+        print(f"Database error retrieving admin summary: {e}")
+        return {"total_incomes": 0.0, "total_expenses": 0.0, "total_users": 0}
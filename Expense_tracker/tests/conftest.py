@@ -0,0 +1,46 @@
+import os
+import sys
+import tkinter
+
+import pytest
+
+# The modules import each other from the application directory, as when main.py runs
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def memory_db():
+    """A fresh, migrated in-memory database behind the connection pool."""
+    from database import db
+    db.configure_database(db.MEMORY_DB)
+    db.initialize_db()
+    yield db
+    db.close_pool()
+
+
+@pytest.fixture
+def headless_loop():
+    """Stand-in for the Tk main loop, with the after() and after_cancel() a TaskRunner uses."""
+    from benchmark import _HeadlessLoop
+    return _HeadlessLoop()
+
+
+@pytest.fixture
+def display():
+    """Skip the test when no display is available for Tk."""
+    try:
+        tkinter.Tk().destroy()
+    except tkinter.TclError as e:
+        pytest.skip(f"No display available: {e}")
+
+
+@pytest.fixture
+def tk_root():
+    """A withdrawn Tk root; the test is skipped when no display is available."""
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError as e:
+        pytest.skip(f"No display available: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
@@ -0,0 +1,104 @@
+import gc
+import sys
+import tkinter
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from matplotlib.figure import Figure  # noqa: E402
+
+from gui.widgets import ExpenseChart, PieChart  # noqa: E402
+
+UPDATES = 50
+
+
+class DrawCounter:
+    """Counts a chart's full figure draws and its blits."""
+
+    def __init__(self, chart):
+        self.draws = 0
+        self.blits = 0
+        chart.canvas.mpl_connect("draw_event", self._on_draw)
+        blit = chart.canvas.blit
+
+        def counting_blit(*args, **kwargs):
+            self.blits += 1
+            return blit(*args, **kwargs)
+
+        chart.canvas.blit = counting_blit
+
+    def _on_draw(self, event):
+        self.draws += 1
+
+
+def shown(chart, root):
+    """Pack chart and let the main loop draw it once."""
+    chart.pack(fill="both", expand=True)
+    root.update()
+    return DrawCounter(chart)
+
+
+def test_pie_updates_are_blitted(tk_root):
+    pie = PieChart(tk_root, labels=("Expenses", "Incomes"), colors=("#FF4500", "#2E8B57"))
+    counter = shown(pie, tk_root)
+
+    for n in range(UPDATES):
+        pie.update_chart((100 + n, 200))
+    tk_root.update()
+
+    assert counter.draws == 0
+    assert counter.blits == UPDATES
+
+
+def test_bar_heights_are_blitted_and_new_categories_drawn_once(tk_root):
+    rows = [{"category": "Food", "total": 100.0}, {"category": "Transport", "total": 80.0}]
+    chart = ExpenseChart(tk_root, rows)
+    counter = shown(chart, tk_root)
+
+    for n in range(UPDATES):
+        chart.update_chart([{"category": "Food", "total": 90.0 + n % 10}, {"category": "Transport", "total": 80.0}])
+    tk_root.update()
+    assert counter.draws == 0
+    assert counter.blits == UPDATES
+
+    chart.update_chart(rows + [{"category": "Rent", "total": 50.0}])
+    tk_root.update()
+    assert counter.draws == 1
+    assert len(chart.ax.patches) == 3
+
+
+def test_destroyed_charts_free_their_figures(tk_root):
+    for _ in range(20):
+        frame = tkinter.Frame(tk_root)
+        PieChart(frame, labels=("Expenses", "Incomes"), colors=("#FF4500", "#2E8B57")).pack()
+        tk_root.update()
+        frame.destroy()
+    gc.collect()
+
+    assert sum(isinstance(obj, Figure) for obj in gc.get_objects()) == 0
+    if "matplotlib.pyplot" in sys.modules:
+        assert sys.modules["matplotlib.pyplot"].get_fignums() == []
+
+
+def test_dashboard_keeps_one_figure_per_chart_across_logins(memory_db, display):
+    ctk = pytest.importorskip("customtkinter")
+    from gui.screen_router import ScreenRouter
+    from gui.user_dashboard import UserDashboard
+
+    root = ctk.CTk()
+    router = ScreenRouter(root)
+    for _ in range(5):
+        dashboard = router.show("user", lambda frame: UserDashboard(frame, 1, "test", on_logout=lambda: None))
+        for _ in range(10):
+            dashboard.show_reports()
+            dashboard.views.refresh({"kind": "expense", "old": None, "new": None})
+            dashboard.show_dashboard()
+            root.update()
+        dashboard.logout()
+    gc.collect()
+    figures = sum(isinstance(obj, Figure) for obj in gc.get_objects())
+    root.destroy()
+
+    # The last dashboard shows three charts; the ones before it are gone
+    assert figures <= 3
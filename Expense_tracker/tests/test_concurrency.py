@@ -0,0 +1,77 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from database import db
+
+# Longest a dashboard read may take while a write transaction is open, in seconds
+READ_BUDGET = 0.1
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """A migrated database file; WAL mode needs a real file, not the in-memory database."""
+    path = tmp_path / "wal.db"
+    db.configure_database(path)
+    db.initialize_db()
+    yield path
+    db.close_pool()
+
+
+def expense_count():
+    start = time.perf_counter()
+    with db.db_connection(readonly=True) as conn:
+        count = conn.execute("SELECT COUNT(*) FROM Expense WHERE user_id = ?", (1,)).fetchone()[0]
+    return count, time.perf_counter() - start
+
+
+def test_the_database_runs_in_wal_mode(file_db):
+    with db.db_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_readers_are_not_blocked_by_an_exclusive_write(file_db):
+    writer = sqlite3.connect(file_db, timeout=0, isolation_level=None)
+    writer.execute("BEGIN EXCLUSIVE")  # In rollback-journal mode this locks every reader out
+    writer.execute(
+        "INSERT INTO Expense (user_id, title, amount_minor, currency, date) VALUES (1, 'Pending', 100, 'NLe', '2024-01-01')"
+    )
+
+    count, elapsed = expense_count()
+    assert count == 0  # The uncommitted row is not seen
+    assert elapsed < READ_BUDGET
+
+    writer.execute("COMMIT")
+    writer.close()
+    assert expense_count()[0] == 1
+
+
+def test_concurrent_readers_never_fail_while_batches_commit(file_db):
+    rows = [(1, f"Expense {i}", 999, "NLe", f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}") for i in range(10_000)]
+    columns = ("user_id", "title", "amount_minor", "currency", "date")
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                expense_count()
+            except sqlite3.Error as e:
+                errors.append(e)
+            time.sleep(0.001)  # Leave the writer the GIL between reads
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for _ in range(5):
+            db.run_in_transaction(lambda conn: db.insert_chunked(conn, "Expense", columns, rows, 5_000))
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+    assert errors == []
+    assert expense_count()[0] == 5 * len(rows)
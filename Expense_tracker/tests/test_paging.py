@@ -0,0 +1,43 @@
+from utils.paging import PagedSource
+
+PAGES = {
+    None: ([{"date": "2025-03-01", "id": 3}, {"date": "2025-02-01", "id": 2}], "page2"),
+    "page2": ([{"date": "2025-01-01", "id": 1}], None),
+}
+
+
+def test_pages_fetched_off_thread_are_added_in_order():
+    source = PagedSource(PAGES.__getitem__)
+    while (request := source.next_fetch(10)) is not None:
+        assert source.add_page(request, source.fetch(request))
+
+    assert [row["id"] for row in source] == [3, 2, 1]
+    assert source.exhausted
+
+
+def test_a_page_is_added_once():
+    source = PagedSource(PAGES.__getitem__)
+    request = source.next_fetch(1)
+    page = source.fetch(request)
+
+    assert source.add_page(request, page)
+    assert not source.add_page(request, page)
+    assert len(source) == 2
+
+
+def test_a_page_fetched_before_a_reset_is_dropped():
+    source = PagedSource(PAGES.__getitem__)
+    request = source.next_fetch(1)
+    page = source.fetch(request)
+    source.reset()
+
+    assert not source.add_page(request, page)
+    assert len(source) == 0
+    assert source.next_fetch(1) is not None
+
+
+def test_no_fetch_is_needed_once_enough_rows_are_loaded():
+    source = PagedSource(PAGES.__getitem__)
+    source.ensure(2)
+
+    assert source.next_fetch(2) is None
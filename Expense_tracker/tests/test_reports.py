@@ -0,0 +1,49 @@
+import time
+
+from services.expense_service import add_expense
+from services.income_service import add_income
+from services.report_service import find_full_scans, get_monthly_report, get_range_report
+
+
+def test_no_report_query_scans_a_table(memory_db):
+    assert find_full_scans() == []
+
+
+def test_a_monthly_report_covers_the_half_open_month(memory_db):
+    for day in ("2020-05-31", "2020-06-01", "2020-06-30", "2020-07-01"):
+        add_expense(1, f"Expense {day}", 10, "NLe", "Food", day)
+        add_income(1, f"Income {day}", 100, day)
+    add_expense(2, "Another user", 10, "NLe", "Food", "2020-06-15")
+
+    expenses, incomes = get_monthly_report(1, 6, 2020)
+
+    assert [expense["date"] for expense in expenses] == ["2020-06-01", "2020-06-30"]
+    assert [income["date"] for income in incomes] == ["2020-06-01", "2020-06-30"]
+
+
+def test_report_time_does_not_grow_with_other_users_rows(memory_db):
+    def seed(users):
+        rows = [
+            (user_id, f"Expense {i}", 100, "NLe", f"20{10 + i % 10}-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+            for user_id in users
+            for i in range(1_000)
+        ]
+        memory_db.run_in_transaction(lambda conn: memory_db.insert_chunked(
+            conn, "Expense", ("user_id", "title", "amount_minor", "currency", "date"), rows, 50_000
+        ))
+
+    def best_time():
+        timings = []
+        for _ in range(20):
+            start = time.perf_counter()
+            get_range_report.uncached(1, "2015-06-01", "2015-07-01")
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    seed(range(1, 6))
+    small = best_time()
+    seed(range(6, 101))
+    large = best_time()
+
+    # 20 times the rows in the table; an index range read stays the same size
+    assert large < small * 5
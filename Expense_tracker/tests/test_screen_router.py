@@ -0,0 +1,68 @@
+import time
+import tkinter
+
+import pytest
+
+ctk = pytest.importorskip("customtkinter")
+
+from gui.admin_dashboard import AdminDashboard  # noqa: E402
+from gui.auth_window import AuthWindow  # noqa: E402
+from gui.screen_router import ScreenRouter  # noqa: E402
+from gui.user_dashboard import UserDashboard  # noqa: E402
+
+CYCLES = 5
+
+
+@pytest.fixture
+def tk_roots(monkeypatch):
+    """The Tk roots created during the test."""
+    roots = []
+    init = tkinter.Tk.__init__
+
+    def counting_init(self, *args, **kwargs):
+        roots.append(self)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(tkinter.Tk, "__init__", counting_init)
+    return roots
+
+
+def test_logging_in_and_out_keeps_one_root(memory_db, display, tk_roots):
+    root = ctk.CTk()
+    router = ScreenRouter(root)
+    for _ in range(CYCLES):
+        router.show("auth", lambda frame: AuthWindow(frame, lambda user: None)).tasks.shutdown()
+        router.show("user", lambda frame: UserDashboard(frame, 1, "test", on_logout=lambda: None)).logout()
+        router.show("admin", lambda frame: AdminDashboard(frame, on_logout=lambda: None)).logout()
+        root.update()
+        # The previous screen's frame is destroyed with it
+        assert len(root.winfo_children()) == 1
+    root.destroy()
+
+    assert len(tk_roots) == 1
+
+
+def test_swapping_frames_is_faster_than_a_root_per_screen(memory_db, display):
+    def timed(func):
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    def root_per_screen():
+        root = ctk.CTk()
+        AuthWindow(root, lambda user: None).tasks.shutdown()
+        root.update()
+        root.destroy()
+
+    root = ctk.CTk()
+    router = ScreenRouter(root)
+
+    def swap_frames():
+        router.show("auth", lambda frame: AuthWindow(frame, lambda user: None)).tasks.shutdown()
+        root.update()
+
+    before = min(timed(root_per_screen) for _ in range(CYCLES))
+    after = min(timed(swap_frames) for _ in range(CYCLES))
+    root.destroy()
+
+    assert after < before
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Modules that must not be loaded by importing main; the views that need them import them on first use
+DEFERRED_MODULES = ("matplotlib", "numpy", "openpyxl", "tkcalendar")
+
+# Budgets for a cold start, in milliseconds
+IMPORT_BUDGET_MS = 600.0
+FIRST_FRAME_BUDGET_MS = 1500.0
+
+# Run in a fresh interpreter: import main, then (with "frame" as argument) draw the splash screen's first frame
+FIRST_FRAME_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import main
+print("main imported", file=sys.stderr, flush=True)
+if sys.argv[1:] == ["frame"]:
+    root = main.open_splash_screen()
+    root.update()
+    print(time.perf_counter() - start, flush=True)
+    root.destroy()
+"""
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+def parse_importtime(output):
+    """
+    Parse python -X importtime output.
+
+    Returns:
+        list: (nesting level, module name, cumulative import time in microseconds) of
+              each import, in the order they finished (a module after its imports).
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((level, name.strip(), int(cumulative)))
+    return imports
+
+
+def cold_start(tmp_path, *args, runs=3):
+    """
+    Start main in fresh interpreters against a scratch database, best of runs.
+
+    Returns:
+        tuple: (imports before the splash screen as parse_importtime returns them, stdout).
+    """
+    env = dict(os.environ, EXPENSE_TRACKER_DB=str(tmp_path / "startup.db"),
+               PYTHONPATH=os.pathsep.join(filter(None, (str(APP_DIR), os.environ.get("PYTHONPATH")))))
+    best = None
+    for _ in range(runs):
+        # Run from the scratch directory, so the startup steps never see the real database files
+        child = subprocess.run([sys.executable, "-X", "importtime", "-c", FIRST_FRAME_SCRIPT, *args],
+                               cwd=tmp_path, env=env, capture_output=True, text=True)
+        assert child.returncode == 0, child.stderr.strip().splitlines()[-1]
+        imports = parse_importtime(child.stderr.split("main imported", 1)[0])
+        main_us = next(cumulative for _, name, cumulative in imports if name == "main")
+        if best is None or main_us < best[0]:
+            best = (main_us, imports, child.stdout)
+    return best[1], best[2]
+
+
+def test_importing_main_defers_the_heavy_modules(tmp_path):
+    pytest.importorskip("customtkinter")
+    imports, _ = cold_start(tmp_path)
+
+    loaded = sorted({name.split(".")[0] for _, name, _ in imports} & set(DEFERRED_MODULES))
+    assert loaded == []
+
+
+def test_importing_main_stays_within_budget(tmp_path):
+    pytest.importorskip("customtkinter")
+    imports, _ = cold_start(tmp_path)
+
+    main_ms = next(cumulative for _, name, cumulative in imports if name == "main") / 1e3
+    assert main_ms < IMPORT_BUDGET_MS
+
+
+def test_first_frame_stays_within_budget(tmp_path, tk_root):
+    pytest.importorskip("customtkinter")
+    _, output = cold_start(tmp_path, "frame")
+
+    assert float(output.split()[0]) * 1e3 < FIRST_FRAME_BUDGET_MS
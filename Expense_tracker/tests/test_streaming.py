@@ -0,0 +1,54 @@
+import tracemalloc
+
+from database import db
+from services.auth_service import register_user
+from services.expense_service import get_expenses, iter_expenses
+from services.income_service import get_incomes, iter_incomes
+from services.user_service import get_all_users, iter_all_users
+from utils.exporters import export_to_csv
+
+COLUMNS = ("user_id", "title", "amount_minor", "currency", "date")
+
+
+def seed_expenses(count, user_id=1):
+    rows = [(user_id, f"Expense {i}", i % 5000 + 1, "NLe", f"{2015 + i % 10}-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+            for i in range(count)]
+    db.run_in_transaction(lambda conn: db.insert_chunked(conn, "Expense", COLUMNS, rows, 50_000))
+
+
+def test_streams_yield_what_the_lists_hold(memory_db):
+    seed_expenses(2_500)
+    with db.db_connection() as conn:
+        conn.execute("INSERT INTO Income (user_id, source, amount_minor, date) VALUES (1, 'Salary', 100000, '2024-01-01')")
+
+    register_user("streamer", "streamer@example.com", "Str0ng!Passw0rd")
+
+    assert list(iter_expenses(1, batch_size=100)) == get_expenses(1)
+    assert len(get_expenses(1)) == 2_500
+    assert list(iter_incomes(1)) == get_incomes(1)
+    assert list(iter_all_users()) == get_all_users()
+    assert "streamer" in [user["username"] for user in get_all_users()]
+
+
+def test_a_stream_closed_early_returns_its_connection(memory_db):
+    seed_expenses(100)
+    # More streams than the pool has connections: each must give its connection back when closed
+    for _ in range(3 * memory_db.get_pool().size):
+        rows = iter_expenses(1, batch_size=10)
+        assert next(rows, None) is not None
+        rows.close()
+
+
+def test_streaming_export_memory_does_not_grow_with_the_rows(tmp_path):
+    peaks = []
+    for count in (10_000, 40_000):
+        db.configure_database(db.MEMORY_DB)
+        db.initialize_db()
+        seed_expenses(count)
+        tracemalloc.start()
+        assert export_to_csv(iter_expenses(1), tmp_path / "expenses.csv")
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        db.close_pool()
+
+    assert peaks[1] < peaks[0] * 1.5
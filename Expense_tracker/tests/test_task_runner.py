@@ -0,0 +1,120 @@
+import threading
+import time
+
+from gui.task_runner import TaskRunner
+
+# Longest a main-loop callback may take, in milliseconds: one frame at 60 Hz
+FRAME_BUDGET_MS = 16.0
+
+
+def busy_work(seconds):
+    """Keep a worker thread busy for the given time, as a slow query would."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return seconds
+
+
+def test_results_are_delivered_on_the_main_loop_thread(headless_loop):
+    runner = TaskRunner(headless_loop)
+    delivered = []
+    runner.submit(
+        threading.get_ident,
+        on_done=lambda worker: delivered.append((worker, threading.get_ident()))
+    )
+    headless_loop.run(lambda: delivered)
+    runner.shutdown()
+
+    worker, main = delivered[0]
+    assert worker != threading.get_ident()
+    assert main == threading.get_ident()
+
+
+def test_errors_go_to_on_error(headless_loop):
+    runner = TaskRunner(headless_loop)
+    errors = []
+    runner.submit(lambda: 1 / 0, on_done=errors.append, on_error=errors.append)
+    headless_loop.run(lambda: errors)
+    runner.shutdown()
+
+    assert isinstance(errors[0], ZeroDivisionError)
+
+
+def test_a_newer_task_on_a_channel_supersedes_the_older(headless_loop):
+    busy_states = []
+    runner = TaskRunner(headless_loop, on_busy=busy_states.append)
+    delivered = []
+    for text in ("a", "ab", "abc"):
+        runner.submit(busy_work, 0.02, channel="search", on_done=lambda _, text=text: delivered.append(text))
+    headless_loop.run(lambda: not runner.busy)
+    runner.shutdown()
+
+    assert delivered == ["abc"]
+    assert busy_states == [True, False]
+
+
+def test_stream_delivers_every_item_in_batches(headless_loop):
+    runner = TaskRunner(headless_loop)
+    batches, finished = [], []
+    runner.stream(lambda: iter(range(2_503)), on_batch=batches.append, on_done=lambda: finished.append(True),
+                  batch_size=500)
+    headless_loop.run(lambda: finished)
+    runner.shutdown()
+
+    assert [len(batch) for batch in batches] == [500, 500, 500, 500, 500, 3]
+    assert [item for batch in batches for item in batch] == list(range(2_503))
+
+
+def test_cancelling_a_stream_closes_its_iterator(headless_loop):
+    closed = threading.Event()
+
+    def rows():
+        try:
+            yield from range(10 ** 8)
+        finally:
+            closed.set()
+
+    runner = TaskRunner(headless_loop)
+    batches = []
+    runner.stream(rows, on_batch=batches.append, channel="listing", batch_size=100)
+    headless_loop.run(lambda: len(batches) >= 2)
+    runner.cancel("listing")
+    headless_loop.run(lambda: not runner.busy)
+    runner.shutdown()
+
+    assert closed.wait(5)
+    assert not runner.busy
+
+
+def test_main_loop_callbacks_stay_within_a_frame(headless_loop):
+    runner = TaskRunner(headless_loop)
+    finished = []
+    for _ in range(4):
+        runner.submit(busy_work, 0.1)
+    runner.stream(lambda: iter(range(200_000)), on_batch=lambda batch: None, on_done=lambda: finished.append(True))
+    headless_loop.run(lambda: finished and not runner.busy)
+    runner.shutdown()
+
+    assert finished
+    assert max(headless_loop.durations) * 1e3 < FRAME_BUDGET_MS
+
+
+def test_tk_main_loop_keeps_running_during_a_slow_task(tk_root):
+    runner = TaskRunner(tk_root)
+    ticks, finished = [], []
+
+    def tick():
+        ticks.append(time.perf_counter())
+        if finished:
+            tk_root.quit()
+        else:
+            tk_root.after(10, tick)
+
+    runner.submit(busy_work, 0.3, on_done=finished.append)
+    tick()
+    tk_root.mainloop()
+    runner.shutdown()
+
+    gaps = [later - earlier for earlier, later in zip(ticks, ticks[1:])]
+    assert finished == [0.3]
+    assert max(gaps) * 1e3 < 10 + 5 * FRAME_BUDGET_MS
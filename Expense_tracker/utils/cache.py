@@ -0,0 +1,249 @@
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+# Estimated memory the shared result cache may hold before evicting, in bytes
+CACHE_BUDGET = 32 * 1024 * 1024
+
+# Upper bound on the number of cached results, whatever their size
+CACHE_MAX_ENTRIES = 512
+
+_MISSING = object()
+
+# Types copy_result copies (tuples only to reach the containers inside them)
+_CONTAINERS = (list, dict, set, tuple)
+
+
+def estimate_size(value, _depth=0):
+    """
+    Roughly estimate the memory held by a cached value, in bytes.
+
+    Containers are walked a few levels deep; NumPy arrays count their buffers and
+    __slots__ records their slot values. The figure only needs to be good enough
+    to keep the cache near its budget, not exact.
+    """
+    size = sys.getsizeof(value)
+    if _depth > 3:
+        return size
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):  # NumPy array
+        return size + nbytes
+    if isinstance(value, dict):
+        return size + sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, _depth + 1) for item in value)
+    slots = getattr(type(value), "__slots__", None)
+    if slots:
+        return size + sum(estimate_size(getattr(value, name, None), _depth + 1) for name in slots)
+    return size
+
+
+def freeze(value, _depth=0):
+    """
+    Make the NumPy arrays inside a value read-only before it is cached, so that they
+    can be shared by every caller (copy_result does not copy them).
+    """
+    if _depth > 3:
+        return
+    flags = getattr(value, "flags", None)
+    if flags is not None and hasattr(flags, "writeable"):  # NumPy array
+        flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            freeze(item, _depth + 1)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            freeze(item, _depth + 1)
+
+
+def copy_result(value):
+    """
+    Copy the lists, dicts and sets of a cached value on its way out, so a caller that
+    changes its result cannot change what later callers get. Strings, numbers, records
+    and read-only arrays are immutable and are shared.
+    """
+    if isinstance(value, list):
+        return [copy_result(item) if isinstance(item, _CONTAINERS) else item for item in value]
+    if isinstance(value, dict):
+        copy = dict(value)
+        for key, item in copy.items():
+            if isinstance(item, _CONTAINERS):
+                copy[key] = copy_result(item)
+        return copy
+    if type(value) is tuple:
+        if not any(isinstance(item, _CONTAINERS) for item in value):
+            return value  # Nothing inside can change, so the tuple itself is shared
+        return tuple(copy_result(item) if isinstance(item, _CONTAINERS) else item for item in value)
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of service results with a memory budget.
+
+    Entries are evicted least recently used first once either the estimated size
+    of the cached values exceeds `budget` bytes or there are more than
+    `max_entries` of them. Hits, misses and evictions are counted for stats().
+    """
+
+    def __init__(self, budget=CACHE_BUDGET, max_entries=CACHE_MAX_ENTRIES):
+        """
+        Args:
+            budget (int): Estimated bytes the cached values may occupy.
+            max_entries (int): Maximum number of cached values.
+        """
+        self.budget = budget
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (value, estimated size), oldest first
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return the value cached under key, marking it most recently used, or default."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Cache value under key; values larger than the whole budget are not kept."""
+        size = estimate_size(value)
+        if size > self.budget:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.budget or len(self._entries) > self.max_entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached value (the counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: entries, size (estimated bytes), budget, hits, misses, evictions and hit_rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size": self._size,
+                "budget": self.budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Shared by every cached service read
+result_cache = ResultCache()
+
+# Per-user data versions, bumped by every write this process's services make to a
+# user's expenses or incomes. _global_version changes on any such write and versions
+# results that span all users; _epoch changes when everything is invalidated at once.
+_versions = {}
+_global_version = 0
+_epoch = 0
+_version_lock = threading.Lock()
+
+# Function returning a number that changes with every commit to the database, including
+# commits by other processes and SQLite clients (database.db.database_version registers
+# itself on import). Without one, only this process's writes invalidate cached results.
+_change_signal = None
+
+
+def set_change_signal(func):
+    """
+    Set the function whose value is part of every data version, so that writes this
+    process's services do not see (another process, an external client) still
+    invalidate the cached results.
+    """
+    global _change_signal
+    _change_signal = func
+
+
+def data_version(user_id=None):
+    """
+    Return the current data version of a user, or of all data when user_id is None.
+    Results cached under an older version are never returned again. Returns None when
+    the database's change signal cannot be read, and then nothing should be cached.
+    """
+    database = None
+    if _change_signal is not None:
+        database = _change_signal()
+        if database is None:
+            return None
+    if user_id is None:
+        return (_global_version, database)
+    return (_epoch, _versions.get(user_id, 0), database)
+
+
+def bump_data_version(*user_ids):
+    """
+    Mark the given users' data as changed after a write, invalidating their cached
+    results and every cross-user result (admin totals). With no user IDs every
+    cached result is invalidated, e.g. after a bulk merge or a repair.
+    """
+    global _global_version, _epoch
+    with _version_lock:
+        _global_version += 1
+        if not user_ids:
+            _epoch += 1
+            _versions.clear()
+            result_cache.clear()
+            return
+        for user_id in user_ids:
+            _versions[user_id] = _versions.get(user_id, 0) + 1
+
+
+def cached_read(func):
+    """
+    Decorator caching a service read in result_cache until the data it reads changes.
+
+    The user is the first argument (or the user_id keyword); a call without one, or
+    with None, reads across users and is invalidated by any write. The other
+    arguments must be hashable and are part of the key. Every caller gets its own copy
+    of the result's lists and dicts (copy_result); arrays in it are made read-only. The
+    undecorated function stays available as func.uncached.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        user_id = args[0] if args else kwargs.get("user_id")
+        # Read the version before computing, so a write that lands meanwhile leaves this
+        # result filed under the outdated version
+        version = data_version(user_id)
+        if version is None:
+            return func(*args, **kwargs)
+        key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())), version)
+        try:
+            value = result_cache.get(key, _MISSING)
+        except TypeError:  # Unhashable arguments are simply not cached
+            return func(*args, **kwargs)
+        if value is _MISSING:
+            value = func(*args, **kwargs)
+            freeze(value)
+            result_cache.put(key, value)
+        return copy_result(value)
+
+    wrapper.uncached = func
+    return wrapper
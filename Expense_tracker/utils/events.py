@@ -0,0 +1,63 @@
+import logging
+import threading
+
+# Published by the services after reference data changes
+CATEGORIES_CHANGED = "categories_changed"  # No arguments
+PROFILE_CHANGED = "profile_changed"  # Argument: the user's ID
+
+_subscribers = {}
+_lock = threading.Lock()
+
+
+def subscribe(event, callback):
+    """
+    Call callback whenever event is published.
+
+    Callbacks run synchronously in the publishing thread, after the service has
+    refreshed its cache, so a GUI callback can read the new data straight away.
+
+    Args:
+        event (str): Event name, e.g. CATEGORIES_CHANGED.
+        callback (callable): Called with the event's arguments.
+    Returns:
+        callable: callback, for passing to unsubscribe.
+    """
+    with _lock:
+        _subscribers.setdefault(event, []).append(callback)
+    return callback
+
+
+def unsubscribe(event, callback):
+    """Stop calling callback for event; unknown callbacks are ignored."""
+    with _lock:
+        callbacks = _subscribers.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+
+def subscribe_widget(widget, event, callback):
+    """
+    Subscribe callback to event for as long as a Tk widget exists; the subscription
+    is dropped when the widget is destroyed, so closed windows are not called back.
+    """
+    subscribe(event, callback)
+
+    def on_destroy(tk_event):
+        if tk_event.widget is widget:
+            unsubscribe(event, callback)
+
+    widget.bind("<Destroy>", on_destroy, add="+")
+
+
+def publish(event, *args):
+    """
+    Call every subscriber of event with args. A failing subscriber is logged and
+    does not stop the others.
+    """
+    with _lock:
+        callbacks = list(_subscribers.get(event, []))
+    for callback in callbacks:
+        try:
+            callback(*args)
+        except Exception as e:
+            logging.error(f"Error in {event} subscriber {callback!r}: {e}")
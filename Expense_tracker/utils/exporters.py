@@ -1,11 +1,18 @@
 import csv
 
 def export_to_csv(data, filename):
+    """Write dictionaries from a list or generator to a CSV file, one row at a time."""
     try:
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
+            print("Error exporting to CSV: no rows to export")
+            return False
         with open(filename, mode="w", newline="") as file:
             writer = csv.writer(file)
-            writer.writerow(data[0].keys())  # Write header
-            for row in data:
+            writer.writerow(first.keys())  # Write header
+            writer.writerow(first.values())
+            for row in rows:
                 writer.writerow(row.values())
         return True
     except Exception as e:
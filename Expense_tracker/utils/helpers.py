@@ -1,4 +1,70 @@
-from datetime import datetime
+import re
+from datetime import date, datetime
+from functools import lru_cache
+
+# Year-month-day with optional zero padding on month and day, e.g. '2025-6-8'
+_DATE_PATTERN = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+
+# Runs of letters and digits, so every word stays a single FTS5 (unicode61) token
+_WORD_PATTERN = re.compile(r"[^\W_]+")
 
 def format_date(date_str):
-    return datetime.strptime(date_str, "%Y-%m-%d").strftime("%d/%m/%Y")
\ No newline at end of file
+    return datetime.strptime(date_str, "%Y-%m-%d").strftime("%d/%m/%Y")
+
+@lru_cache(maxsize=4096)  # Bulk imports repeat the same few hundred dates
+def to_iso_date(date_str):
+    """
+    Normalize a date such as '2025-6-8' to zero-padded ISO form ('2025-06-08').
+    Stored dates must be ISO so that string range comparisons sort correctly.
+    Raises ValueError if the date is missing, not a string or not in year-month-day order.
+    """
+    if not isinstance(date_str, str):
+        raise ValueError(f"Invalid date {date_str!r}, expected a YYYY-MM-DD string.")
+    match = _DATE_PATTERN.fullmatch(date_str.strip())
+    if not match:
+        raise ValueError(f"Invalid date '{date_str}', expected YYYY-MM-DD.")
+    # date() rejects impossible days such as 2025-02-30
+    return date(*map(int, match.groups())).isoformat()
+
+def month_range(year, month):
+    """Return the half-open [start, end) ISO date bounds of a calendar month."""
+    start = f"{year:04d}-{month:02d}-01"
+    end = f"{year + 1:04d}-01-01" if month == 12 else f"{year:04d}-{month + 1:02d}-01"
+    return start, end
+
+def quarter_range(year, quarter):
+    """Return the half-open [start, end) ISO date bounds of a calendar quarter (1-4)."""
+    first_month = (quarter - 1) * 3 + 1
+    start, _ = month_range(year, first_month)
+    _, end = month_range(year, first_month + 2)
+    return start, end
+
+def keyset_clause(cursor, descending=True):
+    """
+    Build the WHERE condition and ORDER BY clause for one page of rows ordered by (date, id).
+    cursor is the (date, id) of the last row of the previous page, or None for the first page.
+    Returns (condition, params, order_by); the condition is "1" on the first page.
+    """
+    op, direction = ("<", "DESC") if descending else (">", "ASC")
+    order_by = f"date {direction}, id {direction}"
+    if cursor is None:
+        return "1", (), order_by
+    last_date, last_id = cursor
+    # The plain date bound lets SQLite seek the (user_id, ..., date) indexes; the row value breaks ties
+    return f"date {op}= ? AND (date, id) {op} (?, ?)", (last_date, last_date, last_id), order_by
+
+def search_words(text):
+    """Split text into the words the search index stores (letters and digits only)."""
+    return _WORD_PATTERN.findall(text or "")
+
+def search_terms(user_id, *texts):
+    """
+    Build the text indexed for one transaction. Every word is stored twice: as-is,
+    for searches across all users, and prefixed with its owner ('u7x' + word), so a
+    user's search only reads that user's entries of the index.
+    """
+    words = _WORD_PATTERN.findall(" ".join([text for text in texts if text]))
+    if not words:
+        return ""
+    owner = f" u{user_id}x"
+    return " ".join(words) + owner + owner.join(words)
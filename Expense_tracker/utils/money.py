@@ -0,0 +1,54 @@
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Amounts are stored as integers in the currency's minor unit (e.g. cents).
+# The exponent is the number of minor-unit digits: 1 NLe = 10**2 minor units.
+DEFAULT_CURRENCY = "NLe"
+DEFAULT_EXPONENT = 2
+CURRENCY_EXPONENTS = {
+    "NLe": 2,
+    "USD": 2,
+    "EUR": 2,
+    "GBP": 2,
+}
+
+# Plain decimal text such as "12", "-3.5" or "0.25", converted without Decimal
+_PLAIN_AMOUNT = re.compile(r"(-?)(\d+)(?:\.(\d*))?")
+
+
+def currency_exponent(currency):
+    """Return the number of minor-unit digits for a currency code."""
+    return CURRENCY_EXPONENTS.get(currency, DEFAULT_EXPONENT)
+
+
+def to_minor(amount, exponent=DEFAULT_EXPONENT):
+    """
+    Convert a major-unit amount (e.g. 12.5 or "12.50") to integer minor units (1250).
+    Floats are converted through their shortest repr, so 0.1 becomes exactly 10.
+    Raises ValueError if the amount is not a finite number.
+    """
+    text = str(amount).strip()
+    match = _PLAIN_AMOUNT.fullmatch(text)
+    if match and len(match.group(3) or "") <= exponent:
+        # No rounding needed: shift the digits by padding the fraction
+        sign, whole, fraction = match.groups()
+        minor = int(whole + (fraction or "").ljust(exponent, "0"))
+        return -minor if sign else minor
+    try:
+        value = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {amount!r}")
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount: {amount!r}")
+    return int(value.scaleb(exponent).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_minor(minor, exponent=DEFAULT_EXPONENT):
+    """Convert integer minor units back to a major-unit float for display and charts."""
+    return minor / 10 ** exponent
+
+
+def format_money(minor, currency=DEFAULT_CURRENCY):
+    """Format integer minor units as e.g. 'NLe 12.50' without going through a float."""
+    exponent = currency_exponent(currency)
+    return f"{currency} {Decimal(minor).scaleb(-exponent):.{exponent}f}"
@@ -0,0 +1,134 @@
+def date_id_key(record):
+    """Sort key of the rows the keyset page functions return: (date, id)."""
+    return record["date"], record["id"]
+
+
+class PagedSource:
+    """
+    The rows of a keyset-paginated service read, fetched a page at a time as they are needed.
+
+    Only the pages up to the furthest row asked for are read, so opening a list costs the
+    same single page however long the full history is. Loaded rows are kept, so scrolling
+    back never queries again, and a write can be applied to them with insert() and
+    remove() instead of reloading.
+
+    ensure() fetches on the calling thread. To keep the reads off the GUI thread, take the
+    next fetch from next_fetch(), run fetch() with it on a worker, and hand the page back
+    to add_page() on the GUI thread.
+    """
+
+    def __init__(self, fetch_page, key=date_id_key, descending=True):
+        """
+        Args:
+            fetch_page (callable): Called with a cursor (None for the first page); returns
+                (records, next_cursor) like services.expense_service.get_expenses_page.
+            key (callable): Sort key of a record, in the order the pages are fetched in.
+            descending (bool): Whether the pages run from the largest key to the smallest.
+        """
+        self._fetch_page = fetch_page
+        self._key = key
+        self._descending = descending
+        self._rows = []
+        self._cursor = None
+        self._generation = 0  # Bumped by reset(), so pages fetched before it are dropped
+        self.exhausted = False
+
+    def __len__(self):
+        """Number of rows loaded so far (all of them once exhausted is True)."""
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+    def ensure(self, count):
+        """
+        Fetch pages until at least count rows are loaded or no more remain.
+
+        Returns:
+            bool: True if any rows were fetched.
+        """
+        loaded = len(self._rows)
+        while len(self._rows) < count and not self.exhausted:
+            records, self._cursor = self._fetch_page(self._cursor)
+            self._rows.extend(records)
+            if self._cursor is None:  # Last page, or the read failed
+                self.exhausted = True
+        return len(self._rows) > loaded
+
+    def next_fetch(self, count):
+        """
+        The page fetch needed to load count rows, for running it on another thread.
+
+        Returns:
+            tuple: The fetch to pass to fetch() and then add_page(), or None if count rows
+                   are loaded or no more remain.
+        """
+        if len(self._rows) >= count or self.exhausted:
+            return None
+        return self._generation, self._cursor
+
+    def fetch(self, request):
+        """Read the page of a next_fetch() request; touches no state, so any thread may call it."""
+        return self._fetch_page(request[1])
+
+    def add_page(self, request, page):
+        """
+        Add a page read by fetch(request).
+
+        Returns:
+            bool: False if the page was dropped because the rows changed since the request
+                  (a reset, or the same page already added).
+        """
+        if request != (self._generation, self._cursor) or self.exhausted:
+            return False
+        records, self._cursor = page
+        self._rows.extend(records)
+        if self._cursor is None:  # Last page, or the read failed
+            self.exhausted = True
+        return True
+
+    def _position(self, key):
+        """Index of the first loaded row that sorts after key (binary search)."""
+        low, high = 0, len(self._rows)
+        while low < high:
+            middle = (low + high) // 2
+            middle_key = self._key(self._rows[middle])
+            if (middle_key < key) if self._descending else (middle_key > key):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def insert(self, record):
+        """
+        Add a newly written record in its sorted place among the loaded rows.
+
+        Returns:
+            int: Its index, or None if it sorts after the loaded rows; a later page will
+                 then include it (the cursor is behind it), so it is not added.
+        """
+        index = self._position(self._key(record))
+        if index == len(self._rows) and not self.exhausted:
+            return None
+        self._rows.insert(index, record)
+        return index
+
+    def remove(self, record):
+        """
+        Remove a deleted (or since updated) record, found by its key as it was loaded.
+
+        Returns:
+            int: The index it had, or None if it was not loaded.
+        """
+        index = self._position(self._key(record)) - 1  # Keys are unique, so it is just before
+        if index >= 0 and self._rows[index]["id"] == record["id"]:
+            del self._rows[index]
+            return index
+        return None
+
+    def reset(self):
+        """Forget the loaded rows, so the next ensure() starts again from the first page."""
+        self._rows = []
+        self._cursor = None
+        self._generation += 1
+        self.exhausted = False